@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import RecommendationFeedback
+
+
+@admin.register(RecommendationFeedback)
+class RecommendationFeedbackAdmin(admin.ModelAdmin):
+    list_display = ('id', 'planted_crop', 'outcome', 'recommended_crop', 'model_version', 'created')
+    list_filter = ('outcome', 'planted_crop', 'model_version')
@@ -0,0 +1,281 @@
+# crops/advice.py
+"""Personalized advice compiled from rules into a decision table.
+
+A farmer profile is reduced to five discrete dimensions: crop, farmer
+type, soil pH band, seasonal rainfall band and irrigation access.
+``ADVICE_RULES`` say which advice topics apply to which combinations;
+``AdviceEngine`` evaluates every rule against every combination once
+(a few thousand cells) and stores, per cell, the id of its distinct
+advice payload.  A single profile is then a band lookup plus one array
+index, and a whole table of profiles is a handful of vectorized
+``searchsorted`` / ``take`` calls.
+
+A rule matches when every dimension it names matches; unnamed
+dimensions match anything.  Per topic, the most specific matching rule
+(the one naming the most dimensions) wins, and among equally specific
+rules the later one wins.  A topic set to ``None`` removes it.  A value
+of ``{"section": name}`` stands for that section of the crop's own
+knowledge base record.
+"""
+import threading
+from typing import Any, Dict, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .knowledge_store import default_store
+
+FARMER_TYPES = ("small_scale", "large_scale", "unknown")
+IRRIGATION = ("yes", "no", "unknown")
+
+# Band i covers [edges[i-1], edges[i]); values outside all edges fall in the first/last band.
+PH_EDGES = (5.0, 5.5, 6.5, 7.5)
+PH_BANDS = ("very_acidic", "acidic", "slightly_acidic", "neutral", "alkaline", "unknown")
+# Seasonal rainfall, mm
+RAINFALL_EDGES = (400.0, 800.0, 1200.0)
+RAINFALL_BANDS = ("dry", "moderate", "wet", "very_wet", "unknown")
+
+CROP_NOT_FOUND = "Crop not found in knowledge base."
+
+ADVICE_RULES = [
+    {"advice": {
+        "fertilizer_management": {"section": "fertilizer_management"},
+        "water_management": {"section": "water_management"},
+    }},
+
+    # Farmer type
+    {"when": {"farmer_type": "small_scale"}, "advice": {
+        "fertilizer_tip": "Use well-rotted manure or compost and micro-dose mineral fertilizer at each "
+                          "planting station; follow local extension advice on rates.",
+    }},
+    {"when": {"farmer_type": "large_scale"}, "advice": {
+        "fertilizer_tip": "Set rates from a laboratory soil test, split nitrogen applications and "
+                          "calibrate spreaders before the season.",
+    }},
+    {"when": {"farmer_type": "unknown"}, "advice": {
+        "fertilizer_tip": "Follow general fertilizer guidelines and test your soil when you can.",
+    }},
+
+    # Soil pH
+    {"when": {"ph": "very_acidic"}, "advice": {
+        "liming": "Soil is strongly acidic (pH below 5.0): apply agricultural lime, about 2–4 t/ha as the "
+                  "soil test advises, 2–3 months before planting.",
+    }},
+    {"when": {"ph": "acidic"}, "advice": {
+        "liming": "Soil is acidic (pH 5.0–5.5): apply 1–2 t/ha of agricultural lime before planting and "
+                  "prefer CAN over urea for top dressing.",
+    }},
+    {"when": {"ph": "alkaline"}, "advice": {
+        "soil_ph": "Soil is alkaline (pH 7.5 or above): use ammonium-based fertilizers and organic matter, "
+                   "and watch for zinc and iron deficiency.",
+    }},
+    {"when": {"ph": ["very_acidic", "acidic"], "crop": "cassava"}, "advice": {
+        "liming": "Cassava tolerates acid soils; lime only if pH is below 4.5 or yields are poor.",
+    }},
+    {"when": {"ph": ["very_acidic", "acidic"], "crop": ["beans", "cabbage", "onion"]}, "advice": {
+        "liming": "This crop is sensitive to acidity: lime to bring pH above 5.5 (about 2–4 t/ha, per soil "
+                  "test) well before planting.",
+    }},
+    {"when": {"ph": "unknown"}, "advice": {
+        "soil_test": "Test soil pH before the season; most crops do best between pH 5.5 and 7.0.",
+    }},
+
+    # Rainfall and irrigation
+    {"when": {"rainfall": "dry", "irrigation": ["no", "unknown"]}, "advice": {
+        "water_management": "Low seasonal rainfall without irrigation: plant with the first effective rains, "
+                            "mulch, use tied ridges or planting basins to harvest water, and choose "
+                            "early-maturing varieties.",
+    }},
+    {"when": {"rainfall": "dry", "irrigation": "yes"}, "advice": {
+        "irrigation_schedule": "Low seasonal rainfall: plan irrigation around the crop's critical stages "
+                               "(flowering and grain or fruit fill) rather than a fixed calendar.",
+    }},
+    {"when": {"rainfall": ["wet", "very_wet"]}, "advice": {
+        "drainage": "High rainfall: plant on ridges or raised beds, keep drains open and split nitrogen "
+                    "applications to limit leaching.",
+    }},
+    {"when": {"rainfall": "very_wet", "crop": ["tomato", "irish potato", "beans", "onion", "cabbage"]}, "advice": {
+        "disease_risk": "Very wet seasons raise fungal disease pressure (blights, leaf spots): scout weekly "
+                        "and apply preventive fungicides as the crop's pest section advises.",
+    }},
+    {"when": {"rainfall": ["wet", "very_wet"], "crop": "rice"}, "advice": {
+        # Paddy rice wants standing water
+        "drainage": None,
+    }},
+]
+
+DIMENSIONS = ("crop", "farmer_type", "ph", "rainfall", "irrigation")
+
+
+def _band_index(values: np.ndarray, edges: Sequence[float], unknown: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    bands = np.searchsorted(np.asarray(edges), values, side='right')
+    return np.where(np.isfinite(values), bands, unknown)
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _farmer_code(value: Any) -> int:
+    # Only exact strings match; anything else (None, numbers, lists from a bad client) is unknown
+    if isinstance(value, str) and value in FARMER_TYPES[:-1]:
+        return FARMER_TYPES.index(value)
+    return len(FARMER_TYPES) - 1
+
+
+def _irrigation_code(value: Any) -> int:
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("yes", "true", "1", "y"):
+            return 0
+        if value in ("no", "false", "0", "n"):
+            return 1
+        return 2
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return 2
+    return 0 if value else 1
+
+
+class AdviceEngine:
+    def __init__(self, rules=ADVICE_RULES, store=default_store):
+        self.rules = rules
+        self.store = store
+        self._compiled = None
+        self._lock = threading.Lock()
+
+    # --- Compilation ---
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = self._compile()
+        return self._compiled
+
+    def _compile(self):
+        crops = tuple(self.store)
+        axes = {
+            "crop": crops,
+            "farmer_type": FARMER_TYPES,
+            "ph": PH_BANDS,
+            "rainfall": RAINFALL_BANDS,
+            "irrigation": IRRIGATION,
+        }
+        shape = tuple(len(axes[dim]) for dim in DIMENSIONS)
+        topics = sorted({topic for rule in self.rules for topic in rule["advice"]})
+        # Per topic, the index of the rule that decides it in each cell (-1: none)
+        winner = np.full((len(topics), *shape), -1, dtype=np.int32)
+        ordered = sorted(range(len(self.rules)), key=lambda i: (len(self.rules[i].get("when", {})), i))
+        for i in ordered:
+            rule = self.rules[i]
+            when = rule.get("when", {})
+            unknown = set(when) - set(DIMENSIONS)
+            if unknown:
+                raise ValueError(f"Advice rule {i} uses unknown dimension(s): {', '.join(sorted(unknown))}.")
+            match = np.ones(shape, dtype=bool)
+            for axis, dim in enumerate(DIMENSIONS):
+                if dim not in when:
+                    continue
+                wanted = {when[dim]} if isinstance(when[dim], str) else set(when[dim])
+                if dim != "crop" and not wanted <= set(axes[dim]):
+                    raise ValueError(f"Advice rule {i} names unknown {dim} value(s): "
+                                     f"{', '.join(sorted(wanted - set(axes[dim])))}.")
+                mask = np.array([v in wanted for v in axes[dim]])
+                match &= mask.reshape([-1 if a == axis else 1 for a in range(len(shape))])
+            for topic in rule["advice"]:
+                winner[topics.index(topic)][match] = i
+
+        # Cells with the same crop and the same deciding rules share one payload
+        keys = np.vstack([
+            np.broadcast_to(np.arange(shape[0]).reshape(-1, *[1] * (len(shape) - 1)), shape).ravel(),
+            winner.reshape(len(topics), -1),
+        ]).T
+        distinct, table = np.unique(keys, axis=0, return_inverse=True)
+        payloads = []
+        for crop_index, *rules in distinct:
+            payload = []
+            for topic, i in zip(topics, rules):
+                value = self.rules[i]["advice"][topic] if i >= 0 else None
+                if isinstance(value, Mapping):
+                    value = ("section", crops[crop_index], value["section"])
+                if value is not None:
+                    payload.append((topic, value))
+            payloads.append(tuple(payload))
+        return {
+            "crops": {crop: i for i, crop in enumerate(crops)},
+            "table": table.reshape(shape).astype(np.int32),
+            "payloads": payloads,
+        }
+
+    def payload(self, advice_id: int) -> Dict[str, Any]:
+        """The advice dict for an id from ``lookup`` / ``evaluate`` (sections read on demand)."""
+        if advice_id < 0:
+            return {"error": CROP_NOT_FOUND}
+        advice = {}
+        for topic, value in self.compiled["payloads"][advice_id]:
+            if isinstance(value, tuple):
+                _, crop, section = value
+                value = self.store.section(crop, section)
+                if value is None:
+                    continue
+            advice[topic] = value
+        return advice
+
+    # --- Single profile ---
+    def lookup(self, crop_name: str, profile: Mapping[str, Any]) -> int:
+        """Advice id for one profile, or -1 if the crop is unknown."""
+        compiled = self.compiled
+        crop = self.store.resolve(crop_name) if crop_name else None
+        if crop is None:
+            return -1
+        cell = (
+            compiled["crops"][crop],
+            _farmer_code(profile.get("farmer_type")),
+            int(_band_index([_as_float(profile.get("ph"))], PH_EDGES, len(PH_BANDS) - 1)[0]),
+            int(_band_index([_as_float(profile.get("rainfall"))], RAINFALL_EDGES, len(RAINFALL_BANDS) - 1)[0]),
+            _irrigation_code(profile.get("irrigation")),
+        )
+        return int(compiled["table"][cell])
+
+    def advise(self, crop_name: str, profile: Mapping[str, Any]) -> Dict[str, Any]:
+        return self.payload(self.lookup(crop_name, profile))
+
+    # --- Many profiles ---
+    def evaluate(self, profiles: pd.DataFrame) -> np.ndarray:
+        """Advice id per row of a DataFrame with columns crop, farmer_type, ph, rainfall and
+        irrigation (all but crop optional); -1 where the crop is unknown."""
+        compiled = self.compiled
+        n = len(profiles)
+
+        def column(name):
+            return profiles[name] if name in profiles else pd.Series([None] * n, index=profiles.index)
+
+        crop_names = column("crop").astype(str)
+        distinct = pd.unique(crop_names)
+        crop_codes = dict(zip(distinct, (compiled["crops"].get(self.store.resolve(c) or "", -1) for c in distinct)))
+        crop_index = crop_names.map(crop_codes).to_numpy(dtype=np.intp)
+
+        # Per value, not a dict lookup: a list or dict from a client is unhashable
+        farmer_index = np.fromiter((_farmer_code(t) for t in column("farmer_type")), dtype=np.intp, count=n)
+        ph_index = _band_index(pd.to_numeric(column("ph"), errors='coerce'), PH_EDGES, len(PH_BANDS) - 1)
+        rain_index = _band_index(pd.to_numeric(column("rainfall"), errors='coerce'),
+                                 RAINFALL_EDGES, len(RAINFALL_BANDS) - 1)
+        irrigation = column("irrigation")
+        if irrigation.dtype == bool:
+            irrigation_index = np.where(irrigation.to_numpy(), 0, 1)
+        else:
+            irrigation_index = np.fromiter((_irrigation_code(v) for v in irrigation), dtype=np.intp, count=n)
+
+        known = crop_index >= 0
+        ids = np.full(n, -1, dtype=np.int32)
+        ids[known] = compiled["table"][
+            crop_index[known], farmer_index[known], ph_index[known], rain_index[known], irrigation_index[known]
+        ]
+        return ids
+
+
+advice_engine = AdviceEngine()
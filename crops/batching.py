@@ -0,0 +1,101 @@
+# crops/batching.py
+"""In-process micro-batching for single-row crop predictions.
+
+Concurrent requests (gunicorn threads under WSGI, coroutines under ASGI)
+hand their feature row to a shared ``MicroBatcher``.  A background thread
+collects rows for up to ``max_wait`` seconds or ``max_batch_size`` rows,
+scores them with one vectorized call and resolves each caller's future
+with its own probability row.  Rows are grouped by the scoring function
+they were submitted with, so a model hot swap mid-batch stays consistent.
+If a group's call raises, its rows are rescored one at a time, so the
+error reaches only the caller whose row caused it.
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from .metrics import MICROBATCH_QUEUE_DEPTH, MICROBATCH_SIZE, MICROBATCH_WAIT_SECONDS
+
+
+class MicroBatcher:
+    def __init__(self, max_batch_size=64, max_wait=0.003):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+
+    def _ensure_worker(self):
+        # Threads do not survive fork, so each gunicorn worker starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self._queue,), name='crop-microbatcher', daemon=True).start()
+                self._pid = os.getpid()
+
+    def submit_future(self, score, row):
+        """Queue one feature row for ``score`` (e.g. ``predictor.predict_proba``).
+
+        The returned future resolves to that row's result.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((score, np.asarray(row, dtype=np.float64).ravel(), time.perf_counter(), future))
+        MICROBATCH_QUEUE_DEPTH.inc()
+        return future
+
+    def submit(self, score, row, timeout=None):
+        return self.submit_future(score, row).result(timeout)
+
+    async def asubmit(self, score, row):
+        return await asyncio.wrap_future(self.submit_future(score, row))
+
+    def _run(self, pending):
+        while True:
+            batch = [pending.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        started = time.perf_counter()
+        MICROBATCH_QUEUE_DEPTH.dec(len(batch))
+        MICROBATCH_SIZE.observe(len(batch))
+        groups = {}
+        for score, row, submitted, future in batch:
+            MICROBATCH_WAIT_SECONDS.observe(started - submitted)
+            groups.setdefault(score, []).append((row, future))
+        for score, items in groups.items():
+            try:
+                result = score(np.vstack([row for row, _ in items]))
+            except Exception as e:
+                if len(items) == 1:
+                    items[0][1].set_exception(e)
+                else:
+                    self._score_each(score, items)
+                continue
+            for i, (_, future) in enumerate(items):
+                future.set_result(result[i])
+
+    @staticmethod
+    def _score_each(score, items):
+        # The batch call failed: score rows one by one so only the bad row's caller sees the error
+        for row, future in items:
+            try:
+                future.set_result(score(row.reshape(1, -1))[0])
+            except Exception as e:
+                future.set_exception(e)
@@ -0,0 +1,77 @@
+# crops/blobs.py
+"""Pre-serialized crop guidance responses with strong ETags.
+
+Guidance only changes when the knowledge base is rebuilt, so each
+response body is encoded (and gzip-compressed) once per process and then
+served as stored bytes.  A full crop record is served straight from the
+packed records file, whose per-record SHA-256 is already in the index;
+sections are encoded on first request.  The ETag is the content hash, so
+clients that send it back in ``If-None-Match`` get a bodiless 304.
+"""
+import gzip
+import hashlib
+import json
+import threading
+
+from .knowledge_store import default_store
+
+# Below this the gzip header and framing outweigh the savings.
+GZIP_MIN_SIZE = 512
+
+
+class Blob:
+    """One encoded response body, plus its gzip variant when that is smaller."""
+    __slots__ = ('body', 'gzipped', 'digest')
+
+    def __init__(self, body, digest=None):
+        self.body = body
+        self.digest = digest or hashlib.sha256(body).hexdigest()
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+        self.gzipped = gzipped if gzipped is not None and len(gzipped) < len(body) else None
+
+    def etag(self, gzipped=False):
+        # Strong ETags must differ between byte-different representations.
+        return f'"{self.digest[:32]}{"-gz" if gzipped else ""}"'
+
+    def matches(self, if_none_match):
+        """Whether an If-None-Match header names this content (in either encoding)."""
+        if not if_none_match:
+            return False
+        ours = {self.etag(), self.etag(gzipped=True)}
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            # If-None-Match uses weak comparison, so W/"..." matches too.
+            if tag == '*' or tag.removeprefix('W/') in ours:
+                return True
+        return False
+
+
+class GuidanceBlobs:
+    """Per-process cache of encoded guidance bodies, keyed by (crop, canonical section)."""
+
+    def __init__(self, store=default_store):
+        self.store = store
+        self._blobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, crop, section=None):
+        """Return the Blob for a crop's full record or one of its sections, or None."""
+        key = (crop, section)
+        blob = self._blobs.get(key)
+        if blob is None:
+            blob = self._build(crop, section)
+            if blob is not None:
+                with self._lock:
+                    blob = self._blobs.setdefault(key, blob)
+        return blob
+
+    def _build(self, crop, section):
+        if section is None:
+            return Blob(self.store.raw(crop), self.store.index["hashes"][crop])
+        value = self.store.section(crop, section)
+        if value is None:
+            return None
+        return Blob(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+guidance_blobs = GuidanceBlobs()
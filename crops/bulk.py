@@ -0,0 +1,146 @@
+# crops/bulk.py
+"""Chunked scoring of large soil survey uploads.
+
+Rows are read lazily from the upload, gathered into chunks of
+``chunk_size``, scored with one ``predict_proba`` per chunk and written
+back as NDJSON or CSV lines, so memory stays bounded by the chunk size
+rather than the file size.  Malformed rows become inline error records
+and never abort the stream.
+"""
+import csv
+import io
+import json
+
+import numpy as np
+
+from .registry import FEATURES
+
+CHUNK_SIZE = 1000
+TOP_K = 3
+
+
+def _decoded_lines(lines):
+    first = True
+    for line in lines:
+        text = line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line
+        if first:
+            text = text.lstrip('\ufeff')
+            first = False
+        if text.strip():
+            yield text
+
+
+def parse_csv(lines):
+    """Yield (row number, feature values or None, id, error) from CSV lines with a header row."""
+    reader = csv.reader(_decoded_lines(lines))
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [h.strip() for h in header]
+    missing = [f for f in FEATURES if f not in columns]
+    if missing:
+        yield 0, None, None, f"Header is missing column(s): {', '.join(missing)}."
+        return
+    positions = [columns.index(f) for f in FEATURES]
+    id_position = columns.index('id') if 'id' in columns else None
+    for number, fields in enumerate(reader, start=1):
+        row_id = fields[id_position] if id_position is not None and id_position < len(fields) else None
+        if len(fields) != len(columns):
+            yield number, None, row_id, f"Expected {len(columns)} fields, got {len(fields)}."
+            continue
+        try:
+            values = [float(fields[p]) for p in positions]
+        except ValueError:
+            yield number, None, row_id, "Feature values must be numeric."
+            continue
+        yield number, values, row_id, None
+
+
+def parse_ndjson(lines):
+    """Yield (row number, feature values or None, id, error) from one JSON object per line."""
+    for number, line in enumerate(_decoded_lines(lines), start=1):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, None, "Invalid JSON."
+            continue
+        if not isinstance(record, dict):
+            yield number, None, None, "Each line must be a JSON object."
+            continue
+        row_id = record.get('id')
+        missing = [f for f in FEATURES if f not in record]
+        if missing:
+            yield number, None, row_id, f"Missing {', '.join(missing)}."
+            continue
+        try:
+            values = [float(record[f]) for f in FEATURES]
+        except (TypeError, ValueError):
+            yield number, None, row_id, "Feature values must be numeric."
+            continue
+        yield number, values, row_id, None
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_rows(rows, snapshot, chunk_size=CHUNK_SIZE):
+    """Yield one result dict per parsed row, in input order."""
+    for chunk in _chunks(rows, chunk_size):
+        valid = [i for i, (_, values, _, error) in enumerate(chunk)
+                 if error is None and np.isfinite(values).all()]
+        scored = {}
+        if valid:
+            probabilities = snapshot.predictor.predict_proba(np.array([chunk[i][1] for i in valid]))
+            top = np.argsort(probabilities, axis=1)[:, ::-1][:, :TOP_K]
+            for i, row_probabilities, indices in zip(valid, probabilities, top):
+                scored[i] = [
+                    {"crop": str(snapshot.classes[j]), "probability": round(float(row_probabilities[j]), 4)}
+                    for j in indices
+                ]
+        for i, (number, _, row_id, error) in enumerate(chunk):
+            result = {"row": number}
+            if row_id is not None:
+                result["id"] = row_id
+            if i in scored:
+                result["recommendations"] = scored[i]
+            else:
+                result["error"] = error or "Feature values must be finite numbers."
+            yield result
+
+
+def ndjson_lines(results):
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+
+def csv_lines(results):
+    header = ["row", "id"]
+    for k in range(1, TOP_K + 1):
+        header += [f"crop_{k}", f"probability_{k}"]
+    header.append("error")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for result in results:
+        buffer.seek(0)
+        buffer.truncate()
+        line = [result["row"], result.get("id", "")]
+        recommendations = result.get("recommendations", [])
+        for k in range(TOP_K):
+            if k < len(recommendations):
+                line += [recommendations[k]["crop"], recommendations[k]["probability"]]
+            else:
+                line += ["", ""]
+        line.append(result.get("error", ""))
+        writer.writerow(line)
+        yield buffer.getvalue()
@@ -0,0 +1,68 @@
+# crops/bundle.py
+"""Whole-knowledge-base bundles and per-crop deltas for offline clients.
+
+The bundle is every crop record plus a manifest of per-crop SHA-256
+hashes (the same hashes the packed index already holds), addressed by
+the SHA-256 of the whole records file.  A client that keeps the
+manifest sends it back and receives only the crops whose hash changed,
+plus the names of crops that no longer exist.  Record bodies are
+spliced in as the stored bytes, so neither response re-encodes a record.
+"""
+import json
+import threading
+from typing import Dict, Mapping
+
+from .blobs import Blob
+from .knowledge_store import default_store
+
+BUNDLE_FORMAT = 1
+
+
+def manifest(store=default_store) -> Dict[str, object]:
+    return {
+        "format": BUNDLE_FORMAT,
+        "version": store.index["sha256"],
+        "crops": dict(store.index["hashes"]),
+    }
+
+
+def _package(store, crops, removed=None) -> bytes:
+    """Encode a bundle body containing ``crops`` (knowledge base keys) as raw record bytes."""
+    head = manifest(store)
+    # Aliases come from the records, so an empty delta can leave them out
+    if crops or removed or removed is None:
+        head["aliases"] = store.index["aliases"]
+    if removed is not None:
+        head["removed"] = sorted(removed)
+    parts = [json.dumps(head, ensure_ascii=False, separators=(',', ':'))[:-1].encode('utf-8'), b',"records":{']
+    for i, crop in enumerate(crops):
+        if i:
+            parts.append(b',')
+        parts += [json.dumps(crop, ensure_ascii=False).encode('utf-8'), b':', store.raw(crop)]
+    parts.append(b'}}')
+    return b''.join(parts)
+
+
+class BundleBuilder:
+    def __init__(self, store=default_store):
+        self.store = store
+        self._bundle = None
+        self._lock = threading.Lock()
+
+    def bundle(self) -> Blob:
+        """The full bundle, encoded and compressed once per process."""
+        if self._bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = Blob(_package(self.store, list(self.store)), self.store.index["sha256"])
+        return self._bundle
+
+    def delta(self, client_hashes: Mapping[str, str]) -> Blob:
+        """Only the crops whose hash differs from ``client_hashes`` (or that the client lacks)."""
+        hashes = self.store.index["hashes"]
+        changed = [crop for crop, digest in hashes.items() if client_hashes.get(crop) != digest]
+        removed = [crop for crop in client_hashes if crop not in hashes]
+        return Blob(_package(self.store, changed, removed))
+
+
+bundle_builder = BundleBuilder()
@@ -0,0 +1,81 @@
+# crops/cache.py
+"""Bounded LRU/TTL cache for crop recommendations.
+
+Soil readings are snapped to agronomically meaningful precision to form
+the key, so near-identical samples share one entry.  A miss is scored on
+the raw readings, so the cache never changes a first answer; a hit
+returns the answer stored for the first sample in its bucket.  The cache
+is cleared whenever the ``version`` callable reports a different model
+(callers also put the model version in the key, so a request that
+started on the old model cannot repopulate the cache for the new one).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .metrics import RECOMMENDATION_CACHE_EVICTIONS, RECOMMENDATION_CACHE_HITS, RECOMMENDATION_CACHE_MISSES
+
+# Quantization step per feature, in the model's column order:
+# N, P, K (kg/ha), temperature (°C), humidity (%), ph, rainfall (mm)
+QUANTIZATION_STEPS = np.array([1.0, 1.0, 1.0, 0.5, 1.0, 0.1, 1.0])
+
+
+class RecommendationCache:
+    def __init__(self, version, max_entries=4096, ttl=3600, check_interval=5.0, steps=QUANTIZATION_STEPS):
+        self._version = version
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.steps = np.asarray(steps, dtype=np.float64)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_version = version()
+        self._next_check = time.monotonic() + check_interval
+
+    def quantize(self, row):
+        return tuple(int(v) for v in np.rint(np.asarray(row, dtype=np.float64) / self.steps))
+
+    def _check_version(self, now):
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        version = self._version()
+        if version != self._current_version:
+            self._current_version = version
+            self._evict_all('invalidated')
+
+    def _evict_all(self, reason):
+        if self._entries:
+            RECOMMENDATION_CACHE_EVICTIONS.labels(reason=reason).inc(len(self._entries))
+            self._entries.clear()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                RECOMMENDATION_CACHE_EVICTIONS.labels(reason='expired').inc()
+                entry = None
+            if entry is None:
+                RECOMMENDATION_CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(key)
+            RECOMMENDATION_CACHE_HITS.inc()
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                RECOMMENDATION_CACHE_EVICTIONS.labels(reason='capacity').inc()
+
+    def clear(self):
+        with self._lock:
+            self._evict_all('invalidated')
+
@@ -0,0 +1,124 @@
+# crops/compare.py
+"""Side-by-side crop comparison from a precomputed crop x section matrix.
+
+``ComparisonMatrix`` lays the knowledge base out once per process as
+arrays indexed by crop: an object matrix of every canonical section
+(``crops/sections.py``) and float ``low`` / ``high`` matrices of the
+numeric ranges parsed at build time (``crops/ranges.py``, NaN where a
+crop does not state one).  Comparing a few crops is a row slice, and
+filtering on a range ("pH below 5.5") is one vectorized comparison over
+all crops.
+"""
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .knowledge_store import default_store
+from .ranges import RANGE_FIELDS
+from .sections import SECTIONS
+
+# Filter lookups on a crop's [low, high] range
+LOOKUPS = {
+    "lt": lambda low, high, x: low < x,
+    "lte": lambda low, high, x: low <= x,
+    "gt": lambda low, high, x: high > x,
+    "gte": lambda low, high, x: high >= x,
+    "contains": lambda low, high, x: (low <= x) & (x <= high),
+}
+
+
+def _pair(low: float, high: float) -> Optional[List[float]]:
+    return None if np.isnan(low) else [float(low), float(high)]
+
+
+class ComparisonMatrix:
+    def __init__(self, store=default_store):
+        self.store = store
+        self._built = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        if self._built is None:
+            with self._lock:
+                if self._built is None:
+                    self._built = self._build()
+        return self._built
+
+    def _build(self):
+        crops = list(self.store)
+        sections = list(SECTIONS)
+        values = np.empty((len(crops), len(sections)), dtype=object)
+        for i, crop in enumerate(crops):
+            for j, section in enumerate(sections):
+                values[i, j] = self.store.section(crop, section)
+        fields = list(RANGE_FIELDS)
+        bounds = np.full((2, len(crops), len(fields)), np.nan)
+        for i, crop in enumerate(crops):
+            for j, field in enumerate(fields):
+                bounds[:, i, j] = self.store.index["ranges"][crop][field] or np.nan
+        return {
+            "crops": crops,
+            "rows": {crop: i for i, crop in enumerate(crops)},
+            "sections": sections,
+            "values": values,
+            "fields": fields,
+            "low": bounds[0],
+            "high": bounds[1],
+        }
+
+    def compare(self, crops: Sequence[str], sections: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Ranges and sections of ``crops`` (knowledge base keys), aligned by position.
+
+        ``sections`` are canonical names (default: all); each section maps
+        to one value per crop, None where a crop lacks it.
+        """
+        built = self.built
+        rows = [built["rows"][crop] for crop in crops]
+        columns = [built["sections"].index(s) for s in (sections or built["sections"])]
+        values = built["values"][np.ix_(rows, columns)]
+        low, high = built["low"][rows], built["high"][rows]
+        return {
+            "crops": list(crops),
+            "ranges": {
+                field: {"unit": RANGE_FIELDS[field][2],
+                        "values": [_pair(lo, hi) for lo, hi in zip(low[:, j], high[:, j])]}
+                for j, field in enumerate(built["fields"])
+            },
+            "sections": {
+                built["sections"][c]: values[:, k].tolist()
+                for k, c in enumerate(columns)
+                if any(v is not None for v in values[:, k])
+            },
+        }
+
+    def filter(self, conditions: Mapping[str, float]) -> List[Dict[str, Any]]:
+        """Crops whose ranges satisfy every ``{"field__lookup": value}`` condition (see ``LOOKUPS``).
+
+        ``ph__lt=5.5`` keeps crops whose pH range reaches below 5.5;
+        a bare ``rainfall=1000`` means ``rainfall__contains``.  Crops
+        without a stated range never match a condition on it.  Raises
+        ValueError for an unknown field or lookup.
+        """
+        built = self.built
+        mask = np.ones(len(built["crops"]), dtype=bool)
+        used = []
+        for condition, value in conditions.items():
+            field, _, lookup = condition.partition("__")
+            lookup = lookup or "contains"
+            if field not in RANGE_FIELDS or lookup not in LOOKUPS:
+                raise ValueError(f"Unknown filter '{condition}'; use <field>__<lookup> with a field in "
+                                 f"{', '.join(RANGE_FIELDS)} and a lookup in {', '.join(LOOKUPS)}.")
+            j = built["fields"].index(field)
+            with np.errstate(invalid='ignore'):
+                mask &= LOOKUPS[lookup](built["low"][:, j], built["high"][:, j], value)
+            used.append(j)
+        return [
+            {"crop": built["crops"][i],
+             "ranges": {built["fields"][j]: _pair(built["low"][i, j], built["high"][i, j]) for j in used}}
+            for i in np.flatnonzero(mask)
+        ]
+
+
+comparison_matrix = ComparisonMatrix()
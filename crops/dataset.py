@@ -0,0 +1,238 @@
+# crops/dataset.py
+"""Typed, memory-mapped cache of the crop training data.
+
+CSV sources (``Crop_recommendation.csv`` and any regional survey files
+with the same columns) are parsed once, in chunks, into a cache
+directory:
+
+* ``features.npy`` - float32, one row per sample, columns in ``FEATURES``
+  order (the dtype sklearn's trees use internally);
+* ``labels.npy`` - int16 codes into the class table;
+* ``manifest.json`` - the class table, row counts and each source's
+  SHA-256, size and mtime.
+
+``DatasetCache.load`` memory-maps the arrays, so a training run, a
+benchmark or a search worker reads zero-copy slices instead of
+re-parsing text.  The cache is rebuilt only when a source's SHA-256
+changes; a source is rehashed only when its size or mtime changed, and
+the manifest then records the new size and mtime so the next run does
+not rehash it again.
+``share`` lets a process pool map the same file in every worker rather
+than pickling the array into each one.
+"""
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .registry import FEATURES, file_sha256
+
+LABEL = 'label'
+CACHE_FORMAT = 1
+CHUNK_ROWS = 500_000
+MANIFEST_FILE = 'manifest.json'
+FEATURES_FILE = 'features.npy'
+LABELS_FILE = 'labels.npy'
+
+
+class CachedDataset:
+    """Memory-mapped features and label codes, plus the class table."""
+
+    def __init__(self, directory, manifest):
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self.features = np.load(self.directory / FEATURES_FILE, mmap_mode='r')
+        self.codes = np.load(self.directory / LABELS_FILE, mmap_mode='r')
+        self.classes = np.array(manifest['classes'], dtype=object)
+        if len(self.features) != manifest['rows'] or len(self.codes) != manifest['rows']:
+            raise ValueError(f"Dataset cache in {self.directory} is incomplete; rebuild it.")
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Class names per row (materialized; use ``codes`` to stay zero-copy)."""
+        return self.classes[self.codes]
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def _source_entry(path: Path, previous: Dict[str, Any] = None) -> Dict[str, Any]:
+    stat = path.stat()
+    entry = {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        entry["sha256"] = previous["sha256"]
+    else:
+        entry["sha256"] = file_sha256(path)
+    return entry
+
+
+def _count_rows(path: Path) -> int:
+    """Upper bound on data rows: lines after the header."""
+    lines, last = 0, b"\n"
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return max(lines - 1 + (last != b"\n"), 0)
+
+
+class DatasetCache:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    @classmethod
+    def for_sources(cls, root, sources: Sequence[Union[str, Path]]) -> 'DatasetCache':
+        """The cache under ``root`` for this list of sources, so different source sets do not evict each other."""
+        key = "\n".join(str(Path(p).resolve()) for p in sources)
+        return cls(Path(root) / hashlib.sha256(key.encode('utf-8')).hexdigest()[:16])
+
+    @property
+    def manifest_path(self):
+        return self.directory / MANIFEST_FILE
+
+    def read_manifest(self):
+        try:
+            return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp = self._temp_path(MANIFEST_FILE)
+        tmp.write_text(json.dumps(manifest, indent=1) + "\n", encoding='utf-8')
+        os.replace(tmp, self.manifest_path)
+
+    def _temp_path(self, name: str) -> Path:
+        """A new, uniquely named file in the cache directory, so concurrent builds never share one."""
+        with tempfile.NamedTemporaryFile(dir=self.directory, prefix=name + '.', suffix='.tmp', delete=False) as f:
+            return Path(f.name)
+
+    def is_fresh(self, sources: Sequence[Union[str, Path]], manifest=None) -> bool:
+        """Whether the cache was built from exactly these sources with their current contents."""
+        manifest = manifest if manifest is not None else self.read_manifest()
+        if not manifest or manifest.get("format") != CACHE_FORMAT:
+            return False
+        previous = manifest["sources"]
+        if [Path(p).resolve() for p in sources] != [Path(s["path"]) for s in previous]:
+            return False
+        current = [{**s, **_source_entry(Path(s["path"]), s)} for s in previous]
+        if any(c["sha256"] != s["sha256"] for c, s in zip(current, previous)):
+            return False
+        if current != previous:
+            # Touched but unchanged: record the new size/mtime so the next check skips the rehash
+            manifest["sources"] = current
+            try:
+                self._write_manifest(manifest)
+            except OSError:
+                pass  # A read-only cache is still fresh; it is just rehashed every time
+        return True
+
+    def load(self, sources: Sequence[Union[str, Path]], chunk_rows: int = CHUNK_ROWS) -> CachedDataset:
+        """The cached dataset for ``sources``, building or rebuilding it first if needed."""
+        manifest = self.read_manifest()
+        if not self.is_fresh(sources, manifest):
+            manifest = self.build(sources, chunk_rows)
+        return CachedDataset(self.directory, manifest)
+
+    def build(self, sources: Sequence[Union[str, Path]], chunk_rows: int = CHUNK_ROWS) -> Dict[str, Any]:
+        """Parse ``sources`` chunk by chunk into the cache; returns the new manifest."""
+        paths = [Path(p).resolve() for p in sources]
+        previous = {s["path"]: s for s in (self.read_manifest() or {}).get("sources", [])}
+        entries = [_source_entry(p, previous.get(str(p))) for p in paths]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        bound = sum(_count_rows(p) for p in paths)
+        temps = [self._temp_path(name) for name in (FEATURES_FILE, FEATURES_FILE, LABELS_FILE, LABELS_FILE)]
+        try:
+            return self._build(paths, entries, bound, chunk_rows, *temps)
+        finally:
+            for path in temps:
+                path.unlink(missing_ok=True)
+
+    def _build(self, paths, entries, bound, chunk_rows, features_tmp, trimmed_tmp, labels_tmp, codes_tmp):
+        # Rows are written straight into a memory-mapped file, so memory use stays at one chunk
+        features = np.lib.format.open_memmap(features_tmp, mode='w+', dtype=np.float32, shape=(bound, len(FEATURES)))
+        codes = np.lib.format.open_memmap(codes_tmp, mode='w+', dtype=np.int32, shape=(bound,))
+        classes: Dict[str, int] = {}
+        rows = dropped = 0
+        for path, entry in zip(paths, entries):
+            entry["rows"] = 0
+            for chunk in pd.read_csv(path, chunksize=chunk_rows):
+                missing = [c for c in FEATURES + [LABEL] if c not in chunk.columns]
+                if missing:
+                    raise ValueError(f"{path} lacks column(s) {', '.join(missing)}.")
+                values = chunk[FEATURES].apply(pd.to_numeric, errors='coerce').to_numpy(np.float32)
+                labels = chunk[LABEL].astype(str).str.strip()
+                valid = np.isfinite(values).all(axis=1) & chunk[LABEL].notna().to_numpy() & (labels != '').to_numpy()
+                values, labels = values[valid], labels[valid]
+                n = len(values)
+                for label in pd.unique(labels):
+                    classes.setdefault(label, len(classes))
+                features[rows:rows + n] = values
+                codes[rows:rows + n] = labels.map(classes).to_numpy(np.int32)
+                rows += n
+                entry["rows"] += n
+                dropped += int((~valid).sum())
+
+        # Sorted class table, like a classifier's classes_
+        table = sorted(classes)
+        remap = np.empty(len(classes), dtype=np.int32)
+        remap[[classes[c] for c in table]] = np.arange(len(table), dtype=np.int32)
+        label_dtype = np.int16 if len(table) <= np.iinfo(np.int16).max else np.int32
+        final_codes = np.lib.format.open_memmap(labels_tmp, mode='w+', dtype=label_dtype, shape=(rows,))
+        for start in range(0, rows, chunk_rows):
+            end = min(start + chunk_rows, rows)
+            final_codes[start:end] = remap[codes[start:end]]
+        final_codes.flush()
+        del codes, final_codes
+        if rows < bound:
+            # Blank or invalid lines: copy the filled part into a file of the right length
+            trimmed = np.lib.format.open_memmap(trimmed_tmp, mode='w+', dtype=np.float32, shape=(rows, len(FEATURES)))
+            for start in range(0, rows, chunk_rows):
+                end = min(start + chunk_rows, rows)
+                trimmed[start:end] = features[start:end]
+            trimmed.flush()
+            del trimmed, features
+            features_tmp = trimmed_tmp
+        else:
+            features.flush()
+            del features
+
+        manifest = {
+            "format": CACHE_FORMAT,
+            "features": FEATURES,
+            "rows": rows,
+            "dropped_rows": dropped,
+            "classes": table,
+            "sources": entries,
+        }
+        # Arrays first, manifest last: a reader never sees a manifest for arrays that are not there yet
+        os.replace(features_tmp, self.directory / FEATURES_FILE)
+        os.replace(labels_tmp, self.directory / LABELS_FILE)
+        self._write_manifest(manifest)
+        return manifest
+
+
+def source_list(data: Union[str, Path, Sequence[Union[str, Path]]]) -> List[str]:
+    return [str(data)] if isinstance(data, (str, Path)) else [str(p) for p in data]
+
+
+class MappedFile(str):
+    """Path of a cached ``.npy`` array, sent to worker processes in place of its contents."""
+
+
+def share(array):
+    """A whole memory-mapped array as a ``MappedFile``; anything else unchanged."""
+    # Slices of a memmap are memmaps too, but only the mapping itself has the mmap as its base
+    if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap) and array.filename:
+        return MappedFile(array.filename)
+    return array
+
+
+def unshare(value):
+    """Inverse of ``share``: map a ``MappedFile`` read-only, pass anything else through."""
+    return np.load(value, mmap_mode='r') if isinstance(value, MappedFile) else value
@@ -0,0 +1,113 @@
+# crops/forest.py
+"""Flat-array evaluator for fitted scikit-learn tree ensembles.
+
+scikit-learn's ``predict_proba`` re-validates its input and dispatches to
+every tree separately, which dominates latency when scoring one soil
+sample at a time.  ``CompiledForest`` copies the fitted trees into a few
+contiguous NumPy arrays once and then walks all trees together, one
+vectorized step per tree level.
+"""
+import numpy as np
+
+
+class CompiledForest:
+    """Drop-in replacement for ``model.predict_proba`` / ``model.classes_``."""
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.classes_ = classes
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """Compile a fitted RandomForest/ExtraTrees/DecisionTree classifier."""
+        trees = getattr(estimator, 'estimators_', None)
+        if trees is None and hasattr(estimator, 'tree_'):
+            trees = [estimator]
+        if trees is None or len(trees) == 0 or not all(hasattr(t, 'tree_') for t in trees):
+            raise TypeError(f"Cannot compile {type(estimator).__name__}: not a tree ensemble.")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for t in trees:
+            tree = t.tree_
+            n = tree.node_count
+            left = tree.children_left.astype(np.int64)
+            right = tree.children_right.astype(np.int64)
+            leaf = left == -1
+            own = np.arange(n, dtype=np.int64)
+            # Leaves point at themselves so every row can take exactly `depth` steps.
+            left = np.where(leaf, own, left) + offset
+            right = np.where(leaf, own, right) + offset
+            feature = np.where(leaf, 0, tree.feature)
+            threshold = np.where(leaf, np.inf, tree.threshold)
+
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value / totals)
+            roots.append(offset)
+            offset += n
+            depth = max(depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            depth=int(depth),
+            classes=np.asarray(estimator.classes_),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X, roots=None):
+        """Return the leaf index reached in every tree, shape (n_samples, n_trees)."""
+        # scikit-learn compares float32 inputs against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        roots = self.roots if roots is None else roots
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.repeat(roots[None, :], X.shape[0], axis=0)
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X, chunk_size=1024):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        # Gathering leaf values is (rows, trees, classes); chunk rows to bound memory.
+        out = np.empty((X.shape[0], self.value.shape[1]))
+        for start in range(0, X.shape[0], chunk_size):
+            leaves = self.apply(X[start:start + chunk_size])
+            out[start:start + chunk_size] = self.value[leaves].mean(axis=1)
+        return out
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def compile_model(model):
+    """Return a ``CompiledForest`` for tree models, or the model unchanged otherwise."""
+    try:
+        return CompiledForest.from_estimator(model)
+    except TypeError:
+        return model
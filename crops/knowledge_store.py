@@ -0,0 +1,293 @@
+# crops/knowledge_store.py
+"""Packed, lazily loaded storage for the crop knowledge base.
+
+The knowledge base lives in ``crops/knowledge/``:
+
+* ``knowledge_base.jsonl`` - one compact JSON document per crop;
+* ``index.json`` - per-crop byte offset, length and SHA-256 into that
+  file, plus everything that is cheap to precompute at build time
+  (aliases, guidance summaries, stage lists, stage calendars in days from
+  planting, numeric requirement ranges from ``crops/ranges.py``, and
+  each crop's canonical section -> record key map from
+  ``crops/sections.py``).
+
+Only the small index is parsed on first use; a crop's full record is
+read and parsed the first time it is asked for and kept in a bounded LRU
+cache.  ``manage.py build_knowledge_base`` writes and validates these
+files.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .ranges import RANGE_FIELDS, crop_ranges, range_text
+from .sections import SECTIONS, SECTION_ALIASES, canonical_section, section_keys
+from .stages import harvest_window, stage_calendar, stage_sort_key
+
+KNOWLEDGE_DIR = Path(__file__).resolve().parent / 'knowledge'
+RECORDS_FILE = 'knowledge_base.jsonl'
+INDEX_FILE = 'index.json'
+FORMAT_VERSION = 4
+RECORD_CACHE_SIZE = 8
+
+
+class FrozenDict(dict):
+    """A dict that refuses mutation, so shared records can be handed out without copying.
+
+    Still a ``dict`` subclass, so it serializes with ``json`` / ``JsonResponse`` as usual.
+    """
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Crop knowledge records are read-only.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().replace("_", " ").split())
+
+
+# --- Derived data, computed once at build time ---
+def guidance_summary(crop: Dict[str, Any]) -> Dict[str, Any]:
+    profile = crop.get("crop_profile", {})
+    return {
+        "common_names": profile.get("common_names", []),
+        "botanical_name": profile.get("botanical_name", ""),
+        "growth_duration": profile.get("growth_duration", ""),
+        "yield_range": profile.get("yield_range", ""),
+        "economic_value": profile.get("economic_value", []),
+    }
+
+
+def stage_list(crop: Dict[str, Any]) -> Optional[List[str]]:
+    key = section_keys(crop).get("growth_stages")
+    if key is None:
+        return None
+    stages = crop[key]
+    if isinstance(stages, dict):
+        return [v for k, v in sorted(stages.items(), key=lambda x: stage_sort_key(x[0]))]
+    elif isinstance(stages, list):
+        return stages
+    return None
+
+
+def _derived(name: str, crop: Dict[str, Any]) -> Dict[str, Any]:
+    stages = stage_list(crop)
+    calendar = stage_calendar(stages)
+    return {
+        "aliases": [name, *crop.get("crop_profile", {}).get("common_names", [])],
+        "guidance": guidance_summary(crop),
+        "stages": stages,
+        "calendar": {"stages": calendar, "harvest": harvest_window(crop, calendar)},
+        "sections": section_keys(crop),
+        "ranges": crop_ranges(crop),
+    }
+
+
+def _encode(crop: Dict[str, Any]) -> bytes:
+    return json.dumps(crop, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+# --- Writing and validation ---
+def write_knowledge_base(crops: Dict[str, Dict[str, Any]], directory=KNOWLEDGE_DIR) -> Dict[str, Any]:
+    """Pack ``{crop name: record}`` into the records file and its index."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    entries = {}
+    aliases = {}
+    blob = bytearray()
+    for name, crop in crops.items():
+        name = normalize_name(name)
+        encoded = _encode(crop)
+        entries[name] = {
+            "offset": len(blob),
+            "length": len(encoded),
+            "sha256": hashlib.sha256(encoded).hexdigest(),
+            **_derived(name, crop),
+        }
+        blob += encoded + b"\n"
+    for name, entry in entries.items():
+        for alias in entry["aliases"]:
+            # Crop keys win over another crop's common name
+            aliases.setdefault(normalize_name(alias), name)
+    index = {
+        "format": FORMAT_VERSION,
+        "sha256": hashlib.sha256(blob).hexdigest(),
+        "aliases": aliases,
+        "crops": entries,
+    }
+    _atomic_write(directory / RECORDS_FILE, bytes(blob))
+    _atomic_write(directory / INDEX_FILE, json.dumps(index, ensure_ascii=False, indent=1).encode('utf-8') + b"\n")
+    return index
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def read_records(directory=KNOWLEDGE_DIR) -> Dict[str, Dict[str, Any]]:
+    """Read every record as plain dicts, from an index of any format version (for re-packing)."""
+    directory = Path(directory)
+    index = json.loads((directory / INDEX_FILE).read_text(encoding='utf-8'))
+    blob = (directory / RECORDS_FILE).read_bytes()
+    return {
+        name: json.loads(blob[entry["offset"]:entry["offset"] + entry["length"]])
+        for name, entry in index["crops"].items()
+    }
+
+
+def validate_knowledge_base(directory=KNOWLEDGE_DIR) -> List[str]:
+    """Return a list of problems with the packed knowledge base (empty when valid)."""
+    directory = Path(directory)
+    try:
+        index = json.loads((directory / INDEX_FILE).read_text(encoding='utf-8'))
+        blob = (directory / RECORDS_FILE).read_bytes()
+    except (OSError, ValueError) as e:
+        return [f"Cannot read knowledge base: {e}"]
+
+    problems = []
+    if index.get("format") != FORMAT_VERSION:
+        problems.append(f"Unsupported index format {index.get('format')!r}.")
+    if hashlib.sha256(blob).hexdigest() != index.get("sha256"):
+        problems.append(f"{RECORDS_FILE} does not match the checksum in {INDEX_FILE}; rebuild the index.")
+    crops = index.get("crops", {})
+    lines = blob.count(b"\n")
+    if lines != len(crops):
+        problems.append(f"{RECORDS_FILE} has {lines} records but the index lists {len(crops)}.")
+    for name, entry in crops.items():
+        data = blob[entry["offset"]:entry["offset"] + entry["length"]]
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            problems.append(f"{name}: record bytes do not match their checksum.")
+            continue
+        try:
+            crop = json.loads(data)
+        except ValueError as e:
+            problems.append(f"{name}: invalid JSON ({e}).")
+            continue
+        if not isinstance(crop, dict) or not isinstance(crop.get("crop_profile"), dict):
+            problems.append(f"{name}: missing a 'crop_profile' section.")
+            continue
+        seen = {}
+        for key in crop:
+            if key not in SECTION_ALIASES:
+                problems.append(f"{name}: section '{key}' is not in the canonical taxonomy (crops/sections.py).")
+            elif SECTION_ALIASES[key] in seen:
+                problems.append(f"{name}: sections '{seen[SECTION_ALIASES[key]]}' and '{key}' "
+                                f"both map to '{SECTION_ALIASES[key]}'.")
+            else:
+                seen[SECTION_ALIASES[key]] = key
+        expected = json.loads(json.dumps(_derived(name, crop), ensure_ascii=False))
+        if expected["stages"] and expected["calendar"]["stages"] is None:
+            problems.append(f"{name}: growth stages do not all read 'Name (a–b days|weeks|months): task'.")
+        for field, value in expected["ranges"].items():
+            if value is None and range_text(crop, field) is not None:
+                problems.append(f"{name}: {field} '{range_text(crop, field)}' has no 'a–b' range "
+                                f"(in {RANGE_FIELDS[field][2]}).")
+        for key, value in expected.items():
+            if entry.get(key) != value:
+                problems.append(f"{name}: precomputed '{key}' is stale; rebuild the index.")
+    for alias, name in index.get("aliases", {}).items():
+        if name not in crops:
+            problems.append(f"Alias '{alias}' points at unknown crop '{name}'.")
+    return problems
+
+
+# --- Reading ---
+class KnowledgeStore(Mapping):
+    """Read-only mapping of crop name -> frozen record, loaded on demand."""
+
+    def __init__(self, directory=KNOWLEDGE_DIR, cache_size=RECORD_CACHE_SIZE):
+        self.directory = Path(directory)
+        self._index = None
+        self._lock = threading.Lock()
+        self._record = lru_cache(maxsize=cache_size)(self._read_record)
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> Dict[str, Any]:
+        raw = json.loads((self.directory / INDEX_FILE).read_text(encoding='utf-8'))
+        if raw.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported knowledge index format {raw.get('format')!r}.")
+        crops = raw["crops"]
+        return {
+            "sha256": raw["sha256"],
+            "aliases": raw["aliases"],
+            "locations": {name: (e["offset"], e["length"]) for name, e in crops.items()},
+            "hashes": {name: e["sha256"] for name, e in crops.items()},
+            "guidance": {name: freeze(e["guidance"]) for name, e in crops.items()},
+            "stages": {name: freeze(e["stages"]) for name, e in crops.items()},
+            "sections": {name: e["sections"] for name, e in crops.items()},
+            "calendars": {name: e["calendar"] for name, e in crops.items()},
+            "ranges": {name: e["ranges"] for name, e in crops.items()},
+        }
+
+    def raw(self, name: str) -> bytes:
+        """Return a crop's record exactly as stored: compact UTF-8 JSON."""
+        offset, length = self.index["locations"][name]
+        with open(self.directory / RECORDS_FILE, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def _read_record(self, name: str) -> FrozenDict:
+        return freeze(json.loads(self.raw(name)))
+
+    def resolve(self, crop_name: str) -> Optional[str]:
+        """Map a crop name or common name to its knowledge base key in O(1)."""
+        aliases = self.index["aliases"]
+        return aliases.get(crop_name.lower().strip()) or aliases.get(normalize_name(crop_name))
+
+    def section(self, name: str, section: str) -> Any:
+        """Return a crop's section by canonical name or any alias, or None if it has none."""
+        keys = self.index["sections"][name]
+        key = keys.get(canonical_section(section) or section)
+        return self[name][key] if key is not None else None
+
+    def coverage(self) -> Dict[str, Dict[str, bool]]:
+        """Crop -> canonical section -> whether the crop's record has it."""
+        return {
+            name: {section: section in keys for section in SECTIONS}
+            for name, keys in self.index["sections"].items()
+        }
+
+    def __getitem__(self, name: str) -> FrozenDict:
+        if name not in self.index["locations"]:
+            raise KeyError(name)
+        return self._record(name)
+
+    def __iter__(self):
+        return iter(self.index["locations"])
+
+    def __len__(self):
+        return len(self.index["locations"])
+
+    def __contains__(self, name):
+        return name in self.index["locations"]
+
+
+default_store = KnowledgeStore()
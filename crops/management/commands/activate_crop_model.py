@@ -0,0 +1,32 @@
+# crops/management/commands/activate_crop_model.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from crops.registry import ModelRegistry, RegistryError
+
+
+class Command(BaseCommand):
+    help = ("Switch the serving crop model. Running workers pick the change up from the "
+            "registry manifest and hot-swap without a restart.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('version', nargs='?', help="Version to activate; omit to list versions.")
+
+    def handle(self, *args, **options):
+        registry = ModelRegistry(settings.CROPS_MODEL_REGISTRY)
+        manifest = registry.read_manifest()
+        version = options['version']
+        if version is None:
+            for name, entry in manifest['models'].items():
+                marker = '*' if name == manifest.get('active') else ' '
+                f1 = entry.get('metrics', {}).get('f1_macro')
+                self.stdout.write(
+                    f"{marker} {name:<8} {entry['algorithm']:<28} "
+                    f"f1={f1 if f1 is not None else '-'}  {entry['sha256'][:12]}  {entry['artifact']}"
+                )
+            return
+        try:
+            registry.activate(version)
+        except (RegistryError, OSError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Activated crop model {version}."))
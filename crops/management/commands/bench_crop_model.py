@@ -0,0 +1,91 @@
+# crops/management/commands/bench_crop_model.py
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from joblib import load
+
+from crops.forest import CompiledForest
+from crops.training import load_dataset
+
+
+def _latencies(fn, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        for row in rows:
+            start = time.perf_counter()
+            fn(row)
+            timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000.0
+
+
+def _prefix_proba(compiled, budget):
+    """predict_proba over only the first ``budget`` trees, as an early exit at a fixed tree budget would."""
+    roots = compiled.roots[:budget]
+
+    def predict_proba(X):
+        return compiled.value[compiled.apply(X, roots=roots)].mean(axis=1)
+    return predict_proba
+
+
+def _top3(probabilities):
+    return np.argsort(probabilities, axis=1)[:, ::-1][:, :3]
+
+
+class Command(BaseCommand):
+    help = ("Compare single-row predict_proba latency of the pickled crop model and its compiled form; "
+            "--tree-budgets adds latency and agreement with the full forest when scoring stops early.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=str(settings.BASE_DIR / 'crops' / 'crop_model_v1.pkl'))
+        parser.add_argument('--data', nargs='+', default=[str(settings.BASE_DIR / 'Crop_recommendation.csv')],
+                            help="Training CSV(s); several are concatenated.")
+        parser.add_argument('--rows', type=int, default=200, help="Number of dataset rows to score one at a time.")
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--tree-budgets', type=int, nargs='+', metavar='N',
+                            help="Also score with only the first N trees, for each N given.")
+
+    def handle(self, *args, **options):
+        model = load(options['model'])
+        compiled = CompiledForest.from_estimator(model)
+        features, _ = load_dataset(options['data'], getattr(settings, 'CROPS_DATASET_CACHE_DIR', None))
+        X = np.asarray(features, dtype=np.float64)
+        rows = [x.reshape(1, -1) for x in X[:options['rows']]]
+
+        # Warm both paths before timing.
+        model.predict_proba(rows[0])
+        compiled.predict_proba(rows[0])
+
+        agree = np.allclose(model.predict_proba(X), compiled.predict_proba(X))
+        self.stdout.write(f"{compiled.n_trees} trees, {len(compiled.feature)} nodes, max depth {compiled.depth}")
+        self.stdout.write(f"Probabilities match on {len(X)} rows: {agree}")
+
+        results = {}
+        for name, fn in (("sklearn", model.predict_proba), ("compiled", compiled.predict_proba)):
+            ms = _latencies(fn, rows, options['repeat'])
+            results[name] = ms
+            self.stdout.write(
+                f"{name:>9}: p50 {np.percentile(ms, 50):.3f} ms  p99 {np.percentile(ms, 99):.3f} ms  "
+                f"mean {ms.mean():.3f} ms"
+            )
+        speedup = np.median(results['sklearn']) / np.median(results['compiled'])
+        self.stdout.write(self.style.SUCCESS(f"Median speedup: {speedup:.1f}x"))
+
+        if options['tree_budgets']:
+            self._bench_budgets(compiled, X, rows, options)
+
+    def _bench_budgets(self, compiled, X, rows, options):
+        # The evidence for keeping full-forest scoring: early exit has to beat this on both columns
+        full_top = _top3(compiled.predict_proba(X))
+        self.stdout.write(f"\nFirst N of {compiled.n_trees} trees, against the full forest on {len(X)} rows:")
+        for budget in sorted(set(options['tree_budgets'])):
+            budget = min(max(budget, 1), compiled.n_trees)
+            predict_proba = _prefix_proba(compiled, budget)
+            ms = _latencies(predict_proba, rows, options['repeat'])
+            top = _top3(predict_proba(X))
+            self.stdout.write(
+                f"{budget:>5} trees: p50 {np.percentile(ms, 50):.3f} ms  p99 {np.percentile(ms, 99):.3f} ms  "
+                f"top-1 agreement {np.mean(top[:, 0] == full_top[:, 0]):.2%}  "
+                f"top-3 order agreement {np.mean((top == full_top).all(axis=1)):.2%}"
+            )
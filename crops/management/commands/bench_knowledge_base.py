@@ -0,0 +1,43 @@
+# crops/management/commands/bench_knowledge_base.py
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter so the import is really cold. Stdlib modules
+# that Django has always imported already are loaded first, so only the
+# knowledge base's own cost is timed.
+_PROBE = """
+import collections.abc, functools, hashlib, json, os, pathlib, threading, time, typing
+t0 = time.perf_counter()
+import crops.expert_logic as e
+t1 = time.perf_counter()
+e.get_crop_guidance('maize')
+t2 = time.perf_counter()
+e.get_crop_knowledge('maize')
+t3 = time.perf_counter()
+e.get_crop_knowledge('maize')
+t4 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2, t4 - t3)
+"""
+
+
+class Command(BaseCommand):
+    help = "Time a cold import of crops.expert_logic and its first and cached lookups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=20)
+
+    def handle(self, *args, **options):
+        runs = []
+        for _ in range(options['runs']):
+            out = subprocess.run(
+                [sys.executable, '-c', _PROBE], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout
+            runs.append([float(v) * 1000.0 for v in out.split()])
+        labels = ("import", "first guidance (loads index)", "first record read", "cached record")
+        for i, label in enumerate(labels):
+            values = sorted(run[i] for run in runs)
+            self.stdout.write(f"{label:>30}: median {values[len(values) // 2]:.3f} ms  min {values[0]:.3f} ms")
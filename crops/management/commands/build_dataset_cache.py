@@ -0,0 +1,40 @@
+# crops/management/commands/build_dataset_cache.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from crops.dataset import DatasetCache
+
+
+class Command(BaseCommand):
+    help = ("Ingest training CSVs into the memory-mapped dataset cache (float32 features, label codes and a "
+            "class table) that train, tune, retrain and bench_crop_model read. Skipped while the sources "
+            "are unchanged.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('sources', nargs='*', default=[str(settings.BASE_DIR / 'Crop_recommendation.csv')],
+                            metavar='CSV', help="Training CSVs, in the order the commands will be given them.")
+        parser.add_argument('--cache-dir', default=getattr(settings, 'CROPS_DATASET_CACHE_DIR', None))
+        parser.add_argument('--force', action='store_true', help="Rebuild even if the sources are unchanged.")
+        parser.add_argument('--chunk-rows', type=int, default=None, help="CSV rows parsed per chunk.")
+
+    def handle(self, *args, **options):
+        if not options['cache_dir']:
+            raise CommandError("No cache directory: set CROPS_DATASET_CACHE_DIR or pass --cache-dir.")
+        sources = options['sources']
+        cache = DatasetCache.for_sources(options['cache_dir'], sources)
+        start = time.perf_counter()
+        try:
+            if not options['force'] and cache.is_fresh(sources):
+                self.stdout.write(f"{cache.directory} is up to date.")
+                return
+            chunk = {'chunk_rows': options['chunk_rows']} if options['chunk_rows'] else {}
+            manifest = cache.build(sources, **chunk)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"{manifest['rows']} rows, {len(manifest['classes'])} classes from {len(sources)} "
+                          f"source(s); {manifest['dropped_rows']} rows dropped for missing or invalid values.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {cache.directory} in {time.perf_counter() - start:.2f}s."
+        ))
@@ -0,0 +1,119 @@
+# crops/management/commands/build_knowledge_base.py
+import importlib.util
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crops.knowledge_store import (
+    KNOWLEDGE_DIR, KnowledgeStore, normalize_name, read_records, validate_knowledge_base, write_knowledge_base,
+)
+from crops.search import SEARCH_INDEX_FILE, build_search_index, read_search_index, write_search_index
+from crops.sections import SECTIONS
+
+
+def _thaw(value):
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def crops_from_module(path):
+    """Read ``*_knowledge_base`` dict literals from a Python file (the old expert_logic.py layout)."""
+    spec = importlib.util.spec_from_file_location('_legacy_knowledge_base', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if hasattr(module, 'get_all_crops_knowledge_base'):
+        return {name: _thaw(crop) for name, crop in module.get_all_crops_knowledge_base().items()}
+    return {
+        name[:-len('_knowledge_base')].replace('_', ' '): value
+        for name, value in vars(module).items()
+        if name.endswith('_knowledge_base') and isinstance(value, dict)
+    }
+
+
+def crops_from_dir(directory):
+    return {
+        path.stem.replace('_', ' '): json.loads(path.read_text(encoding='utf-8'))
+        for path in sorted(Path(directory).glob('*.json'))
+    }
+
+
+class Command(BaseCommand):
+    help = ("Pack the crop knowledge base into crops/knowledge/ (records file + offset index), "
+            "convert it from other layouts, or validate it.")
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group()
+        source.add_argument('--from-module', help="Convert dict literals from a Python file such as the old expert_logic.py.")
+        source.add_argument('--from-dir', help="Pack one <crop>.json file per crop (as written by --export-dir).")
+        source.add_argument('--export-dir', help="Write each crop as pretty-printed <crop>.json for editing, then stop.")
+        source.add_argument('--check', action='store_true', help="Only validate the packed files.")
+        source.add_argument('--coverage', action='store_true',
+                            help="Print which crops lack which canonical sections, then stop.")
+        parser.add_argument('--output', default=str(KNOWLEDGE_DIR))
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        if options['check']:
+            return self._check(output)
+        if options['coverage']:
+            try:
+                return self._coverage(KnowledgeStore(output))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read the knowledge base in {output}: {e}")
+
+        if options['from_module']:
+            crops = crops_from_module(options['from_module'])
+        elif options['from_dir']:
+            crops = crops_from_dir(options['from_dir'])
+        else:
+            # Re-pack the current records, e.g. to refresh the precomputed index data
+            try:
+                crops = read_records(output)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read the knowledge base in {output} ({e}); "
+                                   f"pass --from-module or --from-dir to build one.")
+        if not crops:
+            raise CommandError("No crops found.")
+
+        if options['export_dir']:
+            export = Path(options['export_dir'])
+            export.mkdir(parents=True, exist_ok=True)
+            for name, crop in crops.items():
+                path = export / f"{normalize_name(name).replace(' ', '_')}.json"
+                path.write_text(json.dumps(crop, ensure_ascii=False, indent=4) + "\n", encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Exported {len(crops)} crops to {export}."))
+            return
+
+        index = write_knowledge_base(crops, output)
+        self.stdout.write(f"Packed {len(index['crops'])} crops into {output} (sha256 {index['sha256'][:12]}…).")
+        search = build_search_index(KnowledgeStore(output), index['sha256'])
+        write_search_index(search, output)
+        self.stdout.write(f"Indexed {len(search['entries'])} passages ({len(search['postings'])} terms) "
+                          f"into {SEARCH_INDEX_FILE}.")
+        self._check(output)
+
+    def _coverage(self, store):
+        coverage = store.coverage()
+        width = max(map(len, SECTIONS))
+        crops = sorted(coverage)
+        self.stdout.write(" " * width + "  " + " ".join(f"{i:>2}" for i in range(1, len(crops) + 1)))
+        for section in SECTIONS:
+            marks = " ".join(" x" if coverage[crop][section] else " ." for crop in crops)
+            self.stdout.write(f"{section:<{width}}  {marks}")
+        self.stdout.write("")
+        for i, crop in enumerate(crops, start=1):
+            missing = [section for section, present in coverage[crop].items() if not present]
+            self.stdout.write(f"{i:>2} {crop}: missing {', '.join(missing) or 'nothing'}")
+
+    def _check(self, directory):
+        problems = validate_knowledge_base(directory)
+        if not problems:
+            if read_search_index(directory, KnowledgeStore(directory).index['sha256']) is None:
+                problems.append(f"{SEARCH_INDEX_FILE} is missing or stale; re-run build_knowledge_base.")
+        if problems:
+            raise CommandError("Knowledge base is invalid:\n  " + "\n  ".join(problems))
+        self.stdout.write(self.style.SUCCESS("Knowledge base is valid."))
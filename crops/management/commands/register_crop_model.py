@@ -0,0 +1,41 @@
+# crops/management/commands/register_crop_model.py
+import os
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from crops.registry import ModelRegistry, RegistryError
+
+
+class Command(BaseCommand):
+    help = "Add a trained crop model artifact to the model registry."
+
+    def add_arguments(self, parser):
+        parser.add_argument('artifact', help="Path to a joblib-pickled classifier.")
+        parser.add_argument('version', help="Version label, e.g. v2.")
+        parser.add_argument('--f1', type=float, help="Macro F1 measured on the held-out split.")
+        parser.add_argument('--notes', default='')
+        parser.add_argument('--activate', action='store_true', help="Make this the serving version.")
+
+    def handle(self, *args, **options):
+        registry = ModelRegistry(settings.CROPS_MODEL_REGISTRY)
+        version = options['version']
+        artifact = f"crop_model_{version}.pkl"
+        destination = os.path.join(registry.directory, artifact)
+        if os.path.exists(destination):
+            raise CommandError(f"{destination} already exists.")
+        shutil.copyfile(options['artifact'], destination)
+
+        metadata = {"notes": options['notes']} if options['notes'] else {}
+        if options['f1'] is not None:
+            metadata["metrics"] = {"f1_macro": options['f1']}
+        try:
+            entry = registry.register(version, artifact, metadata, activate=options['activate'])
+        except RegistryError as e:
+            os.remove(destination)
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {version} ({entry['algorithm']}, sha256 {entry['sha256'][:12]}…)"
+            + (" and activated it." if options['activate'] else ".")
+        ))
@@ -0,0 +1,143 @@
+# crops/management/commands/retrain_crop_model.py
+import os
+import re
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from joblib import dump
+
+from crops.models import RecommendationFeedback
+from crops.registry import FEATURES, ModelRegistry, RegistryError
+from crops.retraining import (
+    TRAINING_OUTCOMES, feature_rows, gate, holdout_mask, match_labels, replay_sample, warm_start_forest,
+)
+from crops.training import load_dataset, profile_model, split
+
+
+class Command(BaseCommand):
+    help = ("Add trees to the serving crop forest from farmer feedback received since it was trained, "
+            "and register the result in the model registry if it does at least as well on a holdout. "
+            "It only starts serving with --activate.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', nargs='+', default=[str(settings.BASE_DIR / 'Crop_recommendation.csv')],
+                            help="Original training CSV(s), for the replay sample and the base holdout.")
+        parser.add_argument('--trees', type=int, default=20, help="Trees to add.")
+        parser.add_argument('--replay-per-class', type=int, default=20,
+                            help="Original rows per class mixed into the new trees' training data.")
+        parser.add_argument('--min-feedback', type=int, default=50,
+                            help="Skip retraining until this many new usable feedback rows exist.")
+        parser.add_argument('--min-gain', type=float, default=0.0,
+                            help="Holdout macro F1 the candidate must gain over the serving model (may be negative).")
+        parser.add_argument('--as-version', metavar='VERSION',
+                            help="Version label for the new model (default: next vN).")
+        parser.add_argument('--activate', action='store_true',
+                            help="Serve the promoted model right away (default: register it for review; "
+                                 "activate_crop_model switches to it later).")
+        parser.add_argument('--dry-run', action='store_true', help="Train and compare, but register nothing.")
+
+    def handle(self, *args, **options):
+        registry = ModelRegistry(settings.CROPS_MODEL_REGISTRY)
+        manifest = registry.read_manifest()
+        parent = manifest.get('active')
+        try:
+            current = registry.load_version(parent, manifest)
+        except (RegistryError, OSError) as e:
+            raise CommandError(str(e))
+        since = current.metadata.get('feedback_through', 0)
+
+        # Only feedback newer than the serving model is read, so the cost tracks new data, not history
+        through = RecommendationFeedback.objects.filter(id__gt=since).aggregate(last=Max('id'))['last']
+        if through is None:
+            self.stdout.write(f"No feedback since {parent} was trained.")
+            return
+        records = list(RecommendationFeedback.objects.filter(
+            id__gt=since, id__lte=through, outcome__in=TRAINING_OUTCOMES,
+        ).values('id', 'planted_crop', *FEATURES))
+        ids = np.array([r['id'] for r in records], dtype=np.int64)
+        X_new = feature_rows(records)
+        y_new = match_labels([r['planted_crop'] for r in records], current.model.classes_)
+        known = y_new != ""
+        held_out = holdout_mask(ids) & known
+        train = known & ~held_out
+        self.stdout.write(
+            f"Feedback {since + 1}..{through}: {len(records)} good/fair reports, {int((~known).sum())} for crops "
+            f"the model does not know, {int(train.sum())} to train on, {int(held_out.sum())} held out."
+        )
+        if train.sum() < options['min_feedback']:
+            self.stdout.write(f"Fewer than {options['min_feedback']} usable rows; not retraining yet.")
+            return
+
+        X, y = load_dataset(options['data'], getattr(settings, 'CROPS_DATASET_CACHE_DIR', None))
+        X_train, X_test, y_train, y_test = split(X, y)
+        X_replay, y_replay = replay_sample(np.asarray(X_train, dtype=np.float64), np.asarray(y_train).astype(str),
+                                           options['replay_per_class'])
+        start = time.perf_counter()
+        try:
+            candidate = warm_start_forest(
+                current.model,
+                np.vstack([X_new[train], X_replay]),
+                np.concatenate([y_new[train].astype(str), y_replay]),
+                options['trees'],
+                random_state=int(through),
+            )
+        except (TypeError, ValueError) as e:
+            raise CommandError(str(e))
+        fit_seconds = time.perf_counter() - start
+
+        X_holdout = np.vstack([np.asarray(X_test, dtype=np.float64), X_new[held_out]])
+        y_holdout = np.concatenate([np.asarray(y_test).astype(str), y_new[held_out].astype(str)])
+        result = gate(current.model, candidate, X_holdout, y_holdout, options['min_gain'])
+        self.stdout.write(
+            f"Added {options['trees']} trees in {fit_seconds:.2f}s. Holdout macro F1 on {result['rows']} rows: "
+            f"{parent} {result['current_f1']:.4f} -> candidate {result['candidate_f1']:.4f}."
+        )
+        if not result['promote']:
+            self.stdout.write(self.style.WARNING(
+                f"Candidate gains less than {options['min_gain']:g}; keeping {parent}. "
+                "Its feedback stays pending for the next run."
+            ))
+            return
+        if options['dry_run']:
+            self.stdout.write("Dry run; nothing registered.")
+            return
+        self._promote(registry, manifest, parent, candidate, result, X_holdout, {
+            "feedback_through": int(through),
+            "feedback_rows": int(train.sum()),
+            "trees_added": options['trees'],
+            "fit_seconds": round(fit_seconds, 3),
+        }, options)
+
+    def _promote(self, registry, manifest, parent, candidate, result, X_holdout, lineage, options):
+        version = options['as_version'] or self._next_version(manifest)
+        artifact = f"crop_model_{version}.pkl"
+        destination = os.path.join(registry.directory, artifact)
+        if os.path.exists(destination):
+            raise CommandError(f"{destination} already exists.")
+        dump(candidate, destination)
+        metadata = {
+            "metrics": {"f1_macro": result['candidate_f1']},
+            "profile": profile_model(candidate, X_holdout),
+            "parent": parent,
+            "holdout": result,
+            **lineage,
+            "notes": f"{parent} plus {lineage['trees_added']} trees warm-started on "
+                     f"{lineage['feedback_rows']} feedback rows by retrain_crop_model.",
+        }
+        try:
+            registry.register(version, artifact, metadata, activate=options['activate'])
+        except RegistryError as e:
+            os.remove(destination)
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {version} ({len(candidate.estimators_)} trees)"
+            + (" and activated it." if options['activate'] else "; activate it with activate_crop_model.")
+        ))
+
+    @staticmethod
+    def _next_version(manifest):
+        numbers = [int(m.group(1)) for v in manifest['models'] if (m := re.fullmatch(r"v(\d+)", v))]
+        return f"v{max(numbers, default=0) + 1}"
@@ -0,0 +1,122 @@
+# crops/management/commands/train_crop_model.py
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from joblib import dump
+
+from crops.registry import ModelRegistry, RegistryError
+from crops.training import (
+    CANDIDATES, RANDOM_STATE, TEST_SIZE, compare_models, leaderboard, load_dataset, select, split, write_report,
+)
+
+
+class Command(BaseCommand):
+    help = ("Fit the candidate crop models in parallel, profile their serving latency and size, write a "
+            "JSON leaderboard and confusion matrices, and optionally save or register the selected model.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', nargs='+', default=[str(settings.BASE_DIR / 'Crop_recommendation.csv')],
+                            help="Training CSV(s); several are concatenated.")
+        parser.add_argument('--models', nargs='+', choices=list(CANDIDATES), metavar='MODEL',
+                            help=f"Candidates to fit (default: all of {', '.join(CANDIDATES)}).")
+        parser.add_argument('--params', metavar='JSON',
+                            help="Hyperparameters per model overriding the defaults, e.g. tune_crop_model's "
+                                 "best_params.json.")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: one per model, up to the CPU count).")
+        parser.add_argument('--report-dir', default='training_report',
+                            help="Directory for leaderboard.json and the confusion matrices.")
+        parser.add_argument('--latency-budget-ms', type=float,
+                            default=getattr(settings, 'CROPS_LATENCY_BUDGET_MS', 5.0),
+                            help="Single-row p99 predict_proba budget for the selected model.")
+        parser.add_argument('--f1-tolerance', type=float,
+                            default=getattr(settings, 'CROPS_SELECTION_F1_TOLERANCE', 0.005),
+                            help="Prefer a faster model whose macro F1 is at most this much below the best.")
+        parser.add_argument('--save', help="Write the selected model to this path with joblib, "
+                                           "and its profile next to it as <path>.profile.json.")
+        parser.add_argument('--register', metavar='VERSION',
+                            help="Add the selected model to the model registry under this version.")
+        parser.add_argument('--activate', action='store_true', help="With --register, make it the serving version.")
+        parser.add_argument('--json', action='store_true', help="Print the leaderboard as JSON instead of a table.")
+
+    def handle(self, *args, **options):
+        params = None
+        if options['params']:
+            try:
+                with open(options['params'], encoding='utf-8') as f:
+                    params = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {options['params']}: {e}")
+        X, y = load_dataset(options['data'], getattr(settings, 'CROPS_DATASET_CACHE_DIR', None))
+        X_train, X_test, y_train, y_test = split(X, y)
+        start = time.perf_counter()
+        try:
+            results = compare_models(X_train, y_train, X_test, y_test, options['models'], options['workers'],
+                                     params=params)
+        except (TypeError, ValueError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+        best, reason = select(results, options['latency_budget_ms'], options['f1_tolerance'])
+        selection = {"model": best['model'], "reason": reason,
+                     "latency_budget_ms": options['latency_budget_ms'], "f1_tolerance": options['f1_tolerance']}
+
+        write_report(results, options['report_dir'], {
+            "data": [os.path.basename(path) for path in options['data']],
+            "train_rows": len(X_train),
+            "test_rows": len(X_test),
+            "wall_seconds": round(elapsed, 3),
+            "selection": selection,
+        }, selected=best)
+        if options['json']:
+            self.stdout.write(json.dumps({"selection": selection, "leaderboard": leaderboard(results, best)}, indent=2))
+        else:
+            for row in leaderboard(results, best):
+                m, p = row['metrics'], row['profile']
+                marker = '*' if row['selected'] else ('P' if row['pareto'] else ' ')
+                self.stdout.write(
+                    f"{marker} {row['rank']}. {row['model']:<18} f1={m['f1_macro']:.4f}  acc={m['accuracy']:.4f}  "
+                    f"p50/p99 {p['single_ms']['p50']:.3f}/{p['single_ms']['p99']:.3f} ms  "
+                    f"batch[{p['batch_ms']['rows']}] p50 {p['batch_ms']['p50']:.2f} ms  "
+                    f"{p['size_bytes'] / 1024:.0f} KiB  load {p['load_ms']:.1f} ms  fit {row['fit_seconds']:.2f}s"
+                )
+            self.stdout.write(f"Fitted {len(results)} models in {elapsed:.2f}s; report in {options['report_dir']}/")
+            self.stdout.write("(* selected, P Pareto-optimal)")
+            self.stdout.write(f"Selected '{best['model']}': {reason}.")
+
+        if options['save']:
+            dump(best['estimator'], options['save'])
+            with open(options['save'] + '.profile.json', 'w', encoding='utf-8') as f:
+                json.dump({"model": best['model'], "metrics": best['metrics'], "profile": best['profile'],
+                           "selection": selection}, f, indent=2)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Model '{best['model']}' saved as '{options['save']}'"))
+        if options['register']:
+            self._register(best, selection, options)
+
+    def _register(self, best, selection, options):
+        registry = ModelRegistry(settings.CROPS_MODEL_REGISTRY)
+        version = options['register']
+        artifact = f"crop_model_{version}.pkl"
+        destination = os.path.join(registry.directory, artifact)
+        if os.path.exists(destination):
+            raise CommandError(f"{destination} already exists.")
+        dump(best['estimator'], destination)
+        metadata = {
+            "metrics": {k: float(v) for k, v in best['metrics'].items()},
+            "profile": best['profile'],
+            "selection": selection,
+            "notes": f"{best['model']}, selected from {len(options['models'] or CANDIDATES)} candidates by "
+                     f"train_crop_model on {', '.join(os.path.basename(path) for path in options['data'])} "
+                     f"({TEST_SIZE:.0%} held out, random_state={RANDOM_STATE}).",
+        }
+        try:
+            registry.register(version, artifact, metadata, activate=options['activate'])
+        except RegistryError as e:
+            os.remove(destination)
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {version} ({best['algorithm']})" + (" and activated it." if options['activate'] else ".")
+        ))
@@ -0,0 +1,66 @@
+# crops/management/commands/tune_crop_model.py
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from crops.training import load_dataset
+from crops.tuning import SEARCH_SPACES, SuccessiveHalvingSearch, best_params
+
+
+class Command(BaseCommand):
+    help = ("Search crop model hyperparameters with k-fold CV and successive halving on a process pool. "
+            "The search state is saved as it goes, so an interrupted or time-limited run resumes; the "
+            "best parameters per model feed train_crop_model --params.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', nargs='+', default=[str(settings.BASE_DIR / 'Crop_recommendation.csv')],
+                            help="Training CSV(s); several are concatenated.")
+        parser.add_argument('--models', nargs='+', choices=list(SEARCH_SPACES), metavar='MODEL',
+                            help=f"Candidates to tune (default: all of {', '.join(SEARCH_SPACES)}).")
+        parser.add_argument('--folds', type=int, default=5)
+        parser.add_argument('--factor', type=int, default=3,
+                            help="Keep the best 1/factor configurations per round, with factor times more rows.")
+        parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+        parser.add_argument('--time-budget', type=float, default=None, metavar='SECONDS',
+                            help="Stop submitting fits after this long; rerun to resume.")
+        parser.add_argument('--state-dir', default='tuning_state',
+                            help="Directory for the cached folds and the resumable search state.")
+        parser.add_argument('--fresh', action='store_true', help="Ignore any saved search state.")
+        parser.add_argument('--output', help="Where to write the best parameters (default: <state-dir>/best_params.json).")
+
+    def handle(self, *args, **options):
+        if options['folds'] < 2 or options['factor'] < 2:
+            raise CommandError("--folds and --factor must be at least 2.")
+        X, y = load_dataset(options['data'], getattr(settings, 'CROPS_DATASET_CACHE_DIR', None))
+        search = SuccessiveHalvingSearch(
+            X, y, options['state_dir'], options['models'], k=options['folds'], factor=options['factor'],
+            workers=options['workers'], time_budget=options['time_budget'], log=self.stdout.write,
+        )
+        start = time.perf_counter()
+        state = search.run(fresh=options['fresh'])
+        self.stdout.write(f"Search took {time.perf_counter() - start:.1f}s.")
+
+        if state['rounds']:
+            last = state['rounds'][-1]
+            self.stdout.write(f"Top configurations on {last['rows']} rows per fold:")
+            configs = {c['id']: c for c in state['configs']}
+            for entry in last['ranking'][:5]:
+                score = "failed" if entry.get('failed') else f"f1={entry['f1']:.4f} ±{entry['f1_std']:.4f}"
+                self.stdout.write(f"  {score}  fit {entry['fit_seconds']:.2f}s  "
+                                  f"{configs[entry['id']]['model']} {json.dumps(configs[entry['id']]['params'])}")
+        if not state['best']:
+            self.stdout.write(self.style.WARNING("No configuration finished a round: the time budget ran out "
+                                                 "or every fit failed."))
+            return
+        output = options['output'] or os.path.join(options['state_dir'], 'best_params.json')
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(best_params(state), f, indent=2)
+            f.write('\n')
+        status = "complete" if state['complete'] else "partial (rerun to resume)"
+        self.stdout.write(self.style.SUCCESS(
+            f"Search {status}; best parameters for {', '.join(state['best'])} written to {output}. "
+            f"Train with: manage.py train_crop_model --params {output}"
+        ))
@@ -0,0 +1,92 @@
+# crops/metrics.py
+"""Prometheus metrics for the crop recommendation path (served at /api/metrics/).
+
+Under gunicorn every worker keeps its own values.  gunicorn.conf.py sets
+``PROMETHEUS_MULTIPROC_DIR`` before the app is imported, so each process
+writes its values to files there and ``exposition`` merges all of them;
+without it (runserver, tests) the process's own registry is served.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+RECOMMENDATION_STAGES = ('parse', 'features', 'cache', 'predict', 'topk', 'guidance', 'serialize')
+
+RECOMMENDATION_SECONDS = Histogram(
+    'crops_recommendation_seconds',
+    'End-to-end time of /api/recommend/ requests',
+    buckets=LATENCY_BUCKETS,
+)
+RECOMMENDATION_STAGE_SECONDS = Histogram(
+    'crops_recommendation_stage_seconds',
+    'Time spent in each stage of /api/recommend/',
+    ['stage'],
+    buckets=LATENCY_BUCKETS,
+)
+RECOMMENDATION_ERRORS = Counter(
+    'crops_recommendation_errors_total',
+    'Failed /api/recommend/ requests by the stage that raised and the exception type',
+    ['stage', 'exception'],
+)
+# Bind label children once; .labels() takes a lock on every call.
+_STAGE_HISTOGRAMS = {name: RECOMMENDATION_STAGE_SECONDS.labels(stage=name) for name in RECOMMENDATION_STAGES}
+
+
+@contextmanager
+def stage(name):
+    """Time one stage of the recommendation path and count the exceptions it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        RECOMMENDATION_ERRORS.labels(stage=name, exception=type(e).__name__).inc()
+        raise
+    finally:
+        _STAGE_HISTOGRAMS[name].observe(time.perf_counter() - start)
+
+
+MICROBATCH_QUEUE_DEPTH = Gauge(
+    'crops_microbatch_queue_depth',
+    'Recommendation requests waiting to be scored by the micro-batcher',
+    multiprocess_mode='livesum',
+)
+MICROBATCH_SIZE = Histogram(
+    'crops_microbatch_size',
+    'Rows scored per micro-batch',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+MICROBATCH_WAIT_SECONDS = Histogram(
+    'crops_microbatch_wait_seconds',
+    'Time a request spent queued before its micro-batch was scored',
+    buckets=(0.0005, 0.001, 0.002, 0.003, 0.005, 0.0075, 0.01, 0.025, 0.05, 0.1),
+)
+
+RECOMMENDATION_CACHE_HITS = Counter(
+    'crops_recommendation_cache_hits_total',
+    'Recommendation requests answered from the quantized-input cache',
+)
+RECOMMENDATION_CACHE_MISSES = Counter(
+    'crops_recommendation_cache_misses_total',
+    'Recommendation requests that had to be scored by the model',
+)
+RECOMMENDATION_CACHE_EVICTIONS = Counter(
+    'crops_recommendation_cache_evictions_total',
+    'Entries dropped from the recommendation cache',
+    ['reason'],
+)
+
+
+def exposition() -> bytes:
+    """All metrics in the Prometheus text format, merged across worker processes when in multiprocess mode."""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return generate_latest(registry)
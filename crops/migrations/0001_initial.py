@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationFeedback',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('N', models.FloatField()),
+                ('P', models.FloatField()),
+                ('K', models.FloatField()),
+                ('temperature', models.FloatField()),
+                ('humidity', models.FloatField()),
+                ('ph', models.FloatField()),
+                ('rainfall', models.FloatField()),
+                ('recommended_crop', models.CharField(blank=True, max_length=64)),
+                ('planted_crop', models.CharField(max_length=64)),
+                ('outcome', models.CharField(choices=[('good', 'Good harvest'), ('fair', 'Fair harvest'), ('poor', 'Poor harvest or crop failure')], max_length=8)),
+                ('model_version', models.CharField(blank=True, max_length=32)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='crop_feedback', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -1,3 +1,37 @@
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+class RecommendationFeedback(models.Model):
+    """A farmer's report of what they planted under given soil and weather readings, and how it went.
+
+    Successful plantings become extra training rows for ``manage.py retrain_crop_model``.
+    """
+    OUTCOME_GOOD = 'good'
+    OUTCOME_FAIR = 'fair'
+    OUTCOME_POOR = 'poor'
+    OUTCOMES = [
+        (OUTCOME_GOOD, 'Good harvest'),
+        (OUTCOME_FAIR, 'Fair harvest'),
+        (OUTCOME_POOR, 'Poor harvest or crop failure'),
+    ]
+
+    user = models.ForeignKey(User, related_name='crop_feedback', blank=True, null=True, on_delete=models.SET_NULL)
+    N = models.FloatField()
+    P = models.FloatField()
+    K = models.FloatField()
+    temperature = models.FloatField()
+    humidity = models.FloatField()
+    ph = models.FloatField()
+    rainfall = models.FloatField()
+    recommended_crop = models.CharField(max_length=64, blank=True)
+    planted_crop = models.CharField(max_length=64)
+    outcome = models.CharField(max_length=8, choices=OUTCOMES)
+    model_version = models.CharField(max_length=32, blank=True)
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.planted_crop} ({self.outcome}) #{self.pk}'
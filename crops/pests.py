@@ -0,0 +1,164 @@
+# crops/pests.py
+"""Pest and disease -> crop index built from the knowledge base.
+
+Every crop's pest and disease section (whatever its record key, see
+``crops/sections.py``) lists pests and diseases with their control
+advice.  ``PestIndex`` reads them once and keeps both directions of the
+bipartite graph: pest -> {crop: control} and crop -> pests.  Names are
+normalized so that ``stem_borers`` (maize), ``stem borer`` (sugarcane)
+and ``rice_stem_borer`` (rice) are one pest: underscores become spaces,
+a leading crop name and parenthesized abbreviations are dropped (the
+abbreviation becomes an alias) and words are stemmed as in search.  A
+crop name is only dropped down to a single word when another crop lists
+a pest by exactly that word ('sugarcane aphids' -> 'aphids'); otherwise
+'sunflower moth' would become a bare 'moth' and hide the other moths.
+"""
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .knowledge_store import default_store
+from .search import stem
+
+PEST_SECTION = "pest_and_disease_control"
+
+_ABBREVIATION = re.compile(r"\s*\(([^)]*)\)\s*")
+
+
+def _kind(key: str) -> Optional[str]:
+    key = key.lower()
+    if "pest" in key:
+        return "pest"
+    if "disease" in key:
+        return "disease"
+    return None
+
+
+def pest_key(name: str) -> str:
+    return " ".join(stem(w) for w in re.findall(r"[^\W_]+", name.lower()))
+
+
+class PestIndex:
+    def __init__(self, store=default_store):
+        self.store = store
+        self._built = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        if self._built is None:
+            with self._lock:
+                if self._built is None:
+                    self._built = self._build()
+        return self._built
+
+    def _build(self):
+        pests: Dict[str, Dict[str, object]] = {}
+        aliases: Dict[str, str] = {}
+        by_crop: Dict[str, set] = {}
+        # (crop, kind, control, words, abbreviations, words without the crop name or None)
+        listed = []
+        for crop in self.store:
+            section = self.store.section(crop, PEST_SECTION) or {}
+            crop_names = {pest_key(crop), *(pest_key(n) for n in self.store.index["guidance"][crop]["common_names"])}
+            for group, entries in section.items():
+                kind = _kind(group)
+                if kind is None or not isinstance(entries, Mapping):
+                    continue
+                for label, control in entries.items():
+                    abbreviations = _ABBREVIATION.findall(label)
+                    label = _ABBREVIATION.sub(" ", label).replace("_", " ").strip()
+                    # 'thrips and aphids' covers two pests
+                    for name in label.split(" and "):
+                        words = name.lower().split()
+                        # 'rice stem borer' on rice is just 'stem borer'
+                        stripped = next((words[size:] for size in (2, 1)
+                                         if len(words) > size and pest_key(" ".join(words[:size])) in crop_names), None)
+                        listed.append((crop, kind, control, words, abbreviations, stripped))
+        # Names that stand on their own: as listed, or still specific (two words or more) without the crop
+        named = {pest_key(" ".join(words if stripped is None else stripped))
+                 for _, _, _, words, _, stripped in listed if stripped is None or len(stripped) > 1}
+        for crop, kind, control, words, abbreviations, stripped in listed:
+            if stripped is not None and (len(stripped) > 1 or pest_key(" ".join(stripped)) in named):
+                words = stripped
+            key = pest_key(" ".join(words))
+            entry = pests.setdefault(key, {"name": " ".join(words), "kind": kind, "crops": {}})
+            entry["crops"][crop] = control
+            by_crop.setdefault(crop, set()).add(key)
+            for abbreviation in abbreviations:
+                aliases[pest_key(abbreviation)] = key
+        keys = sorted(pests)
+        # Crop x pest incidence matrix, for counting exposure over many farms at once
+        crops = list(self.store)
+        incidence = np.zeros((len(crops), len(keys)), dtype=bool)
+        for i, crop in enumerate(crops):
+            for key in by_crop.get(crop, ()):
+                incidence[i, keys.index(key)] = True
+        return {
+            "pests": pests,
+            "aliases": aliases,
+            "by_crop": {crop: frozenset(keys) for crop, keys in by_crop.items()},
+            "keys": keys,
+            "crops": crops,
+            "incidence": incidence,
+        }
+
+    # --- Queries ---
+    def resolve(self, name: str) -> FrozenSet[str]:
+        """Pests matching a name: the exact pest if there is one, else every pest whose
+        name contains all the query's words ('borer' -> stem, pod and root borer)."""
+        built = self.built
+        key = pest_key(name)
+        key = built["aliases"].get(key, key)
+        if key in built["pests"]:
+            return frozenset([key])
+        words = set(key.split())
+        if not words:
+            return frozenset()
+        return frozenset(k for k in built["keys"] if words <= set(k.split()))
+
+    def describe(self, key: str) -> Dict[str, object]:
+        pest = self.built["pests"][key]
+        return {"pest": pest["name"], "kind": pest["kind"], "crops": dict(pest["crops"])}
+
+    def crops_at_risk(self, names: Iterable[str], match: str = "any") -> Tuple[Dict[str, List[str]], List[str]]:
+        """Crops affected by any (union) or all (intersection) of the named pests.
+
+        Returns ({crop: [matched pest names]}, [names that matched no pest]).
+        No crop is known to have a pest that matched nothing, so with
+        ``match="all"`` a single unknown name leaves no crops.
+        """
+        built = self.built
+        resolved = [(name, self.resolve(name)) for name in names]
+        unknown = [name for name, keys in resolved if not keys]
+        crop_sets = [frozenset().union(*(built["pests"][k]["crops"] for k in keys))
+                     for _, keys in resolved if keys]
+        if not crop_sets or (match == "all" and unknown):
+            return {}, unknown
+        crops = frozenset.intersection(*crop_sets) if match == "all" else frozenset.union(*crop_sets)
+        wanted = frozenset().union(*(keys for _, keys in resolved))
+        return {
+            crop: sorted(built["pests"][k]["name"] for k in built["by_crop"][crop] & wanted)
+            for crop in sorted(crops)
+        }, unknown
+
+    def exposure(self, farm_crops: Iterable[str], keys: Iterable[str]) -> np.ndarray:
+        """Boolean (farms x pests) matrix: whether each farm's crop is affected by each pest key.
+
+        Farm crops are names or aliases; unknown crops are never exposed.
+        """
+        built = self.built
+        crop_rows = {crop: i for i, crop in enumerate(built["crops"])}
+        columns = [built["keys"].index(k) for k in keys]
+        names = list(farm_crops)
+        distinct = {name: crop_rows.get(self.store.resolve(name) or "", -1) for name in set(names)}
+        rows = np.array([distinct[name] for name in names], dtype=np.intp)
+        exposed = np.zeros((len(rows), len(columns)), dtype=bool)
+        known = rows >= 0
+        exposed[known] = built["incidence"][np.ix_(rows[known], columns)]
+        return exposed
+
+
+pest_index = PestIndex()
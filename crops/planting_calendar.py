@@ -0,0 +1,121 @@
+# crops/planting_calendar.py
+"""Dated task schedules from a crop's growth stages and a planting date.
+
+Stage offsets (days from planting) are parsed once at build time and
+stored in the knowledge index (see ``crops/stages.py``).  Here they
+become small NumPy arrays per crop, so one farm's schedule is an array
+addition and ``bulk_schedule`` dates thousands of farms with one
+broadcast per crop rather than a Python loop per farm.
+"""
+import threading
+from datetime import date
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .knowledge_store import default_store
+
+HARVEST_STAGE = "Harvest"
+SCHEDULE_COLUMNS = ["farm", "crop", "stage_index", "stage", "task", "start", "end"]
+
+
+class CropCalendar:
+    """Ordered stages of one crop as parallel arrays, ending with the harvest window."""
+    __slots__ = ('crop', 'stages', 'tasks', 'start_days', 'end_days')
+
+    def __init__(self, crop, calendar):
+        rows = list(calendar["stages"] or [])
+        if calendar["harvest"] is not None:
+            rows.append([HARVEST_STAGE, *calendar["harvest"], "Harvest window"])
+        self.crop = crop
+        self.stages = np.array([r[0] for r in rows], dtype=object)
+        self.tasks = np.array([r[3] for r in rows], dtype=object)
+        self.start_days = np.array([r[1] for r in rows], dtype='timedelta64[D]')
+        self.end_days = np.array([r[2] for r in rows], dtype='timedelta64[D]')
+
+    def __len__(self):
+        return len(self.stages)
+
+
+def _empty_schedule():
+    ints = np.array([], dtype=np.intp)
+    days = np.array([], dtype='datetime64[D]')
+    return pd.DataFrame({"farm": ints, "crop": [], "stage_index": ints, "stage": [], "task": [], "start": days, "end": days})
+
+
+class PlantingCalendar:
+    def __init__(self, store=default_store):
+        self.store = store
+        self._calendars = None
+        self._lock = threading.Lock()
+
+    @property
+    def calendars(self) -> Dict[str, CropCalendar]:
+        if self._calendars is None:
+            with self._lock:
+                if self._calendars is None:
+                    self._calendars = {
+                        crop: CropCalendar(crop, calendar)
+                        for crop, calendar in self.store.index["calendars"].items()
+                    }
+        return self._calendars
+
+    def schedule(self, crop: str, planted: date) -> List[Dict[str, Any]]:
+        """Dated stages for one planting of ``crop`` (a knowledge base key)."""
+        calendar = self.calendars[crop]
+        day = np.datetime64(planted, 'D')
+        starts = (day + calendar.start_days).astype(str).tolist()
+        ends = (day + calendar.end_days).astype(str).tolist()
+        return [
+            {"stage": stage, "task": task, "start": start, "end": end}
+            for stage, task, start, end in zip(calendar.stages, calendar.tasks, starts, ends)
+        ]
+
+    def bulk_schedule(self, crops: Sequence[str], planted: Sequence[Any]):
+        """Schedules for many farms at once.
+
+        ``crops`` are crop names or aliases and ``planted`` ISO dates (or
+        anything ``pd.to_datetime`` reads), one pair per farm.  Returns
+        (schedule DataFrame with SCHEDULE_COLUMNS, one row per farm and
+        stage, ordered by farm; list of (farm index, error) for the rest).
+        """
+        names = np.asarray(crops, dtype=object)
+        days = pd.to_datetime(pd.Series(planted, dtype=object), errors='coerce', format='ISO8601')
+        days = days.to_numpy(dtype='datetime64[D]')
+
+        # Resolve each distinct name once, not once per farm
+        unique, inverse = np.unique(names.astype(str), return_inverse=True)
+        resolved = np.array([self.store.resolve(n) or "" for n in unique], dtype=object)[inverse]
+
+        errors = []
+        frames = []
+        for farm in np.flatnonzero(resolved == ""):
+            errors.append((int(farm), f"Crop '{names[farm]}' not found in knowledge base."))
+        bad_dates = np.isnat(days) & (resolved != "")
+        for farm in np.flatnonzero(bad_dates):
+            errors.append((int(farm), "Planting date must be an ISO date (YYYY-MM-DD)."))
+
+        for crop, calendar in self.calendars.items():
+            farms = np.flatnonzero((resolved == crop) & ~bad_dates)
+            if len(farms) == 0 or len(calendar) == 0:
+                continue
+            n = len(calendar)
+            planted_days = days[farms][:, None]
+            frames.append(pd.DataFrame({
+                "farm": np.repeat(farms, n),
+                "crop": crop,
+                "stage_index": np.tile(np.arange(n), len(farms)),
+                "stage": np.tile(calendar.stages, len(farms)),
+                "task": np.tile(calendar.tasks, len(farms)),
+                "start": (planted_days + calendar.start_days).ravel(),
+                "end": (planted_days + calendar.end_days).ravel(),
+            }))
+        if not frames:
+            frames.append(_empty_schedule())
+        schedule = pd.concat(frames, ignore_index=True)
+        schedule.sort_values(["farm", "stage_index"], kind='stable', inplace=True, ignore_index=True)
+        return schedule, sorted(errors)
+
+
+planting_calendar = PlantingCalendar()
@@ -0,0 +1,68 @@
+# crops/ranges.py
+"""Parse numeric requirement ranges out of crop records.
+
+Records state requirements as free text under differently named keys
+(``temperature`` / ``temperature_range`` / ``optimal_temperature_c``,
+``growth_duration`` / ``maturity_days`` ...) and units (``kg/ha`` or
+``tons/ha``, days or months).  ``RANGE_FIELDS`` lists, per field, the
+canonical section and the keys that hold it in order of preference;
+``crop_ranges`` turns a record into ``{field: [low, high]}`` in the
+field's unit.  The build step stores the result in the knowledge index.
+"""
+import re
+from typing import Any, Dict, List, Mapping, Optional
+
+from .sections import section_keys
+from .stages import DAYS_PER_UNIT
+
+# field -> (canonical section, record keys in order of preference, unit)
+RANGE_FIELDS = {
+    "temperature": ("climate_and_soil", ("temperature", "temperature_range", "optimal_temperature_c"), "°C"),
+    "rainfall": ("climate_and_soil", ("rainfall", "rainfall_needs", "rainfall_requirements", "rainfall_mm"), "mm"),
+    "ph": ("climate_and_soil", ("soil_pH",), "pH"),
+    "growth_duration": ("crop_profile", ("growth_duration", "maturity_days"), "days"),
+    "yield": ("crop_profile", ("yield_range", "average_yield", "yield_potential"), "t/ha"),
+}
+
+_NUMBER = r"\d[\d,]*(?:\.\d+)?"
+_RANGE = re.compile(
+    rf"(?P<low>{_NUMBER})\s*(?:°C)?\s*(?:–|-|to)\s*(?P<high>{_NUMBER})\+?\s*(?:°C)?\s*(?P<unit>[a-z]+)?",
+    re.IGNORECASE,
+)
+
+
+def _scale(field: str, unit: str) -> float:
+    """Factor from the unit written after a range to the field's unit."""
+    unit = unit.lower()
+    if field == "growth_duration":
+        # '90–150 (variety-dependent)' is in days
+        return next((days for name, days in DAYS_PER_UNIT.items() if unit.startswith(name)), 1)
+    if field == "yield" and unit.startswith("kg"):
+        return 0.001
+    return 1
+
+
+def parse_range(field: str, text: Any) -> Optional[List[float]]:
+    """First 'a–b' range in ``text`` as [low, high] in the field's unit ('1,000–2,500 kg/ha' -> [1.0, 2.5])."""
+    if not isinstance(text, str):
+        return None
+    match = _RANGE.search(text)
+    if match is None:
+        return None
+    scale = _scale(field, match["unit"] or "")
+    low, high = (float(match[g].replace(",", "")) * scale for g in ("low", "high"))
+    return [round(low, 3), round(high, 3)]
+
+
+def range_text(crop: Mapping[str, Any], field: str) -> Optional[str]:
+    """The record text a field's range is read from, or None if the record does not state it."""
+    section, names, _ = RANGE_FIELDS[field]
+    values = crop.get(section_keys(crop).get(section, ""))
+    if not isinstance(values, Mapping):
+        return None
+    return next((values[n] for n in names if isinstance(values.get(n), str)), None)
+
+
+def crop_ranges(crop: Mapping[str, Any]) -> Dict[str, Optional[List[float]]]:
+    """{field: [low, high] or None} for every field in ``RANGE_FIELDS``."""
+    return {field: parse_range(field, range_text(crop, field)) for field in RANGE_FIELDS}
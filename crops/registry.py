@@ -0,0 +1,186 @@
+# crops/registry.py
+"""Versioned crop model registry with in-process hot swap.
+
+Artifacts live next to a JSON manifest (``crops/model_registry.json``)
+that records, per version, the artifact file, its SHA-256, the feature
+order, the class list and training metadata, plus which version is
+active.  Requests send readings in ``FEATURES`` order; a model whose
+recorded feature order differs gets its columns reordered.
+``ModelRegistry.current()`` returns an immutable ``LoadedModel``
+snapshot; requests keep using the snapshot they started with, so when the
+manifest's active version changes the next caller swaps in the new model
+while in-flight requests finish on the old one.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from joblib import load
+
+from .forest import compile_model
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+
+
+class RegistryError(Exception):
+    pass
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ColumnOrder:
+    """Wraps a predictor trained on another column order; callers pass rows in ``FEATURES`` order."""
+
+    def __init__(self, predictor, features):
+        self.predictor = predictor
+        self.columns = [FEATURES.index(f) for f in features]
+        self.classes_ = predictor.classes_
+
+    def predict_proba(self, X):
+        return self.predictor.predict_proba(np.asarray(X)[..., self.columns])
+
+
+class LoadedModel:
+    """One loaded, verified model version. Never mutated after creation."""
+
+    def __init__(self, version, entry, model):
+        self.version = version
+        self.sha256 = entry['sha256']
+        self.features = list(entry.get('features', FEATURES))
+        if sorted(self.features) != sorted(FEATURES):
+            raise RegistryError(f"Model version '{version}' expects features {', '.join(self.features)}, "
+                                f"not {', '.join(FEATURES)}.")
+        self.metadata = entry
+        self.model = model
+        # Same predict_proba/classes_ interface, without sklearn's per-call overhead
+        self.predictor = compile_model(model)
+        if self.features != FEATURES:
+            self.predictor = ColumnOrder(self.predictor, self.features)
+        self.classes = self.predictor.classes_
+
+
+class ModelRegistry:
+    def __init__(self, manifest_path, check_interval=2.0):
+        self.manifest_path = str(manifest_path)
+        self.directory = os.path.dirname(self.manifest_path)
+        self.check_interval = check_interval
+        self._current = None
+        self._manifest_mtime = None
+        self._next_check = 0.0
+        self._swap_lock = threading.Lock()
+
+    # --- Manifest ---
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"active": None, "models": {}}
+
+    def write_manifest(self, manifest):
+        # Write-then-rename so watchers never observe a half-written manifest.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+            f.write('\n')
+        os.replace(tmp, self.manifest_path)
+
+    def artifact_path(self, entry):
+        return os.path.join(self.directory, entry['artifact'])
+
+    # --- Loading ---
+    def load_version(self, version, manifest=None):
+        manifest = manifest or self.read_manifest()
+        entry = manifest['models'].get(version)
+        if entry is None:
+            raise RegistryError(f"Unknown model version '{version}'.")
+        path = self.artifact_path(entry)
+        if file_sha256(path) != entry['sha256']:
+            raise RegistryError(f"Checksum mismatch for model version '{version}' ({path}).")
+        return LoadedModel(version, entry, load(path))
+
+    def current(self):
+        """Return the active model, swapping in a newly activated version if needed."""
+        now = time.monotonic()
+        if self._current is None or now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self._refresh()
+        return self._current
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.manifest_path)
+            # write_manifest replaces the file, so a new inode marks a change even within one mtime tick
+            mtime = (stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            mtime = None
+        if self._current is not None and mtime == self._manifest_mtime:
+            return
+        # Only one thread loads; the others keep serving the old snapshot meanwhile.
+        if not self._swap_lock.acquire(blocking=self._current is None):
+            return
+        try:
+            manifest = self.read_manifest()
+            active = manifest.get('active')
+            if self._current is not None and self._current.version == active:
+                self._manifest_mtime = mtime
+                return
+            try:
+                loaded = self.load_version(active, manifest)
+            except Exception:
+                if self._current is None:
+                    raise
+                logger.exception("Failed to load crop model '%s'; still serving '%s'", active, self._current.version)
+                self._manifest_mtime = mtime
+                return
+            previous = self._current
+            self._current = loaded
+            self._manifest_mtime = mtime
+            if previous is not None:
+                logger.info("Swapped crop model '%s' -> '%s'", previous.version, loaded.version)
+        finally:
+            self._swap_lock.release()
+
+    # --- Administration (used by the management commands) ---
+    def register(self, version, artifact, metadata=None, activate=False):
+        manifest = self.read_manifest()
+        if version in manifest['models']:
+            raise RegistryError(f"Model version '{version}' is already registered.")
+        path = os.path.join(self.directory, artifact)
+        model = load(path)
+        entry = {
+            "artifact": artifact,
+            "sha256": file_sha256(path),
+            "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "algorithm": type(model).__name__,
+            "features": [str(f) for f in getattr(model, 'feature_names_in_', FEATURES)],
+            "classes": [str(c) for c in model.classes_],
+            "metrics": {},
+        }
+        entry.update(metadata or {})
+        manifest['models'][version] = entry
+        if activate or not manifest.get('active'):
+            manifest['active'] = version
+        self.write_manifest(manifest)
+        return entry
+
+    def activate(self, version):
+        manifest = self.read_manifest()
+        # Refuse to point workers at an artifact that would fail to load.
+        self.load_version(version, manifest)
+        manifest['active'] = version
+        self.write_manifest(manifest)
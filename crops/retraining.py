@@ -0,0 +1,108 @@
+# crops/retraining.py
+"""Incremental retraining of the crop forest from farmer feedback.
+
+Farmers report what they planted under given readings and how the
+harvest went (``RecommendationFeedback``).  Good and fair harvests are
+training rows labelled with the planted crop.  Rather than refitting on
+the whole history, ``warm_start_forest`` copies the serving forest and
+adds a few trees fitted only on the feedback that arrived since that
+model was trained, plus a small stratified replay sample of the original
+data.  The replay keeps every class present, which warm-started forests
+require, and stops the new trees from forgetting the base distribution.
+So a retrain costs the same however much history has built up.
+
+``gate`` compares the candidate with the serving model on a holdout
+made of the original test split plus a fixed share of the new feedback
+(chosen by id, so a row is never trained on in one run and held out in
+the next); ``manage.py retrain_crop_model`` promotes the candidate
+through the registry only if it passes.
+"""
+import copy
+import re
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+
+from .registry import FEATURES
+
+# Outcomes whose planted crop is taken as the right answer for the readings
+TRAINING_OUTCOMES = ('good', 'fair')
+HOLDOUT_FRACTION = 0.2
+
+
+def label_key(name: str) -> str:
+    """Compare crop names the way the dataset spells them ('Kidney beans' -> 'kidneybeans')."""
+    return re.sub(r"[^a-z]", "", str(name).lower())
+
+
+def match_labels(names: Iterable[str], classes: Iterable[str]) -> np.ndarray:
+    """The model class for each reported crop name, or '' where the model has no such class."""
+    known = {label_key(c): str(c) for c in classes}
+    return np.array([known.get(label_key(n), "") for n in names], dtype=object)
+
+
+def holdout_mask(ids: np.ndarray, fraction: float = HOLDOUT_FRACTION) -> np.ndarray:
+    """Deterministic per-id holdout membership (a multiplicative hash of the id)."""
+    hashed = (np.asarray(ids, dtype=np.uint64) * np.uint64(2654435761)) % np.uint64(1 << 32)
+    return hashed < np.uint64(fraction * (1 << 32))
+
+
+def replay_sample(X: np.ndarray, y: np.ndarray, per_class: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Up to ``per_class`` random rows of every class."""
+    rng = np.random.default_rng(seed)
+    rows = np.concatenate([
+        rng.permutation(np.flatnonzero(y == label))[:per_class] for label in np.unique(y)
+    ])
+    return X[rows], y[rows]
+
+
+def warm_start_forest(model, X: np.ndarray, y: np.ndarray, n_trees: int, random_state=None):
+    """A copy of ``model`` with ``n_trees`` more trees fitted on (X, y); ``model`` is unchanged.
+
+    ``y`` must contain every class of ``model`` and no other, since new
+    trees vote over the same class list as the existing ones.
+    """
+    if not isinstance(model, RandomForestClassifier):
+        raise TypeError(f"Only random forests can be warm-started, not {type(model).__name__}.")
+    classes = set(map(str, model.classes_))
+    labels = set(map(str, y))
+    if labels != classes:
+        missing, extra = sorted(classes - labels), sorted(labels - classes)
+        raise ValueError("Warm-start labels must match the model's classes"
+                         + (f"; missing {', '.join(missing)}" if missing else "")
+                         + (f"; unknown {', '.join(extra)}" if extra else "") + ".")
+    candidate = copy.deepcopy(model)
+    candidate.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_trees)
+    if random_state is not None:
+        candidate.set_params(random_state=random_state)
+    candidate.fit(_frame(model, X), y)
+    candidate.set_params(warm_start=False)
+    return candidate
+
+
+def _frame(model, X):
+    # X is in FEATURES order; give a model fitted with feature names its own columns, by name
+    if hasattr(model, 'feature_names_in_'):
+        return pd.DataFrame(X, columns=FEATURES)[list(model.feature_names_in_)]
+    return X
+
+
+def gate(current, candidate, X: np.ndarray, y: np.ndarray, min_gain: float = 0.0) -> Dict[str, Any]:
+    """Macro F1 of both models on the holdout; promote if the candidate gains at least ``min_gain``."""
+    current_f1 = f1_score(y, current.predict(_frame(current, X)), average='macro', zero_division=0)
+    candidate_f1 = f1_score(y, candidate.predict(_frame(candidate, X)), average='macro', zero_division=0)
+    return {
+        "rows": int(len(y)),
+        "current_f1": round(float(current_f1), 6),
+        "candidate_f1": round(float(candidate_f1), 6),
+        "min_gain": min_gain,
+        "promote": bool(candidate_f1 - current_f1 >= min_gain),
+    }
+
+
+def feature_rows(records: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """Feedback rows (dicts with ``FEATURES`` keys) as a float64 matrix in feature order."""
+    return np.array([[r[f] for f in FEATURES] for r in records], dtype=np.float64).reshape(-1, len(FEATURES))
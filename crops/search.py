@@ -0,0 +1,221 @@
+# crops/search.py
+"""Ranked full-text search over the crop knowledge base.
+
+Every leaf string in every crop record is one searchable entry, located
+by crop, canonical section and path (``pest_and_disease_control.major_pests[0]``).
+Text is lower-cased, split on non-word characters, stripped of stop words
+and stemmed with a small suffix stemmer, then indexed as
+term -> [(entry, term frequency), ...].  Queries are scored with BM25 in
+NumPy; entries containing every query term rank first.
+
+``manage.py build_knowledge_base`` writes the index to
+``crops/knowledge/search_index.json`` next to the records it was built
+from; if that file is missing or stale, the index is rebuilt in memory.
+"""
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .knowledge_store import KNOWLEDGE_DIR, default_store
+from .sections import SECTION_ALIASES
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_FILE = 'search_index.json'
+SEARCH_FORMAT_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be before by can for from has have
+how if in into is it its may more most not of on or per such than that the their
+them then there these they this to up use used using was when which while will
+with within
+""".split())
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Checked in order; the first matching suffix is removed (or replaced).
+_SUFFIXES = (
+    ("sses", "ss"), ("ies", "y"), ("oes", "o"), ("ches", "ch"), ("shes", "sh"), ("xes", "x"),
+    ("ss", "ss"), ("us", "us"), ("is", "is"), ("s", ""),
+    ("ingly", ""), ("edly", ""), ("ing", ""), ("ed", ""),
+)
+
+
+def stem(word: str) -> str:
+    """Light suffix stemmer: 'diseases' / 'disease' and 'planting' / 'planted' / 'plants' meet."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    # Undo consonant doubling ('cutting' -> 'cutt' -> 'cut')
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouslz":
+        word = word[:-1]
+    return word[:-1] if len(word) > 3 and word.endswith("e") else word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(w) for w in _WORD.findall(text.lower()) if w not in STOP_WORDS]
+
+
+def leaves(value: Any, path: str = "") -> Iterator[Tuple[str, str]]:
+    """Yield (path, text) for every string in a nested record."""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, Mapping):
+        for key, child in value.items():
+            # Keys are part of the content too ('fall_armyworm': {...})
+            yield from leaves(child, f"{path}.{key}" if path else key)
+    elif isinstance(value, (list, tuple)):
+        for i, child in enumerate(value):
+            yield from leaves(child, f"{path}[{i}]")
+
+
+def _key_text(path: str) -> str:
+    """The last key of a path, as words ('major_pests[0]' -> 'major pests')."""
+    last = path.rsplit(".", 1)[-1].split("[", 1)[0]
+    return last.replace("_", " ")
+
+
+def build_search_index(crops: Mapping[str, Mapping[str, Any]], source_sha256: str) -> Dict[str, Any]:
+    """Index every leaf string of ``{crop name: record}``; returns the serializable index."""
+    entries = []
+    lengths = []
+    postings: Dict[str, List[int]] = {}
+    for crop, record in crops.items():
+        for path, text in leaves(record):
+            key = path.split(".", 1)[0].split("[", 1)[0]
+            tokens = tokenize(f"{_key_text(path)} {text}")
+            if not tokens:
+                continue
+            doc = len(entries)
+            entries.append([crop, SECTION_ALIASES.get(key, key), path, text])
+            lengths.append(len(tokens))
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).extend((doc, count))
+    return {
+        "format": SEARCH_FORMAT_VERSION,
+        "source_sha256": source_sha256,
+        "entries": entries,
+        "lengths": lengths,
+        "postings": postings,
+    }
+
+
+def write_search_index(index: Dict[str, Any], directory=KNOWLEDGE_DIR) -> Path:
+    path = Path(directory) / SEARCH_INDEX_FILE
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_text(json.dumps(index, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    tmp.replace(path)
+    return path
+
+
+def read_search_index(directory, source_sha256: str) -> Optional[Dict[str, Any]]:
+    """Return the persisted index if it was built from ``source_sha256``, else None."""
+    path = Path(directory) / SEARCH_INDEX_FILE
+    try:
+        raw = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if raw.get("format") != SEARCH_FORMAT_VERSION or raw.get("source_sha256") != source_sha256:
+        return None
+    return raw
+
+
+class SearchIndex:
+    """Loaded search index; build it with ``SearchIndex.for_store``."""
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.source_sha256 = raw["source_sha256"]
+        self.entries = raw["entries"]
+        self._crops = np.asarray([e[0] for e in self.entries])
+        self._sections = np.asarray([e[1] for e in self.entries])
+        lengths = np.asarray(raw["lengths"], dtype=np.float64)
+        self._length_norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+        n = len(self.entries)
+        self._postings = {}
+        for term, flat in raw["postings"].items():
+            pairs = np.asarray(flat, dtype=np.int32).reshape(-1, 2)
+            idf = np.log(1 + (n - len(pairs) + 0.5) / (len(pairs) + 0.5))
+            self._postings[term] = (pairs[:, 0], pairs[:, 1].astype(np.float64), idf)
+
+    @classmethod
+    def for_store(cls, store=default_store) -> 'SearchIndex':
+        """Load the persisted index for ``store``, rebuilding it in memory if it is missing or stale."""
+        raw = read_search_index(store.directory, store.index["sha256"])
+        if raw is None:
+            logger.warning("%s is missing or stale; rebuilding it in memory (run manage.py build_knowledge_base)",
+                           store.directory / SEARCH_INDEX_FILE)
+            raw = build_search_index(store, store.index["sha256"])
+        return cls(raw)
+
+    def search(self, query: str, crop: Optional[str] = None, section: Optional[str] = None,
+               limit: int = 20) -> Dict[str, Any]:
+        """BM25-ranked entries for ``query``, optionally limited to one crop and/or canonical section.
+
+        Entries that contain every query term outrank those that do not.
+        Also returns the matching crops ranked by their summed scores.
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        terms = [t for t in query_terms if t in self._postings]
+        if not terms:
+            return {"crops": [], "results": []}
+        scores = np.zeros(len(self.entries))
+        matched = np.zeros(len(self.entries), dtype=np.int32)
+        for term in terms:
+            docs, tf, idf = self._postings[term]
+            scores[docs] += idf * tf * (K1 + 1) / (tf + self._length_norm[docs])
+            matched[docs] += 1
+        hits = np.flatnonzero(matched)
+        if crop is not None:
+            hits = hits[self._crops[hits] == crop]
+        if section is not None:
+            hits = hits[self._sections[hits] == section]
+        complete = matched[hits] == len(query_terms)
+        if complete.any():
+            hits = hits[complete]
+        order = hits[np.argsort(-scores[hits], kind='stable')]
+
+        crop_scores: Dict[str, float] = {}
+        for d in order:
+            crop_scores[self.entries[d][0]] = crop_scores.get(self.entries[d][0], 0.0) + float(scores[d])
+        return {
+            "crops": [{"crop": c, "score": round(s, 4)}
+                      for c, s in sorted(crop_scores.items(), key=lambda item: -item[1])],
+            "results": [
+                {
+                    "crop": self.entries[d][0],
+                    "section": self.entries[d][1],
+                    "path": self.entries[d][2],
+                    "text": self.entries[d][3],
+                    "score": round(float(scores[d]), 4),
+                }
+                for d in order[:limit]
+            ],
+        }
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def default_search_index() -> SearchIndex:
+    global _default_index
+    if _default_index is None:
+        with _default_lock:
+            if _default_index is None:
+                _default_index = SearchIndex.for_store(default_store)
+    return _default_index
@@ -0,0 +1,65 @@
+# crops/sections.py
+"""Canonical section names for crop knowledge base records.
+
+Crop records were written by different people and name the same topic
+differently (``irrigation``, ``irrigation_management``,
+``water_management``, ``irrigation_and_water`` ...).  ``SECTIONS`` lists
+every canonical section with the record keys that mean it, in order of
+preference.  The build step stores each crop's canonical -> record key
+map in the index, so lookups never probe keys at request time.
+"""
+from typing import Any, Dict, Mapping, Optional
+
+SECTIONS = {
+    "crop_profile": ["crop_profile"],
+    "climate_and_soil": ["climate_and_soil_requirements", "climate_and_soil"],
+    "land_preparation": ["land_preparation"],
+    "variety_selection": ["variety_selection", "seed_management", "planting_material"],
+    "nursery": ["nursery_management", "seedling_nursery", "nursery_and_transplanting"],
+    "transplanting": ["transplanting", "field_transplanting"],
+    "planting": ["seed_and_planting", "planting_material_and_methods", "planting", "direct_seeding_option"],
+    "fertilizer_management": ["fertilizer_management", "fertilizer_and_soil_fertility", "fertilizer_and_soil_health"],
+    "water_management": ["irrigation_management", "irrigation", "water_management", "irrigation_and_water"],
+    "weed_management": ["weed_management", "weed_and_soil_management"],
+    "pest_and_disease_control": ["pest_and_disease_control", "pest_and_disease_management", "pest_and_disease"],
+    "growth_stages": ["growth_stages_and_management", "growth_stages", "growth_stages_and_care"],
+    "crop_management": ["crop_management"],
+    "pollination": ["pollination_management"],
+    "harvesting": ["harvesting"],
+    "post_harvest": [
+        "post_harvest_handling", "post_harvest_management", "post_harvest_processing",
+        "post_harvest_processing_and_marketing", "post_harvest_utilization",
+    ],
+    "marketing": ["marketing_and_economics", "marketing_and_value_addition", "value_addition_and_marketing", "marketing"],
+    "troubleshooting": ["common_problems_and_solutions", "troubleshooting_faq"],
+    "smart_farming": ["smart_farming_practices", "smart_farming_tips", "smart_tips"],
+}
+
+# Record key (or canonical name, or a spaced/dashed variant) -> canonical name
+SECTION_ALIASES = {
+    alias: canonical
+    for canonical, keys in SECTIONS.items()
+    for alias in [canonical, *keys]
+}
+
+
+def canonical_section(name: str) -> Optional[str]:
+    """Return the canonical name for a section key or alias, or None if unknown."""
+    key = "_".join(name.lower().replace("-", " ").split())
+    return SECTION_ALIASES.get(key)
+
+
+def section_keys(crop: Mapping[str, Any]) -> Dict[str, str]:
+    """Map each canonical section present in a crop record to the record key holding it."""
+    found = {}
+    for key in crop:
+        canonical = SECTION_ALIASES.get(key, key)
+        # Keys outside the taxonomy stay reachable under their own name
+        if canonical not in found or _rank(key) < _rank(found[canonical]):
+            found[canonical] = key
+    return found
+
+
+def _rank(key: str) -> int:
+    keys = SECTIONS.get(SECTION_ALIASES.get(key, ""), [])
+    return keys.index(key) if key in keys else len(keys)
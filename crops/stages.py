@@ -0,0 +1,82 @@
+# crops/stages.py
+"""Parse growth stage descriptions into day offsets from planting.
+
+Stage entries in the knowledge base read like
+``"Tuber bulking (60–90 days): Consistent moisture; watch for pests"`` or
+``"Vegetative growth (2–6 weeks post-transplant): Nitrogen boost"``.
+``stage_calendar`` turns a crop's ordered stages into
+``[name, start day, end day, task]`` rows; the build step stores the
+result in the knowledge index so nothing is parsed at request time.
+"""
+import re
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+DAYS_PER_UNIT = {"day": 1, "week": 7, "month": 30}
+
+_STAGE = re.compile(
+    r"^(?P<name>[^(]+?)\s*"
+    r"\((?P<start>\d+(?:\.\d+)?)\s*[–-]\s*(?P<end>\d+(?:\.\d+)?)\+?\s*"
+    r"(?P<unit>day|week|month)s?(?P<after>\s+(?:post|after)[ -]transplant(?:ing)?)?\)"
+    r"\s*(?::\s*(?P<task>.*))?$",
+    re.IGNORECASE,
+)
+_DURATION = re.compile(
+    r"(?P<start>\d+(?:\.\d+)?)\s*[–-]\s*(?P<end>\d+(?:\.\d+)?)\+?\s*(?P<unit>day|week|month)s?",
+    re.IGNORECASE,
+)
+
+
+def stage_sort_key(key: Any) -> Tuple[int, Any]:
+    """Order stage keys numerically when they are numbers ('2' before '10')."""
+    text = str(key)
+    return (0, int(text)) if text.isdigit() else (1, text)
+
+
+def parse_stage(text: str) -> Optional[Tuple[str, float, float, str, bool]]:
+    """Return (name, start, end, task, relative to transplanting) in days, or None."""
+    match = _STAGE.match(text.strip())
+    if match is None:
+        return None
+    days = DAYS_PER_UNIT[match["unit"].lower()]
+    return (match["name"], float(match["start"]) * days, float(match["end"]) * days,
+            (match["task"] or "").strip(), match["after"] is not None)
+
+
+def parse_duration(text: str) -> Optional[Tuple[float, float]]:
+    """First 'a–b unit' range in a free-text duration, in days ('90–150 days (...)' -> (90, 150))."""
+    match = _DURATION.search(text or "")
+    if match is None:
+        return None
+    days = DAYS_PER_UNIT[match["unit"].lower()]
+    return float(match["start"]) * days, float(match["end"]) * days
+
+
+def stage_calendar(stages: Optional[Sequence[str]]) -> Optional[List[List[Any]]]:
+    """[[name, start day, end day, task], ...] from ordered stage texts, or None if any stage is unparsable.
+
+    A stage marked 'post-transplant' counts from the start of the stage
+    before it (the transplanting stage), and so do the stages after it.
+    """
+    if not stages:
+        return None
+    rows = []
+    anchor = 0.0
+    for text in stages:
+        parsed = parse_stage(text) if isinstance(text, str) else None
+        if parsed is None:
+            return None
+        name, start, end, task, after_transplant = parsed
+        if after_transplant and rows:
+            anchor = rows[-1][1]
+        rows.append([name, round(anchor + start), round(anchor + end), task])
+    return rows
+
+
+def harvest_window(crop: Mapping[str, Any], calendar: Optional[List[List[Any]]]) -> Optional[List[int]]:
+    """Days from planting to the harvest window: the last stage, else the profile's growth duration."""
+    if calendar:
+        return [calendar[-1][1], calendar[-1][2]]
+    duration = parse_duration(crop.get("crop_profile", {}).get("growth_duration", ""))
+    if duration is not None:
+        return [round(duration[0]), round(duration[1])]
+    return None
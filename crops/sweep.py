@@ -0,0 +1,67 @@
+# crops/sweep.py
+"""What-if sweeps: vary one or two soil/climate inputs around a base sample.
+
+The whole grid is built as one feature matrix so it can be scored with a
+single ``predict_proba`` call.
+"""
+import numpy as np
+
+from .registry import FEATURES
+
+MAX_SWEEP_AXES = 2
+MAX_SWEEP_STEPS = 100
+MAX_SWEEP_CELLS = 10000
+
+
+def _base_vector(base):
+    if not isinstance(base, dict):
+        raise ValueError("'base' must be an object with the sample's features.")
+    missing = [f for f in FEATURES if f not in base]
+    if missing:
+        raise ValueError(f"'base' is missing {', '.join(missing)}.")
+    try:
+        vector = np.array([float(base[f]) for f in FEATURES])
+    except (TypeError, ValueError):
+        raise ValueError("Feature values must be numeric.")
+    if not np.isfinite(vector).all():
+        raise ValueError("Feature values must be finite numbers.")
+    return vector
+
+
+def _axis(spec):
+    if not isinstance(spec, dict) or spec.get('feature') not in FEATURES:
+        raise ValueError(f"Each entry in 'vary' needs a 'feature' from {', '.join(FEATURES)}.")
+    try:
+        start, stop = float(spec['start']), float(spec['stop'])
+        steps = int(spec.get('steps', 20))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"'{spec['feature']}' needs numeric 'start', 'stop' and 'steps'.")
+    if not 2 <= steps <= MAX_SWEEP_STEPS:
+        raise ValueError(f"'steps' must be between 2 and {MAX_SWEEP_STEPS}.")
+    if not (np.isfinite(start) and np.isfinite(stop)):
+        raise ValueError("'start' and 'stop' must be finite numbers.")
+    return spec['feature'], np.linspace(start, stop, steps)
+
+
+def build_sweep(base, vary):
+    """Return (axes, feature matrix) for a base sample and one or two varied features.
+
+    ``axes`` is a list of (feature, values); matrix rows enumerate the grid
+    in C order, so scores reshape to ``[len(values) for each axis]``.
+    """
+    if not isinstance(vary, list) or not 1 <= len(vary) <= MAX_SWEEP_AXES:
+        raise ValueError(f"'vary' must list 1 to {MAX_SWEEP_AXES} features.")
+    vector = _base_vector(base)
+    axes = [_axis(spec) for spec in vary]
+    features = [feature for feature, _ in axes]
+    if len(set(features)) != len(features):
+        raise ValueError("Each feature can only be varied once.")
+    shape = [len(values) for _, values in axes]
+    if int(np.prod(shape)) > MAX_SWEEP_CELLS:
+        raise ValueError(f"A sweep can score at most {MAX_SWEEP_CELLS} combinations.")
+
+    grids = np.meshgrid(*[values for _, values in axes], indexing='ij')
+    matrix = np.repeat(vector[None, :], grids[0].size, axis=0)
+    for feature, grid in zip(features, grids):
+        matrix[:, FEATURES.index(feature)] = grid.ravel()
+    return axes, matrix
@@ -1,3 +1,984 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import pickle
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from joblib import dump, load
+from prometheus_client.parser import text_string_to_metric_families
+from rest_framework.test import APIClient
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from .advice import advice_engine
+from .batching import MicroBatcher
+from .bulk import score_rows
+from .cache import RecommendationCache
+from .compare import comparison_matrix
+from .dataset import DatasetCache, share, unshare
+from .expert_logic import get_crop_section, get_crop_stages
+from .forest import CompiledForest, compile_model
+from .knowledge_store import KnowledgeStore, default_store, read_records, validate_knowledge_base, write_knowledge_base
+from .metrics import RECOMMENDATION_STAGES
+from .models import RecommendationFeedback
+from .pests import pest_index
+from .planting_calendar import planting_calendar
+from .ranges import parse_range
+from .registry import FEATURES, ModelRegistry, RegistryError
+from .retraining import gate, holdout_mask, match_labels, replay_sample, warm_start_forest
+from .search import SearchIndex, build_search_index, read_search_index, stem, tokenize, write_search_index
+from .stages import parse_stage, stage_calendar
+from .sweep import MAX_SWEEP_STEPS, build_sweep
+from .training import compare_models, pareto_front, select, split, write_report
+from .tuning import SuccessiveHalvingSearch, cached_folds, resource_schedule
+from . import views
+
+
+def _dataset():
+    df = pd.read_csv(settings.BASE_DIR / 'Crop_recommendation.csv')
+    return df.drop('label', axis=1).to_numpy(dtype=np.float64), df['label'].to_numpy()
+
+
+SAMPLE = {"N": 90, "P": 42, "K": 43, "temperature": 20.88, "humidity": 82.0, "ph": 6.5, "rainfall": 202.9}
+
+
+class BatchRecommendationTests(SimpleTestCase):
+    def post(self, samples):
+        return self.client.post(reverse('batch_crop_recommendation'), json.dumps({"samples": samples}),
+                                content_type='application/json')
+
+    def test_batch_matches_single_requests(self):
+        X, _ = _dataset()
+        samples = [dict(zip(FEATURES, row)) for row in X[::300].tolist()]
+        samples[1] = list(samples[1].values())
+        response = self.post(samples)
+        self.assertEqual(response.status_code, 200)
+        batch = response.json()["recommendations"]
+        self.assertEqual([r["index"] for r in batch], list(range(len(samples))))
+        views.recommendation_cache.clear()
+        for row, entry in zip(X[::300].tolist(), batch):
+            single = self.client.post(reverse('crop_recommendation'), json.dumps(dict(zip(FEATURES, row))),
+                                      content_type='application/json')
+            self.assertEqual(single.json()["recommendations"], entry["recommendations"])
+
+    def test_errors_name_the_row(self):
+        response = self.post([SAMPLE, {k: v for k, v in SAMPLE.items() if k != "ph"}])
+        self.assertEqual((response.status_code, response.json()), (400, {"error": "Sample 1 is missing ph."}))
+        self.assertEqual(self.post([SAMPLE, [1, 2, 3]]).json(),
+                         {"error": f"Sample 1 must be an object or a list of {len(FEATURES)} values."})
+        self.assertEqual(self.post([SAMPLE, {**SAMPLE, "K": "high"}]).status_code, 400)
+        self.assertEqual(self.post([SAMPLE, {**SAMPLE, "K": 1e999}]).json(),
+                         {"error": "Feature values must be finite numbers."})
+
+    def test_row_limits(self):
+        self.assertEqual(self.post([]).status_code, 400)
+        response = self.post([SAMPLE] * (views.MAX_BATCH_ROWS + 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(views.MAX_BATCH_ROWS), response.json()["error"])
+        self.assertEqual(self.post([SAMPLE] * views.MAX_BATCH_ROWS).json()["count"], views.MAX_BATCH_ROWS)
+
+
+class CompiledForestTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.X, cls.y = _dataset()
+
+    def assert_parity(self, model):
+        compiled = CompiledForest.from_estimator(model)
+        np.testing.assert_array_equal(compiled.classes_, model.classes_)
+        np.testing.assert_allclose(compiled.predict_proba(self.X), model.predict_proba(self.X), atol=1e-9)
+        np.testing.assert_array_equal(compiled.predict(self.X), model.predict(self.X))
+
+    def test_matches_shipped_model(self):
+        self.assert_parity(load(settings.BASE_DIR / 'crops' / 'crop_model_v1.pkl'))
+
+    def test_matches_freshly_fitted_forest(self):
+        self.assert_parity(RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, self.y))
+
+    def test_matches_single_tree(self):
+        self.assert_parity(DecisionTreeClassifier(max_depth=5, random_state=0).fit(self.X, self.y))
+
+    def test_single_row(self):
+        model = load(settings.BASE_DIR / 'crops' / 'crop_model_v1.pkl')
+        compiled = CompiledForest.from_estimator(model)
+        np.testing.assert_allclose(compiled.predict_proba(self.X[0]), model.predict_proba(self.X[:1]), atol=1e-9)
+
+    def test_non_tree_model_is_left_alone(self):
+        model = object()
+        self.assertIs(compile_model(model), model)
+
+    def test_bench_reports_tree_budgets(self):
+        out = io.StringIO()
+        call_command('bench_crop_model', rows=3, repeat=1, tree_budgets=[10, 500], stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn("Probabilities match on 2200 rows: True", lines)
+        budgets = [line for line in lines if " trees: " in line]
+        self.assertEqual([line.split()[0] for line in budgets], ["10", "100"])
+        self.assertIn("top-1 agreement 100.00%  top-3 order agreement 100.00%", budgets[-1])
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def scorer(self):
+        calls = []
+
+        def score(rows):
+            calls.append(len(rows))
+            if (rows < 0).any():
+                raise ValueError("negative reading")
+            return rows * 2
+        return score, calls
+
+    def test_concurrent_rows_share_one_call(self):
+        score, calls = self.scorer()
+        batcher = MicroBatcher(max_batch_size=8, max_wait=1.0)
+        futures = [batcher.submit_future(score, [i, i]) for i in range(8)]
+        self.assertEqual([f.result(5).tolist() for f in futures], [[2 * i, 2 * i] for i in range(8)])
+        self.assertEqual(calls, [8])
+
+    def test_partial_batch_is_flushed_after_max_wait(self):
+        score, calls = self.scorer()
+        batcher = MicroBatcher(max_batch_size=64, max_wait=0.05)
+        start = time.perf_counter()
+        self.assertEqual(batcher.submit(score, [1, 2], timeout=5).tolist(), [2, 4])
+        self.assertGreaterEqual(time.perf_counter() - start, 0.04)
+        self.assertEqual(calls, [1])
+
+    def test_a_failing_row_does_not_fail_its_batch(self):
+        score, calls = self.scorer()
+        batcher = MicroBatcher(max_batch_size=3, max_wait=1.0)
+        futures = [batcher.submit_future(score, row) for row in ([1, 1], [-1, 1], [3, 3])]
+        self.assertEqual(futures[0].result(5).tolist(), [2, 2])
+        with self.assertRaisesRegex(ValueError, "negative"):
+            futures[1].result(5)
+        self.assertEqual(futures[2].result(5).tolist(), [6, 6])
+        self.assertEqual(calls, [3, 1, 1, 1])
+
+    def test_non_finite_readings_are_rejected_before_scoring(self):
+        sample = {"N": 90, "P": 42, "K": 43, "temperature": 20.9, "humidity": 82.0, "ph": 6.5, "rainfall": 1e999}
+        response = self.client.post(reverse('crop_recommendation'), json.dumps(sample),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Feature values must be finite numbers."})
+
+
+class RecommendationCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.version = "a"
+        self.cache = RecommendationCache(lambda: self.version, max_entries=2, ttl=60, check_interval=0)
+
+    def test_near_identical_readings_share_an_entry(self):
+        key = self.cache.quantize([90, 42, 43, 20.9, 82.0, 6.52, 202.9])
+        self.assertEqual(self.cache.quantize([90.2, 42, 43, 21.1, 81.8, 6.48, 203.1]), key)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, "rice")
+        self.assertEqual(self.cache.get(key), "rice")
+
+    def test_entries_expire(self):
+        self.cache.ttl = 0.01
+        self.cache.set("k", "rice")
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_model_change_clears_the_cache(self):
+        self.cache.set("k", "rice")
+        self.version = "b"
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertEqual([self.cache.get(k) for k in "abc"], [1, None, 3])
+
+    def test_a_miss_scores_the_raw_readings(self):
+        sample = {"N": 71.3, "P": 54.6, "K": 16.4, "temperature": 22.61, "humidity": 63.69, "ph": 5.749,
+                  "rainfall": 87.76}
+        views.recommendation_cache.clear()
+        response = self.client.post(reverse('crop_recommendation'), json.dumps(sample),
+                                    content_type='application/json')
+        snapshot = views.registry.current()
+        probabilities = snapshot.predictor.predict_proba(views._sample_features(sample))[0]
+        expected = [[snapshot.classes[i], round(float(probabilities[i]), 2)] for i in np.argsort(probabilities)[::-1][:3]]
+        top = [[r["crop"], r["probability"]] for r in response.json()["recommendations"]]
+        self.assertEqual(top, expected)
+        again = self.client.post(reverse('crop_recommendation'), json.dumps({**sample, "ph": 5.751}),
+                                 content_type='application/json')
+        self.assertEqual([[r["crop"], r["probability"]] for r in again.json()["recommendations"]], expected)
+
+
+class ModelRegistryTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.X, cls.y = _dataset()
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.registry = ModelRegistry(os.path.join(self.directory, 'model_registry.json'), check_interval=0)
+
+    def add(self, version, model, activate=False):
+        dump(model, os.path.join(self.directory, f'{version}.pkl'))
+        self.registry.register(version, f'{version}.pkl', activate=activate)
+
+    def test_hot_swap_and_rollback(self):
+        self.add('v1', RandomForestClassifier(n_estimators=5, random_state=0).fit(self.X, self.y))
+        self.add('v2', DecisionTreeClassifier(max_depth=3, random_state=0).fit(self.X, self.y))
+        in_flight = self.registry.current()
+        self.assertEqual(in_flight.version, 'v1')
+        self.registry.activate('v2')
+        self.assertEqual(self.registry.current().version, 'v2')
+        self.assertEqual(in_flight.predictor.n_trees, 5)
+        self.registry.activate('v1')
+        self.assertEqual(self.registry.current().version, 'v1')
+
+    def test_broken_version_is_not_swapped_in(self):
+        self.add('v1', DecisionTreeClassifier(max_depth=3, random_state=0).fit(self.X, self.y))
+        self.add('v2', DecisionTreeClassifier(max_depth=4, random_state=0).fit(self.X, self.y))
+        self.assertEqual(self.registry.current().version, 'v1')
+        with open(os.path.join(self.directory, 'v2.pkl'), 'ab') as f:
+            f.write(b'corrupt')
+        with self.assertRaisesRegex(RegistryError, "Checksum mismatch"):
+            self.registry.activate('v2')
+        manifest = self.registry.read_manifest()
+        self.registry.write_manifest({**manifest, "active": "v2"})
+        with self.assertLogs('crops.registry', 'ERROR'):
+            self.assertEqual(self.registry.current().version, 'v1')
+
+    def test_columns_are_fed_in_the_models_order(self):
+        columns = FEATURES[::-1]
+        frame = pd.DataFrame(self.X, columns=FEATURES)[columns]
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(frame, self.y)
+        self.add('v1', model)
+        loaded = self.registry.current()
+        self.assertEqual(loaded.features, columns)
+        np.testing.assert_allclose(loaded.predictor.predict_proba(self.X[:50]), model.predict_proba(frame[:50]))
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def load_config(self, preload='1', multiproc_dir=None):
+        env = {'GUNICORN_PRELOAD': preload, 'PROMETHEUS_MULTIPROC_DIR': multiproc_dir or tempfile.gettempdir()}
+        with mock.patch.dict(os.environ, env):
+            return runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+
+    def test_when_ready_imports_views_before_freezing(self):
+        config = self.load_config()
+        self.assertTrue(config['preload_app'])
+        log = []
+        server = SimpleNamespace(log=SimpleNamespace(info=log.append))
+        with mock.patch('gc.freeze', side_effect=lambda: self.assertTrue(
+                {'crops.views', 'mbewubot.views'} <= set(sys.modules))) as freeze:
+            config['when_ready'](server)
+        freeze.assert_called_once_with()
+        self.assertEqual(len(log), 2)
+        self.assertIn("master after model preload", log[1])
+        config['post_worker_init'](server)
+        self.assertIn("worker ready", log[2])
+
+    def test_preload_can_be_turned_off(self):
+        config = self.load_config(preload='0')
+        self.assertFalse(config['preload_app'])
+        with mock.patch('gc.freeze') as freeze:
+            config['when_ready'](SimpleNamespace(log=SimpleNamespace(info=self.fail)))
+        freeze.assert_not_called()
+
+    def test_prometheus_multiprocess_hooks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = self.load_config(multiproc_dir=directory)
+            stale = os.path.join(directory, 'counter_123.db')
+            open(stale, 'wb').close()
+            with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                config['on_starting'](None)
+                self.assertFalse(os.path.exists(stale))
+                with mock.patch('prometheus_client.multiprocess.mark_process_dead') as mark_dead:
+                    config['child_exit'](None, SimpleNamespace(pid=4321))
+            mark_dead.assert_called_once_with(4321)
+
+
+class BulkRecommendationTests(SimpleTestCase):
+    def post(self, body, content_type, output_format='ndjson'):
+        response = self.client.post(f"{reverse('bulk_crop_recommendation')}?format={output_format}", body,
+                                    content_type=content_type)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def batch_top_crops(self, samples):
+        response = self.client.post(reverse('batch_crop_recommendation'), json.dumps({"samples": samples}),
+                                    content_type='application/json')
+        return [r["recommendations"][0]["crop"] for r in response.json()["recommendations"]]
+
+    def test_csv_in_and_out(self):
+        df = pd.read_csv(settings.BASE_DIR / 'Crop_recommendation.csv').iloc[::400]
+        upload = df.drop(columns='label').assign(id=[f"plot-{i}" for i in range(len(df))]).to_csv(index=False)
+        rows = list(csv.DictReader(io.StringIO(self.post(upload, 'text/csv', 'csv'))))
+        self.assertEqual([r["id"] for r in rows], [f"plot-{i}" for i in range(len(df))])
+        self.assertEqual([r["row"] for r in rows], [str(i) for i in range(1, len(df) + 1)])
+        self.assertEqual([r["crop_1"] for r in rows], self.batch_top_crops(df[FEATURES].to_numpy().tolist()))
+        self.assertEqual({r["error"] for r in rows}, {""})
+
+    def test_ndjson_in(self):
+        samples = [SAMPLE, {**SAMPLE, "rainfall": 60.0}]
+        body = "\n".join(json.dumps({**sample, "id": i}) for i, sample in enumerate(samples))
+        results = [json.loads(line) for line in self.post(body, 'application/x-ndjson').splitlines()]
+        self.assertEqual([(r["row"], r["id"], len(r["recommendations"])) for r in results], [(1, 0, 3), (2, 1, 3)])
+        self.assertEqual([r["recommendations"][0]["crop"] for r in results], self.batch_top_crops(samples))
+
+        upload = io.BytesIO(body.encode('utf-8'))
+        upload.name = 'survey.ndjson'
+        response = self.client.post(reverse('bulk_crop_recommendation'), {"file": upload})
+        self.assertEqual(b''.join(response.streaming_content).decode('utf-8').splitlines(),
+                         [json.dumps(r) for r in results])
+
+    def test_bad_rows_do_not_abort_the_stream(self):
+        lines = [json.dumps(SAMPLE), "{not json", json.dumps([1, 2]), json.dumps({**SAMPLE, "K": "high"}),
+                 json.dumps({"N": 1, "id": "x"}), json.dumps({**SAMPLE, "ph": 1e999}), json.dumps(SAMPLE)]
+        results = [json.loads(line) for line in self.post("\n".join(lines), 'application/x-ndjson').splitlines()]
+        self.assertEqual([r["row"] for r in results], list(range(1, 8)))
+        self.assertEqual([r.get("error") for r in results], [
+            None, "Invalid JSON.", "Each line must be a JSON object.", "Feature values must be numeric.",
+            f"Missing {', '.join(FEATURES[1:])}.", "Feature values must be finite numbers.", None,
+        ])
+        self.assertEqual(results[4]["id"], "x")
+        self.assertEqual(results[0]["recommendations"], results[6]["recommendations"])
+
+        rows = list(csv.reader(io.StringIO(self.post(f"{','.join(FEATURES)}\n1,2,3\n", 'text/csv', 'csv'))))
+        self.assertEqual(rows[1][-1], f"Expected {len(FEATURES)} fields, got 3.")
+        missing = self.post("N,P\n1,2\n", 'text/csv')
+        self.assertIn("Header is missing column(s): K", missing)
+
+    def test_chunk_boundaries(self):
+        calls = []
+        snapshot = views.registry.current()
+        predictor = SimpleNamespace(predict_proba=lambda X: calls.append(len(X)) or snapshot.predictor.predict_proba(X))
+        counting = SimpleNamespace(predictor=predictor, classes=snapshot.classes)
+        values = [SAMPLE[f] for f in FEATURES]
+        rows = [(1, values, None, None), (2, None, None, "bad"), (3, values, "c", None),
+                (4, [np.inf] * len(FEATURES), None, None), (5, values, None, None)]
+        chunked = list(score_rows(rows, counting, chunk_size=2))
+        self.assertEqual(calls, [1, 1, 1])
+        self.assertEqual(chunked, list(score_rows(rows, snapshot)))
+        self.assertEqual([r["row"] for r in chunked], [1, 2, 3, 4, 5])
+        self.assertEqual([r.get("error") for r in chunked], [None, "bad", None, "Feature values must be finite numbers.",
+                                                              None])
+
+    def test_request_errors(self):
+        url = reverse('bulk_crop_recommendation')
+        self.assertEqual(self.client.post(url, b'', content_type='text/csv').json(), {"error": "The survey is empty."})
+        response = self.client.post(url, json.dumps([SAMPLE]), content_type='application/json')
+        self.assertEqual(response.status_code, 415)
+        self.assertEqual(self.client.post(url, {}).status_code, 400)
+        self.assertEqual(self.client.post(url + '?format=xml', 'N\n1\n', content_type='text/csv').status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    def stage_counts(self, text):
+        return {sample.labels['stage']: sample.value for family in text_string_to_metric_families(text)
+                if family.name == 'crops_recommendation_stage_seconds'
+                for sample in family.samples if sample.name.endswith('_count')}
+
+    def test_a_request_is_observed_in_every_stage(self):
+        before = self.stage_counts(self.client.get(reverse('crop_metrics')).content.decode('utf-8'))
+        views.recommendation_cache.clear()
+        self.client.post(reverse('crop_recommendation'), json.dumps(SAMPLE), content_type='application/json')
+        after = self.stage_counts(self.client.get(reverse('crop_metrics')).content.decode('utf-8'))
+        self.assertEqual(sorted(after), sorted(RECOMMENDATION_STAGES))
+        self.assertEqual({name: after[name] - before[name] for name in after}, dict.fromkeys(RECOMMENDATION_STAGES, 1))
+
+    def test_multiprocess_mode_merges_workers(self):
+        script = (
+            "import multiprocessing\n"
+            "from crops.metrics import exposition, stage\n"
+            "def observe():\n"
+            "    with stage('predict'):\n"
+            "        pass\n"
+            "workers = [multiprocessing.get_context('fork').Process(target=observe) for _ in range(2)]\n"
+            "for w in workers: w.start()\n"
+            "for w in workers: w.join()\n"
+            "print(exposition().decode())\n"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory}
+            text = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env, check=True,
+                                  capture_output=True, text=True).stdout
+        self.assertEqual(self.stage_counts(text)['predict'], 2)
+
+    def test_local_callers_only_without_a_token(self):
+        self.client.post(reverse('crop_recommendation'), json.dumps(SAMPLE), content_type='application/json')
+        response = self.client.get(reverse('crop_metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'crops_recommendation_stage_seconds_count{stage="predict"}', response.content)
+        self.assertEqual(self.client.get(reverse('crop_metrics'), REMOTE_ADDR='203.0.113.5').status_code, 403)
+
+    @override_settings(CROPS_METRICS_TOKEN='s3cret')
+    def test_token(self):
+        url = reverse('crop_metrics')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer s3cret', REMOTE_ADDR='203.0.113.5').status_code,
+                         200)
+
+
+class SweepTests(SimpleTestCase):
+    VARY = [{"feature": "N", "start": 0, "stop": 100, "steps": 3}, {"feature": "rainfall", "start": 50, "stop": 250,
+                                                                     "steps": 2}]
+
+    def post(self, body):
+        return self.client.post(reverse('sweep_crop_recommendation'), json.dumps(body), content_type='application/json')
+
+    def test_grid_is_in_c_order(self):
+        axes, matrix = build_sweep(SAMPLE, self.VARY)
+        self.assertEqual([(feature, values.tolist()) for feature, values in axes],
+                         [("N", [0.0, 50.0, 100.0]), ("rainfall", [50.0, 250.0])])
+        self.assertEqual(matrix.shape, (6, len(FEATURES)))
+        n, rainfall = FEATURES.index("N"), FEATURES.index("rainfall")
+        self.assertEqual(matrix[:, [n, rainfall]].tolist(),
+                         [[0, 50], [0, 250], [50, 50], [50, 250], [100, 50], [100, 250]])
+        others = [i for i in range(len(FEATURES)) if i not in (n, rainfall)]
+        self.assertTrue((matrix[:, others] == [SAMPLE[FEATURES[i]] for i in others]).all())
+
+    def test_limits(self):
+        too_many_steps = [{"feature": "N", "start": 0, "stop": 100, "steps": MAX_SWEEP_STEPS + 1}]
+        self.assertEqual(self.post({"base": SAMPLE, "vary": too_many_steps}).status_code, 400)
+        with mock.patch('crops.sweep.MAX_SWEEP_CELLS', 5):
+            response = self.post({"base": SAMPLE, "vary": self.VARY})
+        self.assertEqual((response.status_code, response.json()),
+                         (400, {"error": "A sweep can score at most 5 combinations."}))
+        self.assertEqual(self.post({"base": SAMPLE, "vary": self.VARY * 2}).status_code, 400)
+        self.assertEqual(self.post({"base": SAMPLE, "vary": [{**self.VARY[0], "stop": "inf"}]}).status_code, 400)
+
+    def test_crops_subset(self):
+        body = self.post({"base": SAMPLE, "vary": self.VARY, "crops": ["rice", "maize"]}).json()
+        self.assertEqual(list(body["curves"]), ["rice", "maize"])
+        self.assertEqual(np.array(body["curves"]["rice"]).shape, (3, 2))
+        self.assertEqual(np.array(body["best"]).shape, (3, 2))
+        response = self.post({"base": SAMPLE, "vary": self.VARY, "crops": ["rice", "quinoa"]})
+        self.assertEqual((response.status_code, response.json()), (400, {"error": "Unknown crop(s): quinoa."}))
+
+    def test_sweep_point_matches_a_single_recommendation(self):
+        body = self.post({"base": SAMPLE, "vary": self.VARY}).json()
+        views.recommendation_cache.clear()
+        single = self.client.post(reverse('crop_recommendation'), json.dumps({**SAMPLE, "N": 50.0, "rainfall": 250.0}),
+                                  content_type='application/json').json()["recommendations"]
+        self.assertEqual(single[0]["crop"], body["best"][1][1])
+        for entry in single:
+            self.assertAlmostEqual(entry["probability"], body["curves"][entry["crop"]][1][1], delta=0.0051)
+
+
+class KnowledgeStoreTests(SimpleTestCase):
+    def test_store_round_trip(self):
+        records = read_records()
+        with tempfile.TemporaryDirectory() as tmp:
+            index = write_knowledge_base(records, tmp)
+            self.assertEqual(index["sha256"], default_store.index["sha256"])
+            self.assertEqual(validate_knowledge_base(tmp), [])
+            store = KnowledgeStore(tmp)
+            self.assertEqual(sorted(store), sorted(records))
+            for name, record in records.items():
+                self.assertEqual(json.loads(store.raw(name)), record)
+                self.assertEqual(json.loads(json.dumps(store[name])), record)
+            self.assertEqual(store.resolve("Corn"), "maize")
+            self.assertIsNone(store.resolve("banana"))
+
+    def test_stages_match_the_original_lookup(self):
+        def original(crop):
+            for key in ["growth_stages_and_management", "growth_stages", "growth_stages_and_care"]:
+                if key in crop:
+                    stages = crop[key]
+                    if isinstance(stages, dict):
+                        return [v for k, v in sorted(stages.items(), key=lambda x: str(x[0]))]
+                    elif isinstance(stages, list):
+                        return stages
+            return None
+
+        for name, record in read_records().items():
+            stages = get_crop_stages(name)
+            self.assertEqual(None if stages is None else list(stages), original(record), name)
+        self.assertEqual(get_crop_stages("corn"), get_crop_stages("maize"))
+        self.assertIsNone(get_crop_stages("banana"))
+
+    def test_section_aliases(self):
+        onion = read_records()["onion"]
+        self.assertEqual(json.loads(json.dumps(get_crop_section("onion", "growth_stages"))),
+                         onion["growth_stages_and_care"])
+        self.assertEqual(get_crop_section("onion", "growth_stages_and_care"), get_crop_section("onion", "growth_stages"))
+        self.assertIsNone(get_crop_section("banana", "growth_stages"))
+
+    def test_build_command(self):
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesMessage(CommandError, "pass --from-module or --from-dir"):
+                call_command('build_knowledge_base', output=tmp, stdout=out)
+            with self.assertRaises(CommandError):
+                call_command('build_knowledge_base', output=tmp, coverage=True, stdout=out)
+            call_command('build_knowledge_base', export_dir=os.path.join(tmp, 'export'), stdout=out)
+            call_command('build_knowledge_base', from_dir=os.path.join(tmp, 'export'),
+                         output=os.path.join(tmp, 'kb'), stdout=out)
+            self.assertEqual(read_records(os.path.join(tmp, 'kb')), read_records())
+
+
+class GuidanceBlobTests(SimpleTestCase):
+    def test_etag_revalidation(self):
+        url = reverse('crop_guidance', args=['maize'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url)['ETag'], etag)
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((revalidated.status_code, revalidated.content, revalidated['ETag']), (304, b'', etag))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'"stale", W/{etag}').status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_gzip_variant_has_its_own_etag(self):
+        url = reverse('crop_guidance', args=['maize'])
+        plain = self.client.get(url)
+        gzipped = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertNotEqual(gzipped['ETag'], plain['ETag'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=plain['ETag'],
+                                         HTTP_ACCEPT_ENCODING='gzip').status_code, 304)
+
+    def test_sections(self):
+        response = self.client.get(reverse('crop_guidance_section', args=['maize', 'pest_and_disease_control']))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(response.wsgi_request.path, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                         304)
+        self.assertEqual(self.client.get(reverse('crop_guidance_section', args=['maize', 'nonsense'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('crop_guidance', args=['not-a-crop'])).status_code, 404)
+
+
+class GuidanceSearchTests(SimpleTestCase):
+    CROPS = {
+        "maize": {"pests": {"fall_armyworm": "Spray early in the season"}, "climate": "Warm and wet"},
+        "beans": {"pests": ["Aphids damage leaves"], "notes": "Armyworm is rarely a problem"},
+    }
+
+    def test_stemming(self):
+        self.assertEqual(stem("diseases"), stem("disease"))
+        self.assertEqual({stem(w) for w in ("planting", "planted", "plants")}, {stem("plant")})
+        self.assertEqual(tokenize("The aphids and the armyworms"), ["aphid", "armyworm"])
+
+    def test_entries_with_every_term_rank_first(self):
+        index = SearchIndex(build_search_index(self.CROPS, "sha"))
+        found = index.search("fall armyworm")
+        self.assertEqual([(r["crop"], r["path"]) for r in found["results"]], [("maize", "pests.fall_armyworm")])
+        self.assertEqual({r["crop"] for r in index.search("armyworm")["results"]}, {"maize", "beans"})
+        self.assertEqual([r["crop"] for r in index.search("armyworm", crop="beans")["results"]], ["beans"])
+        self.assertEqual(index.search("the"), {"crops": [], "results": []})
+
+    def test_persisted_index_is_tied_to_its_source(self):
+        raw = build_search_index(self.CROPS, "sha")
+        with tempfile.TemporaryDirectory() as tmp:
+            write_search_index(raw, tmp)
+            self.assertEqual(read_search_index(tmp, "sha"), raw)
+            self.assertIsNone(read_search_index(tmp, "other"))
+
+    def test_endpoint(self):
+        url = reverse('search_guidance')
+        response = self.client.get(url, {"q": "fall armyworm", "crop": "maize", "limit": 2})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertTrue(results)
+        self.assertLessEqual(len(results), 2)
+        self.assertEqual({r["crop"] for r in results}, {"maize"})
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "maize", "limit": "ten"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "maize", "crop": "not-a-crop"}).status_code, 404)
+
+
+class PlantingCalendarTests(SimpleTestCase):
+    def test_parses_units_and_transplant_offsets(self):
+        self.assertEqual(parse_stage("Tuber bulking (7–12 months): starch"), ("Tuber bulking", 210, 360, "starch", False))
+        calendar = stage_calendar([
+            "Transplanting (45–60 days)",
+            "Vegetative growth (2–6 weeks post-transplant): Nitrogen boost",
+            "Bulb maturation (12–16 weeks)",
+        ])
+        self.assertEqual([row[1:3] for row in calendar], [[45, 60], [59, 87], [129, 157]])
+        self.assertIsNone(stage_calendar(["Flowering: no dates"]))
+
+    def test_bulk_matches_single_schedules(self):
+        crops = ["maize", "corn", "tomato", "onion", "banana", "rice"]
+        planted = ["2025-11-15", "2025-12-01", "2025-10-01", "2025-09-20", "2025-10-01", "not a date"]
+        schedule, errors = planting_calendar.bulk_schedule(crops, planted)
+        self.assertEqual([farm for farm, _ in errors], [4, 5])
+        for farm in range(4):
+            rows = schedule[schedule['farm'] == farm]
+            expected = planting_calendar.schedule(rows['crop'].iloc[0], date.fromisoformat(planted[farm]))
+            self.assertEqual(rows['start'].dt.strftime('%Y-%m-%d').tolist(), [r['start'] for r in expected])
+            self.assertEqual(rows['end'].dt.strftime('%Y-%m-%d').tolist(), [r['end'] for r in expected])
+
+    def test_bulk_endpoint_accepts_list_ids(self):
+        # Equal-length lists are what np.asarray would broadcast into a 2-D array
+        farms = [{"id": [1, 2], "crop": "maize", "planted": "2025-11-15"},
+                 {"id": [3, 4], "crop": "banana", "planted": "2025-11-15"},
+                 {"id": [5, 6], "crop": "tomato", "planted": "2025-10-01"}]
+        url = reverse('bulk_crop_calendar')
+        response = self.client.post(url, json.dumps({"farms": farms}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual({tuple(row["id"]) for row in body["schedules"]}, {(1, 2), (5, 6)})
+        self.assertEqual([e["id"] for e in body["errors"]], [[3, 4]])
+        csv = self.client.post(url + '?format=csv', json.dumps({"farms": farms}), content_type='application/json')
+        self.assertEqual(csv.status_code, 200)
+
+
+class AdviceEngineTests(SimpleTestCase):
+    def test_most_specific_rule_wins(self):
+        self.assertIn("Cassava tolerates", advice_engine.advise("cassava", {"ph": 4.8})["liming"])
+        self.assertIn("strongly acidic", advice_engine.advise("maize", {"ph": 4.8})["liming"])
+        self.assertIn("drainage", advice_engine.advise("maize", {"rainfall": 1000}))
+        self.assertNotIn("drainage", advice_engine.advise("rice", {"rainfall": 1000}))
+        self.assertEqual(advice_engine.advise("banana", {}), {"error": "Crop not found in knowledge base."})
+
+    def test_bulk_matches_single_lookups(self):
+        rng = np.random.default_rng(0)
+        n = 500
+        profiles = pd.DataFrame({
+            "crop": rng.choice(["maize", "corn", "beans", "rice", "cassava", "banana"], n),
+            "farmer_type": rng.choice(["small_scale", "large_scale", None], n),
+            "ph": rng.choice([np.nan, 4.5, 5.0, 5.4, 6.0, 7.0, 8.0], n),
+            "rainfall": rng.uniform(100, 1600, n),
+            "irrigation": rng.choice(["yes", "no", None], n),
+        })
+        ids = advice_engine.evaluate(profiles)
+        expected = [advice_engine.lookup(row["crop"], row) for row in profiles.to_dict(orient="records")]
+        np.testing.assert_array_equal(ids, expected)
+
+    def test_bulk_endpoint_keeps_ids(self):
+        profiles = [{"id": 7, "crop": "maize", "ph": 4.8}, {"crop": "rice"}, {"id": "coop-3", "crop": "banana"}]
+        response = self.client.post(reverse('bulk_personalized_advice'), json.dumps({"profiles": profiles}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        def reject(constant):
+            raise ValueError(f"{constant} is not JSON")
+        body = json.loads(response.content, parse_constant=reject)
+        self.assertEqual([p["id"] for p in body["profiles"]], [7, 1])
+        self.assertEqual(body["errors"], [{"id": "coop-3", "error": "Crop not found in knowledge base."}])
+        self.assertIn("strongly acidic", body["advice"][str(body["profiles"][0]["advice_id"])]["liming"])
+
+    def test_bulk_endpoint_tolerates_malformed_fields(self):
+        profiles = [{"crop": "maize", "farmer_type": ["small_scale"], "ph": [4.8], "irrigation": {"yes": 1}},
+                    {"crop": "maize", "farmer_type": {"kind": "large_scale"}, "rainfall": "lots"},
+                    {"crop": "maize", "farmer_type": "small_scale"}]
+        response = self.client.post(reverse('bulk_personalized_advice'), json.dumps({"profiles": profiles}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        expected = [advice_engine.lookup(p["crop"], p) for p in profiles]
+        self.assertEqual([p["advice_id"] for p in response.json()["profiles"]], expected)
+
+
+class KnowledgeBundleTests(SimpleTestCase):
+    def delta(self, hashes):
+        return self.client.post(reverse('knowledge_delta'), json.dumps({"crops": hashes}),
+                                content_type='application/json')
+
+    def test_delta_brings_a_stale_client_up_to_date(self):
+        bundle = json.loads(self.client.get(reverse('knowledge_bundle')).content)
+        manifest = self.client.get(reverse('knowledge_manifest')).json()
+        self.assertEqual(manifest["crops"], bundle["crops"])
+
+        stale = next(iter(bundle["records"]))
+        held = {**manifest["crops"], stale: "0" * 64, "retired-crop": "1" * 64}
+        response = self.delta(held)
+        self.assertEqual(response.status_code, 200)
+        delta = json.loads(response.content)
+        self.assertEqual(list(delta["records"]), [stale])
+        self.assertEqual(delta["records"][stale], bundle["records"][stale])
+        self.assertEqual(delta["removed"], ["retired-crop"])
+        self.assertEqual(delta["crops"], manifest["crops"])
+
+        current = json.loads(self.delta(manifest["crops"]).content)
+        self.assertEqual((current["records"], current["removed"]), ({}, []))
+
+    def test_delta_is_not_cacheable(self):
+        response = self.delta({})
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(self.client.get(reverse('knowledge_delta')).status_code, 405)
+        bundle = self.client.get(reverse('knowledge_bundle'))
+        self.assertEqual(self.client.get(reverse('knowledge_bundle'), HTTP_IF_NONE_MATCH=bundle['ETag']).status_code,
+                         304)
+
+
+class PestIndexTests(SimpleTestCase):
+    def test_names_are_merged_across_crops(self):
+        stem_borer = pest_index.resolve("stem borers")
+        self.assertEqual(len(stem_borer), 1)
+        self.assertEqual(sorted(pest_index.crops_at_risk(["stem borer"])[0]), ["maize", "rice", "sugarcane"])
+        self.assertEqual(pest_index.resolve("CMD"), pest_index.resolve("mosaic disease"))
+        self.assertIn("sugarcane", pest_index.crops_at_risk(["aphids"])[0])
+
+    def test_generic_names_keep_their_crop(self):
+        self.assertEqual(pest_index.resolve("moth"), {"diamondback moth", "potato tuber moth", "sunflower moth"})
+        self.assertEqual(pest_index.resolve("bean fly"), {"bean fly"})
+        self.assertEqual(list(pest_index.crops_at_risk(["sunflower moth"])[0]), ["sunflower"])
+
+    def test_any_and_all(self):
+        any_crops, unknown = pest_index.crops_at_risk(["fall armyworm", "late blight", "locust"])
+        self.assertEqual(sorted(any_crops), ["irish potato", "maize", "tomato"])
+        self.assertEqual(unknown, ["locust"])
+        all_crops, _ = pest_index.crops_at_risk(["aphids", "early blight"], match="all")
+        self.assertEqual(sorted(all_crops), ["irish potato", "tomato"])
+        self.assertEqual(pest_index.crops_at_risk(["aphids", "locust"], match="all"), ({}, ["locust"]))
+
+    def test_endpoint_reports_unknown_names(self):
+        response = self.client.get(reverse('pest_crops'), {"q": "aphids,locust", "match": "all"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["crops"], response.json()["unknown"]), ({}, ["locust"]))
+        self.assertIn("tomato", self.client.get(reverse('pest_crops'), {"q": "aphids,locust"}).json()["crops"])
+        self.assertEqual(self.client.get(reverse('pest_crops'), {"q": "aphids", "match": "most"}).status_code, 400)
+
+    def test_exposure(self):
+        keys = sorted(pest_index.resolve("fall armyworm") | pest_index.resolve("stem borer"))
+        exposed = pest_index.exposure(["corn", "rice", "banana"], keys)
+        self.assertEqual(exposed.shape, (3, 2))
+        self.assertEqual(exposed.any(axis=1).tolist(), [True, True, False])
+
+
+class ComparisonMatrixTests(SimpleTestCase):
+    def test_parses_units(self):
+        self.assertEqual(parse_range("yield", "1,000–2,500 kg/ha cured leaf"), [1.0, 2.5])
+        self.assertEqual(parse_range("growth_duration", "8 to 24 months depending on variety"), [240.0, 720.0])
+        self.assertEqual(parse_range("temperature", "Optimal: 18°C to 27°C; sensitive to frost"), [18.0, 27.0])
+        self.assertIsNone(parse_range("rainfall", "Well distributed"))
+
+    def test_compare_is_aligned_with_crops(self):
+        compared = comparison_matrix.compare(["beans", "maize"], ["climate_and_soil", "nursery"])
+        self.assertEqual(compared["ranges"]["rainfall"]["values"], [[300.0, 500.0], [500.0, 800.0]])
+        self.assertEqual(list(compared["sections"]), ["climate_and_soil"])
+        self.assertEqual(compared["sections"]["climate_and_soil"][1]["soil_pH"], "5.5–7.0")
+
+    def test_filter(self):
+        crops = [c["crop"] for c in comparison_matrix.filter({"ph__lte": 5.5, "rainfall__gte": 1000})]
+        self.assertEqual(sorted(crops), ["cassava", "irish potato", "rice"])
+        with self.assertRaises(ValueError):
+            comparison_matrix.filter({"altitude__lt": 1000})
+
+    def test_filter_endpoint_rejects_non_finite_values(self):
+        url = reverse('filter_crops')
+        self.assertEqual(self.client.get(url, {"ph__lte": "5.5"}).json()["conditions"], {"ph__lte": 5.5})
+        for value in ("nan", "inf", "-Infinity"):
+            response = self.client.get(url, {"ph__lte": value})
+            self.assertEqual((response.status_code, response.json()),
+                             (400, {"error": "Condition values must be finite numbers."}))
+        self.assertEqual(self.client.get(url, {"ph__lte": "low"}).status_code, 400)
+
+
+class TrainingTests(SimpleTestCase):
+    def test_parallel_comparison_writes_report(self):
+        df = pd.read_csv(settings.BASE_DIR / 'Crop_recommendation.csv')
+        X_train, X_test, y_train, y_test = split(df.drop('label', axis=1), df['label'])
+        results = compare_models(X_train, y_train, X_test, y_test, ["Decision Tree", "KNN"], workers=2)
+        self.assertEqual([r["model"] for r in results], ["KNN", "Decision Tree"])
+        with tempfile.TemporaryDirectory() as directory:
+            write_report(results, directory)
+            with open(os.path.join(directory, "leaderboard.json")) as f:
+                board = json.load(f)["leaderboard"]
+            self.assertEqual([row["rank"] for row in board], [1, 2])
+            matrix = pd.read_csv(os.path.join(directory, "confusion_knn.csv"), index_col=0)
+            self.assertEqual(int(matrix.to_numpy().sum()), len(y_test))
+
+    def test_selection_trades_small_f1_gaps_for_latency(self):
+        def result(name, f1, p99, size):
+            return {"model": name, "metrics": {"f1_macro": f1},
+                    "profile": {"single_ms": {"p99": p99}, "size_bytes": size}}
+        results = [result("forest", 0.993, 2.0, 3000), result("svm", 0.990, 8.0, 400),
+                   result("knn", 0.990, 0.5, 200), result("tree", 0.39, 0.1, 7)]
+        self.assertEqual(pareto_front(results), {0, 2, 3})
+        self.assertEqual(select(results, latency_budget_ms=5)[0]["model"], "forest")
+        self.assertEqual(select(results, latency_budget_ms=5, f1_tolerance=0.005)[0]["model"], "knn")
+        chosen, reason = select(results, latency_budget_ms=0.01)
+        self.assertEqual(chosen["model"], "tree")
+        self.assertIn("no model meets", reason)
+
+
+class SuccessiveHalvingTests(SimpleTestCase):
+    def test_schedule_ends_on_full_folds(self):
+        self.assertEqual(resource_schedule(36, 1760, 22, 3), [195, 586, 1760])
+        self.assertEqual(resource_schedule(2, 1760, 22, 3), [1760])
+
+    def test_fold_prefixes_are_stratified(self):
+        X, y = _dataset()
+        with tempfile.TemporaryDirectory() as directory:
+            folds = cached_folds(X, y, directory, k=5)
+            again = cached_folds(X, y, directory, k=5)
+        np.testing.assert_array_equal(folds[0][0], again[0][0])
+        counts = pd.Series(y[folds[0][0][:220]]).value_counts()
+        self.assertEqual((counts.min(), counts.max()), (10, 10))
+
+    def test_search_resumes_from_saved_state(self):
+        X, y = _dataset()
+        with tempfile.TemporaryDirectory() as directory:
+            search = SuccessiveHalvingSearch(X, y, directory, ["Decision Tree"], k=3, workers=1)
+            state = search.run()
+            self.assertTrue(state["complete"])
+            self.assertEqual(len(state["rounds"][0]["ranking"]), 8)
+            self.assertLess(len(state["rounds"][-1]["ranking"]), 8)
+            self.assertIn("Decision Tree", state["best"])
+            self.assertEqual(search.load_state()["scores"], state["scores"])
+            with open(search.state_path, encoding='utf-8') as f:
+                self.assertNotIn("Infinity", f.read())
+
+    def test_failed_fits_rank_last(self):
+        X, y = _dataset()
+        with tempfile.TemporaryDirectory() as directory:
+            search = SuccessiveHalvingSearch(X, y, directory, ["Decision Tree"], k=3, workers=1)
+            search.configs = [{"id": "Decision Tree#bad", "model": "Decision Tree", "params": {"max_depth": -1}},
+                              *search.configs[:2]]
+            state = search.run()
+            self.assertTrue(state["complete"])
+            self.assertEqual(state["rounds"][0]["ranking"][-1], {"id": "Decision Tree#bad", "f1": None,
+                                                                  "f1_std": None, "fit_seconds": 0.0,
+                                                                  "failed": True})
+            self.assertNotEqual(state["best"]["Decision Tree"]["params"], {"max_depth": -1})
+            self.assertEqual(search.load_state()["scores"], state["scores"])
+
+
+class WarmStartRetrainingTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.X, cls.y = _dataset()
+        cls.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(cls.X, cls.y)
+
+    def test_adds_trees_without_touching_the_serving_model(self):
+        X, y = replay_sample(self.X, self.y, per_class=5)
+        candidate = warm_start_forest(self.model, X, y, n_trees=5)
+        self.assertEqual(len(candidate.estimators_), 15)
+        self.assertEqual(len(self.model.estimators_), 10)
+        np.testing.assert_array_equal(candidate.classes_, self.model.classes_)
+        self.assertTrue(gate(self.model, candidate, self.X, self.y, min_gain=-0.05)["promote"])
+
+    def test_rejects_labels_that_do_not_match_the_classes(self):
+        keep = self.y != "rice"
+        with self.assertRaisesRegex(ValueError, "missing rice"):
+            warm_start_forest(self.model, self.X[keep], self.y[keep], n_trees=5)
+
+    def test_feedback_labels_and_holdout(self):
+        labels = match_labels(["Kidney Beans", "maize ", "cassava"], self.model.classes_)
+        self.assertEqual(labels.tolist(), ["kidneybeans", "maize", ""])
+        ids = np.arange(1, 10001)
+        mask = holdout_mask(ids)
+        np.testing.assert_array_equal(mask, holdout_mask(ids))
+        self.assertAlmostEqual(mask.mean(), 0.2, delta=0.02)
+
+
+class RecommendationFeedbackTests(TestCase):
+    def test_requires_a_logged_in_user(self):
+        body = {**SAMPLE, "planted_crop": "rice", "outcome": "good"}
+        response = self.client.post(reverse('recommendation_feedback'), json.dumps(body),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(RecommendationFeedback.objects.exists())
+
+    def test_records_feedback(self):
+        user = User.objects.create_user(username="farmer", password="x")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(reverse('recommendation_feedback'),
+                               {**SAMPLE, "planted_crop": "Rice ", "outcome": "good"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        feedback = RecommendationFeedback.objects.get(id=response.json()["id"])
+        self.assertEqual((feedback.user, feedback.planted_crop, feedback.ph), (user, "rice", 6.5))
+        response = client.post(reverse('recommendation_feedback'),
+                               {**SAMPLE, "planted_crop": "rice", "outcome": "great"}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = client.post(reverse('recommendation_feedback'),
+                               {**SAMPLE, "ph": "acid", "planted_crop": "rice", "outcome": "good"}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class RetrainCommandTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.registry = ModelRegistry(os.path.join(directory.name, 'model_registry.json'))
+        X, y = _dataset()
+        dump(RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y),
+             os.path.join(directory.name, 'crop_model_v1.pkl'))
+        self.registry.register('v1', 'crop_model_v1.pkl', activate=True)
+        override = override_settings(CROPS_MODEL_REGISTRY=self.registry.manifest_path,
+                                     CROPS_DATASET_CACHE_DIR=os.path.join(directory.name, 'cache'))
+        override.enable()
+        self.addCleanup(override.disable)
+        rows = np.random.default_rng(0).choice(len(X), 150, replace=False)
+        RecommendationFeedback.objects.bulk_create([
+            RecommendationFeedback(**dict(zip(FEATURES, X[i].tolist())), planted_crop=y[i], outcome='good',
+                                   model_version='v1')
+            for i in rows
+        ])
+
+    def retrain(self, *args):
+        out = io.StringIO()
+        call_command('retrain_crop_model', '--min-feedback', '10', '--trees', '5', *args, stdout=out)
+        return out.getvalue(), self.registry.read_manifest()
+
+    def test_promotion_registers_without_serving_unless_asked(self):
+        output, manifest = self.retrain('--min-gain', '-1')
+        self.assertIn("Registered v2", output)
+        self.assertEqual(manifest['active'], 'v1')
+        entry = manifest['models']['v2']
+        self.assertEqual(entry['parent'], 'v1')
+        self.assertEqual(entry['feedback_through'], RecommendationFeedback.objects.order_by('id').last().id)
+        self.assertEqual(len(self.registry.load_version('v2').model.estimators_), 15)
+        _, manifest = self.retrain('--min-gain', '-1', '--activate', '--as-version', 'v3')
+        self.assertEqual(manifest['active'], 'v3')
+
+    def test_gate_rejects_a_candidate_without_enough_gain(self):
+        output, manifest = self.retrain('--min-gain', '1')
+        self.assertIn("keeping v1", output)
+        self.assertEqual(list(manifest['models']), ['v1'])
+
+
+class DatasetCacheTests(SimpleTestCase):
+    def test_cache_matches_csv_and_rebuilds_only_on_change(self):
+        df = pd.read_csv(settings.BASE_DIR / 'Crop_recommendation.csv').sample(300, random_state=0)
+        with tempfile.TemporaryDirectory() as directory:
+            first, second = os.path.join(directory, 'a.csv'), os.path.join(directory, 'b.csv')
+            df.iloc[:200].to_csv(first, index=False)
+            # Columns in another order, plus a row with a missing value
+            with open(second, 'w', encoding='utf-8') as f:
+                f.write(df.iloc[200:, ::-1].to_csv(index=False) + 'rice,,1,2,3,4,5,6\n')
+            cache = DatasetCache.for_sources(os.path.join(directory, 'cache'), [first, second])
+            dataset = cache.load([first, second], chunk_rows=64)
+            self.assertEqual(dataset.features.dtype, np.float32)
+            self.assertEqual((len(dataset), dataset.manifest['dropped_rows']), (300, 1))
+            np.testing.assert_allclose(dataset.features, df.drop(columns='label').to_numpy(np.float32))
+            np.testing.assert_array_equal(dataset.labels, df['label'].to_numpy())
+            self.assertEqual(list(dataset.classes), sorted(df['label'].unique()))
+
+            # Same contents with a new mtime: rehashed once, not rebuilt
+            os.utime(first, ns=(0, 10 ** 18))
+            self.assertTrue(cache.is_fresh([first, second]))
+            self.assertEqual(cache.read_manifest()['sources'][0]['mtime_ns'], 10 ** 18)
+            self.assertEqual(cache.read_manifest()['sources'][0]['rows'], 200)
+            self.assertEqual(sorted(os.listdir(cache.directory)), ['features.npy', 'labels.npy', 'manifest.json'])
+            self.assertFalse(cache.is_fresh([second, first]))
+            df.iloc[:100].to_csv(first, index=False)
+            self.assertFalse(cache.is_fresh([first, second]))
+            self.assertEqual(len(cache.load([first, second])), 200)
+
+            shared = pickle.loads(pickle.dumps(share(dataset.features)))
+            self.assertIsInstance(unshare(shared), np.memmap)
+            self.assertIsInstance(share(dataset.features[:10]), np.memmap)
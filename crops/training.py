@@ -0,0 +1,282 @@
+# crops/training.py
+"""Headless model comparison for the crop recommender.
+
+``compare_models`` fits every candidate in ``CANDIDATES`` on one
+train/test split, each in its own worker process, and scores it on the
+held-out rows.  It then profiles each fitted model the way the server
+would run it (``compile_model``, float64 rows): single-row and batched
+``predict_proba`` latency, pickled size and load time.  Profiling runs
+in this process after the fits, one model at a time, so timings are not
+skewed by fits competing for cores.
+
+``select`` picks the winner from the Pareto frontier of macro F1,
+latency and size under a latency budget, so a slower model only wins
+when it is meaningfully more accurate.  ``write_report`` turns the
+results into files - a JSON leaderboard plus one confusion matrix per
+model (CSV, and PNG when matplotlib is installed) - so training runs on
+a server with no display.
+"""
+import io
+import json
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import dump, load
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from .dataset import LABEL, DatasetCache, source_list
+from .forest import compile_model
+from .registry import FEATURES
+
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+# Latency profile: single rows scored one at a time, and repeated batches
+PROFILE_ROWS = 200
+PROFILE_BATCH_SIZE = 256
+PROFILE_BATCH_REPEAT = 20
+
+# name -> (estimator class, default hyperparameters); tuned values (see crops/tuning.py) override these
+CANDIDATES: Dict[str, Tuple[type, Dict[str, Any]]] = {
+    "Decision Tree": (DecisionTreeClassifier, {"max_depth": 5, "random_state": RANDOM_STATE}),
+    "Random Forest": (RandomForestClassifier, {"n_estimators": 100, "random_state": RANDOM_STATE}),
+    "KNN": (KNeighborsClassifier, {"n_neighbors": 5}),
+    "SVM": (SVC, {"probability": True, "random_state": RANDOM_STATE}),
+    "Gradient Boosting": (GradientBoostingClassifier, {"n_estimators": 100, "learning_rate": 0.1,
+                                                       "random_state": RANDOM_STATE}),
+}
+
+
+def build_estimator(name: str, params: Optional[Dict[str, Any]] = None):
+    """A fresh, unfitted candidate with its defaults updated by ``params``."""
+    cls, defaults = CANDIDATES[name]
+    return cls(**{**defaults, **(params or {})})
+
+
+def load_dataset(paths, cache_dir=None):
+    """Features in ``FEATURES`` order and labels from one or more training CSVs.
+
+    With ``cache_dir`` the CSVs are ingested once into a memory-mapped cache
+    (crops/dataset.py) and X is a read-only float32 view of it; without,
+    they are parsed with pandas and X is a DataFrame.
+    """
+    sources = source_list(paths)
+    if cache_dir:
+        dataset = DatasetCache.for_sources(cache_dir, sources).load(sources)
+        return dataset.features, dataset.labels
+    df = pd.concat([pd.read_csv(path) for path in sources], ignore_index=True)
+    return df[FEATURES], df[LABEL]
+
+
+def split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+# --- Fitting (runs in worker processes) ---
+_data = None
+
+
+def _init_worker(X_train, y_train, X_test, y_test):
+    # The split is sent once per worker rather than once per candidate
+    global _data
+    _data = (X_train, y_train, X_test, y_test)
+
+
+def _fit_candidate(name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    X_train, y_train, X_test, y_test = _data
+    model = build_estimator(name, params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+    return {
+        "model": name,
+        "algorithm": type(model).__name__,
+        "params": params or {},
+        "metrics": {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "precision_macro": precision_score(y_test, y_pred, average='macro', zero_division=0),
+            "recall_macro": recall_score(y_test, y_pred, average='macro', zero_division=0),
+            "f1_macro": f1_score(y_test, y_pred, average='macro', zero_division=0),
+        },
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "classes": [str(c) for c in model.classes_],
+        "confusion": confusion_matrix(y_test, y_pred, labels=model.classes_),
+        "estimator": model,
+    }
+
+
+def compare_models(X_train, y_train, X_test, y_test, names: Optional[Sequence[str]] = None,
+                   workers: Optional[int] = None, profile: bool = True,
+                   params: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Fit, score and (unless ``profile`` is False) profile each named candidate (default: all),
+    best macro F1 first.
+
+    ``workers`` processes fit candidates concurrently (default: one per
+    candidate, capped at the CPU count); ``workers=1`` fits in this process.
+    ``params`` maps candidate names to hyperparameters overriding the defaults.
+    """
+    names = list(names or CANDIDATES)
+    unknown = [n for n in names if n not in CANDIDATES]
+    if unknown:
+        raise ValueError(f"Unknown candidate model(s): {', '.join(unknown)}.")
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    data = (X_train, y_train, X_test, y_test)
+    if workers == 1:
+        _init_worker(*data)
+        results = [_fit_candidate(name, (params or {}).get(name)) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=data) as pool:
+            results = list(pool.map(_fit_candidate, names, [(params or {}).get(name) for name in names]))
+    if profile:
+        rows = np.asarray(X_test, dtype=np.float64)
+        for result in results:
+            result["profile"] = profile_model(result["estimator"], rows)
+    results.sort(key=lambda r: r["metrics"]["f1_macro"], reverse=True)
+    return results
+
+
+# --- Profiling and selection ---
+def _percentiles(seconds: List[float]) -> Dict[str, float]:
+    ms = np.asarray(seconds) * 1000.0
+    return {"p50": round(float(np.percentile(ms, 50)), 4), "p99": round(float(np.percentile(ms, 99)), 4)}
+
+
+def profile_model(estimator, rows: np.ndarray) -> Dict[str, Any]:
+    """Serving cost of a fitted model: predict_proba latency (ms) on single rows and on
+    batches of ``PROFILE_BATCH_SIZE`` rows, pickled size and unpickle time."""
+    buffer = io.BytesIO()
+    dump(estimator, buffer)
+    artifact = buffer.getvalue()
+    start = time.perf_counter()
+    load(io.BytesIO(artifact))
+    load_ms = (time.perf_counter() - start) * 1000.0
+
+    predictor = compile_model(estimator)
+    singles = [row.reshape(1, -1) for row in rows[:PROFILE_ROWS]]
+    batch = np.resize(rows, (PROFILE_BATCH_SIZE, rows.shape[1]))
+    single_times, batch_times = [], []
+    with warnings.catch_warnings():
+        # Models fitted on a DataFrame warn about unnamed features on every call
+        warnings.simplefilter('ignore', UserWarning)
+        predictor.predict_proba(singles[0])
+        for row in singles:
+            start = time.perf_counter()
+            predictor.predict_proba(row)
+            single_times.append(time.perf_counter() - start)
+        for _ in range(PROFILE_BATCH_REPEAT):
+            start = time.perf_counter()
+            predictor.predict_proba(batch)
+            batch_times.append(time.perf_counter() - start)
+    return {
+        "single_ms": _percentiles(single_times),
+        "batch_ms": {**_percentiles(batch_times), "rows": PROFILE_BATCH_SIZE},
+        "size_bytes": len(artifact),
+        "load_ms": round(load_ms, 3),
+    }
+
+
+def pareto_front(results: List[Dict[str, Any]]) -> Set[int]:
+    """Indices of results no other result beats on macro F1, single-row p99 and size at once."""
+    points = np.array([
+        (-r["metrics"]["f1_macro"], r["profile"]["single_ms"]["p99"], r["profile"]["size_bytes"])
+        for r in results
+    ])
+    # i is dominated if some j is no worse everywhere and better somewhere
+    no_worse = (points[None, :, :] <= points[:, None, :]).all(axis=2)
+    better = (points[None, :, :] < points[:, None, :]).any(axis=2)
+    dominated = (no_worse & better).any(axis=1)
+    return set(np.flatnonzero(~dominated).tolist())
+
+
+def select(results: List[Dict[str, Any]], latency_budget_ms: float, f1_tolerance: float = 0.0):
+    """Pick the model to ship from profiled ``compare_models`` results.
+
+    Among Pareto-optimal models whose single-row p99 latency fits the
+    budget, take those within ``f1_tolerance`` of the best macro F1 and
+    return the fastest.  Returns (result, reason); if no model fits the
+    budget the fastest frontier model is returned and the reason says so.
+    """
+    front = [results[i] for i in sorted(pareto_front(results))]
+    fits = [r for r in front if r["profile"]["single_ms"]["p99"] <= latency_budget_ms]
+    if not fits:
+        fastest = min(front, key=lambda r: r["profile"]["single_ms"]["p99"])
+        return fastest, f"no model meets the {latency_budget_ms:g} ms p99 budget; picked the fastest"
+    best_f1 = max(r["metrics"]["f1_macro"] for r in fits)
+    near = [r for r in fits if r["metrics"]["f1_macro"] >= best_f1 - f1_tolerance]
+    chosen = min(near, key=lambda r: (r["profile"]["single_ms"]["p99"], -r["metrics"]["f1_macro"]))
+    return chosen, (f"fastest Pareto-optimal model within {f1_tolerance:g} of the best macro F1 "
+                    f"under a {latency_budget_ms:g} ms p99 budget")
+
+
+# --- Reporting ---
+def leaderboard(results: List[Dict[str, Any]], selected: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """The JSON-serializable part of ``compare_models`` results, in rank order."""
+    front = pareto_front(results) if all("profile" in r for r in results) else set()
+    rows = []
+    for rank, r in enumerate(results, 1):
+        row = {"rank": rank, "model": r["model"], "algorithm": r["algorithm"], "params": r.get("params", {}),
+               "metrics": {k: round(float(v), 6) for k, v in r["metrics"].items()},
+               "fit_seconds": round(r["fit_seconds"], 4), "predict_seconds": round(r["predict_seconds"], 4)}
+        if "profile" in r:
+            row.update(profile=r["profile"], pareto=rank - 1 in front, selected=r is selected)
+        rows.append(row)
+    return rows
+
+
+def _plot_confusion(path, result):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+    fig, ax = plt.subplots(figsize=(10, 8))
+    ax.imshow(result["confusion"], cmap="YlGnBu")
+    ticks = np.arange(len(result["classes"]))
+    ax.set_xticks(ticks, result["classes"], rotation=90)
+    ax.set_yticks(ticks, result["classes"])
+    ax.set_title(f"Confusion Matrix for {result['model']}")
+    ax.set_xlabel("Predicted")
+    ax.set_ylabel("Actual")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return True
+
+
+def write_report(results: List[Dict[str, Any]], directory, extra: Optional[Dict[str, Any]] = None,
+                 selected: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Write leaderboard.json and per-model confusion matrices into ``directory``; return the paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for result in results:
+        base = os.path.join(directory, f"confusion_{slug(result['model'])}")
+        pd.DataFrame(result["confusion"], index=result["classes"], columns=result["classes"]).to_csv(base + ".csv")
+        paths.append(base + ".csv")
+        if _plot_confusion(base + ".png", result):
+            paths.append(base + ".png")
+    path = os.path.join(directory, "leaderboard.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**(extra or {}), "leaderboard": leaderboard(results, selected)}, f, indent=2)
+        f.write('\n')
+    paths.append(path)
+    return paths
@@ -0,0 +1,275 @@
+# crops/tuning.py
+"""Cross-validated hyperparameter search with successive halving.
+
+Every configuration in ``SEARCH_SPACES`` starts in round 0, scored by
+k-fold cross-validation (mean macro F1) with models fitted on a small
+slice of each fold's training rows.  After each round only the best
+``1 / factor`` of the configurations go on, and each round fits on
+``factor`` times more rows, so the last round fits the few survivors on
+the full folds.  Weak configurations never cost a full fit.
+
+Folds are computed once per dataset and cached as ``.npz`` in the state
+directory.  Each fold's training rows are stored in a class-proportional
+order, so the first ``n`` rows form a stratified subsample and every
+round's slice is a prefix.  Fit jobs (configuration x fold) run on a
+process pool.  Every finished job is written to ``search_state.json``,
+so a search stopped by its time budget, or killed, resumes where it
+left off and skips jobs that already have a score.  A fit that raises is
+logged and scored ``None`` (the state stays strict JSON), so its
+configuration ranks last and drops out instead of ending the search.
+"""
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from .dataset import share, unshare
+from .training import CANDIDATES, RANDOM_STATE, build_estimator
+
+STATE_FILE = 'search_state.json'
+STATE_FORMAT = 1
+
+# Candidate name -> grid of hyperparameters to search
+SEARCH_SPACES: Dict[str, Dict[str, List[Any]]] = {
+    "Decision Tree": {"max_depth": [5, 10, 20, None], "min_samples_leaf": [1, 3]},
+    "Random Forest": {"n_estimators": [25, 50, 100, 200], "max_depth": [None, 12]},
+    "KNN": {"n_neighbors": [3, 5, 9, 15], "weights": ["uniform", "distance"]},
+    "SVM": {"C": [1.0, 10.0, 100.0, 1000.0]},
+    "Gradient Boosting": {"n_estimators": [50, 100], "learning_rate": [0.05, 0.1], "max_depth": [2, 3]},
+}
+# Applied during the search only: SVC.predict ignores probability=True, which costs
+# an internal 5-fold calibration per fit
+SEARCH_OVERRIDES: Dict[str, Dict[str, Any]] = {"SVM": {"probability": False}}
+
+# Round 0 fits on at least this many rows per class
+MIN_ROWS_PER_CLASS = 5
+
+
+def grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of a search space, in a stable order."""
+    combinations = [{}]
+    for key, values in space.items():
+        combinations = [{**c, key: v} for c in combinations for v in values]
+    return combinations
+
+
+def dataset_sha256(X: np.ndarray, y: np.ndarray) -> str:
+    digest = hashlib.sha256(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update("\n".join(map(str, y)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _stratified_order(train: np.ndarray, y: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """``train`` reordered so that every prefix keeps the classes in proportion."""
+    train = rng.permutation(train)
+    labels = y[train]
+    position = np.empty(len(train))
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        position[members] = (np.arange(len(members)) + 0.5) / len(members)
+    return train[np.argsort(position, kind='stable')]
+
+
+def cached_folds(X, y, directory, k=5, seed=RANDOM_STATE):
+    """[(ordered train indices, test indices)] per fold, loaded from or saved to ``directory``."""
+    path = os.path.join(directory, f"folds_{dataset_sha256(X, y)[:16]}_k{k}_s{seed}.npz")
+    if os.path.exists(path):
+        with np.load(path) as saved:
+            return [(saved[f"train_{i}"], saved[f"test_{i}"]) for i in range(k)]
+    rng = np.random.default_rng(seed)
+    folds = [
+        (_stratified_order(train, y, rng), test)
+        for train, test in StratifiedKFold(n_splits=k, shuffle=True, random_state=seed).split(X, y)
+    ]
+    os.makedirs(directory, exist_ok=True)
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, **{f"train_{i}": f[0] for i, f in enumerate(folds)}, **{f"test_{i}": f[1] for i, f in enumerate(folds)})
+    os.replace(tmp, path)
+    return folds
+
+
+def resource_schedule(n_configs: int, max_rows: int, n_classes: int, factor: int) -> List[int]:
+    """Training rows per fold for each round: ``factor`` times more each round, ending at ``max_rows``."""
+    min_rows = min(max_rows, MIN_ROWS_PER_CLASS * n_classes)
+    rounds = 1 + min(int(math.log(max(n_configs, 1), factor)), int(math.log(max_rows / min_rows, factor)))
+    return [int(max_rows / factor ** (rounds - 1 - r)) for r in range(rounds)]
+
+
+# --- Fit jobs (run in worker processes) ---
+_data = None
+
+
+def _init_worker(X, y, folds):
+    # A cached feature matrix arrives as its file path and is mapped, not copied, per worker
+    global _data
+    _data = (unshare(X), y, folds)
+
+
+def _score(name: str, params: Dict[str, Any], fold: int, rows: int):
+    X, y, folds = _data
+    train, test = folds[fold]
+    train = train[:rows]
+    model = build_estimator(name, {**params, **SEARCH_OVERRIDES.get(name, {})})
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+    return float(f1_score(y[test], model.predict(X[test]), average='macro', zero_division=0)), fit_seconds
+
+
+class SuccessiveHalvingSearch:
+    def __init__(self, X, y, state_dir, names: Optional[Sequence[str]] = None, k=5, factor=3,
+                 seed=RANDOM_STATE, workers=None, time_budget=None, log=None):
+        self.X = X if isinstance(X, np.memmap) else np.asarray(X, dtype=np.float64)
+        self.y = np.asarray(y).astype(str)
+        self.state_dir = state_dir
+        self.names = list(names or SEARCH_SPACES)
+        unknown = [n for n in self.names if n not in CANDIDATES or n not in SEARCH_SPACES]
+        if unknown:
+            raise ValueError(f"No search space for candidate model(s): {', '.join(unknown)}.")
+        self.k = k
+        self.factor = factor
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.time_budget = time_budget
+        self.log = log or (lambda message: None)
+        self.configs = [
+            {"id": f"{name}#{i}", "model": name, "params": params}
+            for name in self.names for i, params in enumerate(grid(SEARCH_SPACES[name]))
+        ]
+
+    # --- State on disk ---
+    @property
+    def state_path(self):
+        return os.path.join(self.state_dir, STATE_FILE)
+
+    def _settings(self):
+        return {
+            "format": STATE_FORMAT,
+            "dataset": dataset_sha256(self.X, self.y),
+            "folds": self.k,
+            "factor": self.factor,
+            "seed": self.seed,
+            "configs": self.configs,
+        }
+
+    def load_state(self, fresh=False):
+        """Resume the saved search if it was run with the same data and settings, else start over."""
+        settings = self._settings()
+        if not fresh and os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            if {k: state.get(k) for k in settings} == settings:
+                self.log(f"Resuming search: {len(state['scores'])} fits already done.")
+                return state
+            self.log("Saved search state is for other data or settings; starting over.")
+        return {**settings, "scores": {}, "rounds": [], "complete": False}
+
+    def save_state(self, state):
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, allow_nan=False)
+        os.replace(tmp, self.state_path)
+
+    # --- Search ---
+    def run(self, fresh=False) -> Dict[str, Any]:
+        """Run (or resume) the search; returns the final state with its ``rounds`` and ``best`` entries."""
+        state = self.load_state(fresh)
+        folds = cached_folds(self.X, self.y, self.state_dir, self.k, self.seed)
+        schedule = resource_schedule(len(self.configs), len(folds[0][0]), len(np.unique(self.y)), self.factor)
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        by_id = {c["id"]: c for c in self.configs}
+        alive = [c["id"] for c in self.configs]
+        state["rounds"] = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(share(self.X), self.y, folds)) as pool:
+            for round_index, rows in enumerate(schedule):
+                jobs = [(cid, fold, rows) for cid in alive for fold in range(self.k)]
+                todo = [job for job in jobs if self._key(*job) not in state["scores"]]
+                self.log(f"Round {round_index}: {len(alive)} configurations x {self.k} folds on {rows} rows "
+                         f"({len(jobs) - len(todo)} fits cached).")
+                if not self._run_jobs(pool, todo, by_id, state, deadline):
+                    self.save_state(state)
+                    self.log("Time budget spent; run again to resume.")
+                    break
+                ranked = self._rank(alive, rows, state)
+                state["rounds"].append({"rows": rows, "ranking": ranked})
+                keep = max(1, math.ceil(len(alive) / self.factor))
+                alive = [r["id"] for r in ranked[:keep]] if round_index < len(schedule) - 1 else alive
+            else:
+                state["complete"] = True
+        state["best"] = self._best(state, by_id)
+        self.save_state(state)
+        return state
+
+    @staticmethod
+    def _key(cid, fold, rows):
+        return f"{cid}|{fold}|{rows}"
+
+    def _run_jobs(self, pool, todo, by_id, state, deadline) -> bool:
+        """Run fit jobs, recording each score as it lands; False if the deadline cut the round short."""
+        pending = {}
+        queue = list(todo)
+        # Keep the pool just full so that an expired budget leaves little to cancel
+        while queue or pending:
+            while queue and len(pending) < self.workers * 2:
+                if deadline is not None and time.monotonic() >= deadline:
+                    queue.clear()
+                    break
+                cid, fold, rows = job = queue.pop(0)
+                pending[pool.submit(_score, by_id[cid]["model"], by_id[cid]["params"], fold, rows)] = job
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    state["scores"][self._key(*job)] = list(future.result())
+                except Exception as e:
+                    cid, fold, rows = job
+                    self.log(f"{cid} {by_id[cid]['params']} failed on fold {fold} with {rows} rows "
+                             f"({type(e).__name__}: {e}); dropping it.")
+                    state["scores"][self._key(*job)] = [None, 0.0]
+            self.save_state(state)
+        return all(self._key(*job) in state["scores"] for job in todo)
+
+    def _rank(self, ids, rows, state) -> List[Dict[str, Any]]:
+        """Configurations by mean CV macro F1 at ``rows`` (ties: faster fits first).
+
+        A configuration with a failed fit ranks last with ``"failed": True`` and no F1.
+        """
+        ranked = []
+        for cid in ids:
+            scores = [state["scores"][self._key(cid, fold, rows)] for fold in range(self.k)]
+            fit_seconds = round(float(np.mean([seconds for _, seconds in scores])), 4)
+            if any(f1 is None for f1, _ in scores):
+                ranked.append({"id": cid, "f1": None, "f1_std": None, "fit_seconds": fit_seconds, "failed": True})
+                continue
+            f1 = np.array([f1 for f1, _ in scores])
+            ranked.append({"id": cid, "f1": round(float(f1.mean()), 6), "f1_std": round(float(f1.std()), 6),
+                           "fit_seconds": fit_seconds})
+        ranked.sort(key=lambda r: (r.get("failed", False), -(r["f1"] or 0.0), r["fit_seconds"]))
+        return ranked
+
+    def _best(self, state, by_id) -> Dict[str, Dict[str, Any]]:
+        """Per candidate, its best configuration in the last round it reached (none if every fit failed)."""
+        best = {}
+        for round_ in reversed(state["rounds"]):
+            for entry in round_["ranking"]:
+                name = by_id[entry["id"]]["model"]
+                if name not in best and not entry.get("failed"):
+                    best[name] = {"params": by_id[entry["id"]]["params"], "rows": round_["rows"],
+                                  **{k: entry[k] for k in ("f1", "f1_std", "fit_seconds")}}
+        return best
+
+
+def best_params(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """``{candidate: hyperparameters}`` from a finished search, for ``compare_models(params=...)``."""
+    return {name: entry["params"] for name, entry in state.get("best", {}).items()}
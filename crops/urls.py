@@ -3,10 +3,37 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .auth_views import register_user
-from .views import crop_recommendation  # already exists
+from .views import (
+    crop_recommendation, batch_crop_recommendation, bulk_crop_recommendation,
+    sweep_crop_recommendation, crop_guidance, search_guidance, compare_crops, filter_crops,
+    crop_calendar, bulk_crop_calendar,
+    personalized_advice, bulk_personalized_advice, knowledge_bundle, knowledge_manifest, knowledge_delta,
+    pest_crops, pest_exposure, recommendation_feedback, metrics,
+)
 
 urlpatterns = [
     path('recommend/', crop_recommendation, name='crop_recommendation'),
+    path('recommend/batch/', batch_crop_recommendation, name='batch_crop_recommendation'),
+    path('recommend/bulk/', bulk_crop_recommendation, name='bulk_crop_recommendation'),
+    path('recommend/sweep/', sweep_crop_recommendation, name='sweep_crop_recommendation'),
+    path('feedback/', recommendation_feedback, name='recommendation_feedback'),
+    # Before guidance/<crop_name>/ so 'search' is not taken for a crop name
+    path('guidance/search/', search_guidance, name='search_guidance'),
+    path('guidance/<str:crop_name>/', crop_guidance, name='crop_guidance'),
+    path('guidance/<str:crop_name>/<str:section>/', crop_guidance, name='crop_guidance_section'),
+    path('compare/', compare_crops, name='compare_crops'),
+    path('compare/filter/', filter_crops, name='filter_crops'),
+    # Before calendar/<crop_name>/ so 'bulk' is not taken for a crop name
+    path('calendar/bulk/', bulk_crop_calendar, name='bulk_crop_calendar'),
+    path('calendar/<str:crop_name>/', crop_calendar, name='crop_calendar'),
+    path('advice/', personalized_advice, name='personalized_advice'),
+    path('advice/bulk/', bulk_personalized_advice, name='bulk_personalized_advice'),
+    path('bundle/', knowledge_bundle, name='knowledge_bundle'),
+    path('bundle/manifest/', knowledge_manifest, name='knowledge_manifest'),
+    path('bundle/delta/', knowledge_delta, name='knowledge_delta'),
+    path('pests/', pest_crops, name='pest_crops'),
+    path('pests/exposure/', pest_exposure, name='pest_exposure'),
+    path('metrics/', metrics, name='crop_metrics'),
     path('register/', register_user, name='register'),
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('refresh/', TokenRefreshView.as_view(), name='token_refresh'),
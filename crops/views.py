@@ -1,16 +1,37 @@
+import hmac
 import json
+import math
+import re
+from datetime import date
 import numpy as np
 import pandas as pd
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from joblib import load
+from prometheus_client import CONTENT_TYPE_LATEST
+from .advice import advice_engine
+from .batching import MicroBatcher
+from .blobs import guidance_blobs
+from .bundle import bundle_builder, manifest
+from .bulk import csv_lines, ndjson_lines, parse_csv, parse_ndjson, score_rows
+from .cache import RecommendationCache
+from .compare import comparison_matrix
 from .expert_logic import get_crop_guidance
+from .knowledge_store import default_store
+from .metrics import RECOMMENDATION_SECONDS, exposition, stage
+from .models import RecommendationFeedback
+from .pests import pest_index
+from .planting_calendar import planting_calendar
+from .registry import FEATURES, ModelRegistry
+from .search import default_search_index
+from .sections import canonical_section
+from .sweep import build_sweep
 
 
 from django.contrib.auth.models import User
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import permissions, status
 
 @api_view(['POST'])
 def signup(request):
@@ -27,33 +48,682 @@ def signup(request):
     return Response({"message": "User created successfully."}, status=status.HTTP_201_CREATED)
 
 
-model = load('crops/crop_model_v1.pkl')  # adjust path if needed
+# Versioned models; activating a new version hot-swaps it without a restart
+registry = ModelRegistry(
+    settings.CROPS_MODEL_REGISTRY,
+    check_interval=getattr(settings, 'CROPS_MODEL_CHECK_INTERVAL', 2.0),
+)
+registry.current()  # load the active model at startup, as before
 
-@csrf_exempt
-def crop_recommendation(request):
+# Concurrent single-sample requests share one predict_proba call when enabled
+_batch_window_ms = getattr(settings, 'CROPS_MICROBATCH_WINDOW_MS', 0)
+batcher = MicroBatcher(
+    max_batch_size=getattr(settings, 'CROPS_MICROBATCH_MAX_SIZE', 64),
+    max_wait=_batch_window_ms / 1000.0,
+) if _batch_window_ms > 0 else None
+
+# Repeat and near-identical soil readings skip the model and guidance lookups
+_cache_size = getattr(settings, 'CROPS_RECOMMENDATION_CACHE_SIZE', 0)
+recommendation_cache = RecommendationCache(
+    version=lambda: registry.current().sha256,
+    max_entries=_cache_size,
+    ttl=getattr(settings, 'CROPS_RECOMMENDATION_CACHE_TTL', 3600),
+) if _cache_size > 0 else None
+
+TOP_K = 3
+MAX_BATCH_ROWS = 5000
+
+
+def _feature_matrix(rows):
+    """Validate a list of samples (dicts keyed by FEATURES or 7-value lists) as one float matrix."""
+    if not isinstance(rows, list) or not rows:
+        raise ValueError("'samples' must be a non-empty list.")
+    if len(rows) > MAX_BATCH_ROWS:
+        raise ValueError(f"At most {MAX_BATCH_ROWS} samples are allowed per request.")
+    values = []
+    for i, row in enumerate(rows):
+        if isinstance(row, dict):
+            missing = [f for f in FEATURES if f not in row]
+            if missing:
+                raise ValueError(f"Sample {i} is missing {', '.join(missing)}.")
+            row = [row[f] for f in FEATURES]
+        elif not isinstance(row, (list, tuple)) or len(row) != len(FEATURES):
+            raise ValueError(f"Sample {i} must be an object or a list of {len(FEATURES)} values.")
+        values.append(row)
+    try:
+        matrix = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("All feature values must be numeric.")
+    if not np.isfinite(matrix).all():
+        raise ValueError("Feature values must be finite numbers.")
+    return matrix
+
+
+def _top_indices(probabilities):
+    return np.argsort(probabilities, axis=1)[:, ::-1][:, :TOP_K]
+
+
+def _describe_top(probabilities, top_indices, class_names, guidance):
+    """Top-k crop entries per row; `guidance` memoizes expert info per crop."""
+    results = []
+    for row, indices in zip(probabilities, top_indices):
+        top = []
+        for i in indices:
+            crop = class_names[i]
+            if crop not in guidance:
+                guidance[crop] = get_crop_guidance(crop)
+            top.append({
+                "crop": crop,
+                "probability": round(float(row[i]), 2),
+                "expert_info": guidance[crop]
+            })
+        results.append(top)
+    return results
+
+
+def _top_crops(probabilities, class_names, guidance):
+    """Top-k crops for each row of a predict_proba matrix."""
+    return _describe_top(probabilities, _top_indices(probabilities), class_names, guidance)
+
+
+def _sample_features(data):
+    """One sample as a (1, 7) float matrix; ValueError if a reading is missing, non-numeric or not finite."""
+    if not isinstance(data, dict):
+        raise ValueError("Body must be a JSON object.")
+    missing = [f for f in FEATURES if f not in data]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}.")
+    try:
+        features = np.array([data[f] for f in FEATURES], dtype=np.float64).reshape(1, -1)
+    except (TypeError, ValueError):
+        raise ValueError("All feature values must be numeric.")
+    # Reject NaN / 1e999 here, before the row reaches the cache or shares a micro-batch
+    if not np.isfinite(features).all():
+        raise ValueError("Feature values must be finite numbers.")
+    return features
+
+
+def _cache_lookup(snapshot, features):
+    """Return (cache key, cached top crops or None)."""
+    if recommendation_cache is None:
+        return None, None
+    key = (snapshot.sha256, recommendation_cache.quantize(features[0]))
+    return key, recommendation_cache.get(key)
+
+
+def _prepare_recommendation(request):
+    """Parse the sample and consult the cache: (snapshot, key, features, cached top crops or None).
+
+    On a miss the raw features are scored; only the cache key is quantized.
+    """
+    snapshot = registry.current()
+    with stage('parse'):
+        data = json.loads(request.body)
+    with stage('features'):
+        features = _sample_features(data)
+    with stage('cache'):
+        key, cached = _cache_lookup(snapshot, features)
+    return snapshot, key, features, cached
+
+
+def _finish_recommendation(snapshot, key, prediction):
+    with stage('topk'):
+        top_indices = _top_indices(prediction)
+    with stage('guidance'):
+        top_crops = _describe_top(prediction, top_indices, snapshot.classes, {})[0]
+    if key is not None:
+        recommendation_cache.set(key, top_crops)
+    return top_crops
+
+
+def _recommendation_response(top_crops):
+    with stage('serialize'):
+        return JsonResponse({"recommendations": top_crops})
+
+
+def _crop_recommendation(request):
     if request.method == 'POST':
         try:
-            data = json.loads(request.body)
-            features = np.array([
-                data['N'], data['P'], data['K'],
-                data['temperature'], data['humidity'],
-                data['ph'], data['rainfall']
-            ]).reshape(1, -1)
-
-            prediction = model.predict_proba(features)[0]
-            top_indices = np.argsort(prediction)[::-1][:3]
-
-            class_names = model.classes_
-            top_crops = [
-                {
-                    "crop": class_names[i],
-                    "probability": round(float(prediction[i]), 2),
-                    "expert_info": get_crop_guidance(class_names[i])
-                }
-                for i in top_indices
-            ]
-            return JsonResponse({"recommendations": top_crops})
+            with RECOMMENDATION_SECONDS.time():
+                snapshot, key, features, top_crops = _prepare_recommendation(request)
+                if top_crops is None:
+                    with stage('predict'):
+                        prediction = snapshot.predictor.predict_proba(features)
+                    top_crops = _finish_recommendation(snapshot, key, prediction)
+                return _recommendation_response(top_crops)
+        except ValueError as e:
+            # Malformed JSON or readings
+            return JsonResponse({"error": str(e)}, status=400)
         except Exception as e:
             return JsonResponse({"error": str(e)})
     else:
         return JsonResponse({"error": "Only POST requests allowed."})
+
+
+async def _batched_crop_recommendation(request):
+    # Async so that ASGI requests (which would otherwise share Django's single
+    # sync thread) and WSGI threads can all wait on the batcher concurrently.
+    if request.method == 'POST':
+        try:
+            with RECOMMENDATION_SECONDS.time():
+                snapshot, key, features, top_crops = _prepare_recommendation(request)
+                if top_crops is None:
+                    with stage('predict'):
+                        prediction = await batcher.asubmit(snapshot.predictor.predict_proba, features[0])
+                    top_crops = _finish_recommendation(snapshot, key, prediction.reshape(1, -1))
+                return _recommendation_response(top_crops)
+        except ValueError as e:
+            # Malformed JSON or readings
+            return JsonResponse({"error": str(e)}, status=400)
+        except Exception as e:
+            return JsonResponse({"error": str(e)})
+    else:
+        return JsonResponse({"error": "Only POST requests allowed."})
+
+
+crop_recommendation = csrf_exempt(_batched_crop_recommendation if batcher else _crop_recommendation)
+
+
+@csrf_exempt
+def batch_crop_recommendation(request):
+    """Score many soil samples with a single predict_proba call."""
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    try:
+        features = _feature_matrix(data.get('samples') if isinstance(data, dict) else data)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    snapshot = registry.current()
+    probabilities = snapshot.predictor.predict_proba(features)
+    results = _top_crops(probabilities, snapshot.classes, {})
+    return JsonResponse({
+        "model_version": snapshot.version,
+        "count": len(results),
+        "recommendations": [{"index": i, "recommendations": top} for i, top in enumerate(results)]
+    })
+
+
+@csrf_exempt
+def sweep_crop_recommendation(request):
+    """Probability curves per crop while one or two inputs vary around a base sample.
+
+    Body: {"base": {N, P, K, ...}, "vary": [{"feature": "N", "start": 0, "stop": 140, "steps": 50}],
+    "crops": [optional subset]}.  The full grid is scored in one predict_proba call.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Body must be a JSON object."}, status=400)
+    try:
+        axes, features = build_sweep(data.get('base'), data.get('vary'))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    snapshot = registry.current()
+    classes = [str(c) for c in snapshot.classes]
+    wanted = data.get('crops') or classes
+    if not isinstance(wanted, list):
+        return JsonResponse({"error": "'crops' must be a list of crop names."}, status=400)
+    unknown = [c for c in wanted if c not in classes]
+    if unknown:
+        return JsonResponse({"error": f"Unknown crop(s): {', '.join(map(str, unknown))}."}, status=400)
+
+    shape = [len(values) for _, values in axes]
+    probabilities = snapshot.predictor.predict_proba(features)
+    best = np.asarray(classes)[np.argmax(probabilities, axis=1)].reshape(shape)
+    curves = np.round(probabilities, 4).T.reshape([len(classes)] + shape)
+    return JsonResponse({
+        "model_version": snapshot.version,
+        "axes": [{"feature": feature, "values": np.round(values, 4).tolist()} for feature, values in axes],
+        "curves": {crop: curves[classes.index(crop)].tolist() for crop in wanted},
+        "best": best.tolist(),
+    })
+
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-lines')
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv', 'text/plain')
+
+
+@csrf_exempt
+def bulk_crop_recommendation(request):
+    """Stream top-3 crops for every row of a soil survey upload.
+
+    Accepts a multipart ``file`` field or a raw request body, as CSV (same
+    columns as Crop_recommendation.csv, optional ``id``) or NDJSON, told
+    apart by the file extension or the Content-Type.  Results stream back
+    as NDJSON, or CSV with ``?format=csv``.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    output_format = request.GET.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'csv'):
+        return JsonResponse({"error": "format must be 'ndjson' or 'csv'."}, status=400)
+
+    if request.content_type == 'multipart/form-data':
+        lines = request.FILES.get('file')
+        if lines is None:
+            return JsonResponse({"error": "Upload the survey as the 'file' field."}, status=400)
+        is_ndjson = lines.name.lower().endswith(('.ndjson', '.jsonl'))
+        empty = lines.size == 0
+    else:
+        # Iterating the request reads the body line by line instead of all at once
+        lines = request
+        is_ndjson = request.content_type in NDJSON_CONTENT_TYPES
+        empty = not int(request.META.get('CONTENT_LENGTH') or 0)
+        if not empty and not is_ndjson and request.content_type not in CSV_CONTENT_TYPES:
+            return JsonResponse({"error": "Send the survey as text/csv or application/x-ndjson, "
+                                          "or upload it as the 'file' field."}, status=415)
+    # Checked before streaming starts: afterwards the status can no longer change
+    if empty:
+        return JsonResponse({"error": "The survey is empty."}, status=400)
+
+    snapshot = registry.current()
+    results = score_rows(parse_ndjson(lines) if is_ndjson else parse_csv(lines), snapshot)
+    if output_format == 'csv':
+        response = StreamingHttpResponse(csv_lines(results), content_type='text/csv')
+    else:
+        response = StreamingHttpResponse(ndjson_lines(results), content_type='application/x-ndjson')
+    response['X-Model-Version'] = snapshot.version
+    return response
+
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+def _blob_response(request, blob, cacheable=True):
+    """Serve a pre-encoded body; a cacheable one gets an ETag, and a 304 when the client's ETag still matches."""
+    gzipped = blob.gzipped is not None and bool(ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+    if cacheable and blob.matches(request.META.get('HTTP_IF_NONE_MATCH')):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(blob.gzipped if gzipped else blob.body, content_type='application/json')
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+    response['Vary'] = 'Accept-Encoding'
+    if cacheable:
+        response['ETag'] = blob.etag(gzipped)
+        response['Cache-Control'] = f"public, max-age={getattr(settings, 'CROPS_GUIDANCE_MAX_AGE', 0)}"
+    else:
+        response['Cache-Control'] = 'no-store'
+    return response
+
+
+def crop_guidance(request, crop_name, section=None):
+    """Full knowledge base record for a crop, or one ``section`` of it.
+
+    Bodies are encoded once per process and carry a strong ETag, so
+    clients revalidate with If-None-Match instead of downloading again.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    crop = default_store.resolve(crop_name)
+    if crop is None:
+        return JsonResponse({"error": "Crop not found in knowledge base."}, status=404)
+    if section is not None:
+        section = canonical_section(section) or section
+    blob = guidance_blobs.get(crop, section)
+    if blob is None:
+        return JsonResponse({"error": f"Crop '{crop}' has no section '{section}'."}, status=404)
+    return _blob_response(request, blob)
+
+
+def knowledge_bundle(request):
+    """The whole knowledge base for offline use, content-addressed by its SHA-256 (the ETag)."""
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    return _blob_response(request, bundle_builder.bundle())
+
+
+def knowledge_manifest(request):
+    """Knowledge base version and per-crop hashes, to compare against a client's copy."""
+    if request.method != 'GET':
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    return JsonResponse(manifest())
+
+
+@csrf_exempt
+def knowledge_delta(request):
+    """Only the crops that changed since the client's manifest.
+
+    Body: the manifest the client holds, {"crops": {crop: sha256, ...}}.
+    The response has the same layout as the bundle, with just the new or
+    changed records and a ``removed`` list; merging it and keeping its
+    ``crops`` hashes brings the client up to date.  The answer depends on
+    the body, which shared caches do not key on, so it is never cached.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    hashes = data.get('crops') if isinstance(data, dict) else None
+    if not isinstance(hashes, dict):
+        return JsonResponse({"error": "Send the client's manifest as {\"crops\": {crop: sha256}}."}, status=400)
+    return _blob_response(request, bundle_builder.delta(hashes), cacheable=False)
+
+
+MAX_SEARCH_RESULTS = 100
+
+
+def search_guidance(request):
+    """Ranked full-text search over the knowledge base: ?q=fall+armyworm[&crop=maize][&section=...][&limit=20]."""
+    if request.method != 'GET':
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({"error": "Pass the search terms as ?q=."}, status=400)
+    try:
+        limit = min(int(request.GET.get('limit', 20)), MAX_SEARCH_RESULTS)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer."}, status=400)
+    crop = request.GET.get('crop')
+    if crop is not None:
+        crop = default_store.resolve(crop)
+        if crop is None:
+            return JsonResponse({"error": "Crop not found in knowledge base."}, status=404)
+    section = request.GET.get('section')
+    if section is not None:
+        section = canonical_section(section) or section
+    found = default_search_index().search(query, crop=crop, section=section, limit=max(limit, 0))
+    return JsonResponse({"query": query, **found})
+
+
+MAX_COMPARE_CROPS = 5
+
+
+def compare_crops(request):
+    """Crops side by side: ?crops=maize,beans,rice[&sections=climate_and_soil,harvesting].
+
+    Numeric ranges (temperature, rainfall, pH, growth duration, yield)
+    and each section come back as one value per crop, in request order.
+    """
+    if request.method != 'GET':
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    names = [n.strip() for n in request.GET.get('crops', '').split(',') if n.strip()]
+    if not names or len(names) > MAX_COMPARE_CROPS:
+        return JsonResponse({"error": f"Pass 1 to {MAX_COMPARE_CROPS} crops as ?crops=a,b."}, status=400)
+    crops = [default_store.resolve(n) for n in names]
+    missing = [n for n, crop in zip(names, crops) if crop is None]
+    if missing:
+        return JsonResponse({"error": f"Crop(s) not found in knowledge base: {', '.join(missing)}."}, status=404)
+    sections = None
+    if request.GET.get('sections'):
+        sections = [canonical_section(n) for n in request.GET['sections'].split(',') if n.strip()]
+        if None in sections:
+            return JsonResponse({"error": "Unknown section name."}, status=400)
+    return JsonResponse(comparison_matrix.compare(crops, sections))
+
+
+def filter_crops(request):
+    """Crops whose requirement ranges match every condition, e.g. ?ph__lt=5.5&rainfall__gte=1000.
+
+    Lookups: lt / lte (range reaches below), gt / gte (range reaches
+    above), contains (the default: value within the range).
+    """
+    if request.method != 'GET':
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    if not request.GET:
+        return JsonResponse({"error": "Pass at least one condition, e.g. ?ph__lt=5.5."}, status=400)
+    try:
+        conditions = {k: float(v) for k, v in request.GET.items()}
+    except ValueError:
+        return JsonResponse({"error": "Condition values must be numbers."}, status=400)
+    if not all(math.isfinite(v) for v in conditions.values()):
+        return JsonResponse({"error": "Condition values must be finite numbers."}, status=400)
+    try:
+        crops = comparison_matrix.filter(conditions)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse({"conditions": conditions, "crops": crops})
+
+
+def crop_calendar(request, crop_name):
+    """Dated growth stages and harvest window for one planting: ?planted=YYYY-MM-DD (default today)."""
+    if request.method != 'GET':
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    crop = default_store.resolve(crop_name)
+    if crop is None:
+        return JsonResponse({"error": "Crop not found in knowledge base."}, status=404)
+    try:
+        planted = date.fromisoformat(request.GET['planted']) if 'planted' in request.GET else date.today()
+    except ValueError:
+        return JsonResponse({"error": "planted must be an ISO date (YYYY-MM-DD)."}, status=400)
+    return JsonResponse({
+        "crop": crop,
+        "planted": planted.isoformat(),
+        "schedule": planting_calendar.schedule(crop, planted),
+    })
+
+
+MAX_CALENDAR_FARMS = 100000
+
+
+@csrf_exempt
+def bulk_crop_calendar(request):
+    """Season-start schedules for many farms in one pass.
+
+    Body: {"farms": [{"id": ..., "crop": "maize", "planted": "2025-11-15"}, ...]}.
+    Returns one row per farm and stage, as JSON or CSV with ``?format=csv``;
+    farms with an unknown crop or a bad date are listed under ``errors``
+    (or in the CSV's ``error`` column).
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    output_format = request.GET.get('format', 'json')
+    if output_format not in ('json', 'csv'):
+        return JsonResponse({"error": "format must be 'json' or 'csv'."}, status=400)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    farms = data.get('farms') if isinstance(data, dict) else data
+    if not isinstance(farms, list) or not farms or not all(isinstance(f, dict) for f in farms):
+        return JsonResponse({"error": "Send a non-empty list of farms."}, status=400)
+    if len(farms) > MAX_CALENDAR_FARMS:
+        return JsonResponse({"error": f"At most {MAX_CALENDAR_FARMS} farms per request."}, status=400)
+
+    ids = [f.get('id', i) for i, f in enumerate(farms)]
+    schedule, errors = planting_calendar.bulk_schedule(
+        [str(f.get('crop', '')) for f in farms], [f.get('planted') for f in farms],
+    )
+    # A plain list, not np.asarray: ids that are themselves lists would become a 2-D array
+    schedule.insert(0, 'id', [ids[farm] for farm in schedule['farm']])
+    schedule['start'] = schedule['start'].dt.strftime('%Y-%m-%d')
+    schedule['end'] = schedule['end'].dt.strftime('%Y-%m-%d')
+    errors = [{"id": ids[i], "error": error} for i, error in errors]
+    if output_format == 'csv':
+        rows = schedule.drop(columns='farm')
+        if errors:
+            rows = pd.concat([rows, pd.DataFrame(errors)], ignore_index=True).astype({'stage_index': 'Int64'})
+        response = HttpResponse(rows.to_csv(index=False), content_type='text/csv')
+    else:
+        response = JsonResponse({
+            "count": len(farms) - len(errors),
+            "schedules": schedule.drop(columns='farm').to_dict(orient='records'),
+            "errors": errors,
+        })
+    return response
+
+
+@csrf_exempt
+def personalized_advice(request):
+    """Advice for one farmer: {"crop", "farmer_type", "ph", "rainfall" (seasonal mm), "irrigation"}."""
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Body must be a JSON object."}, status=400)
+    advice = advice_engine.advise(str(data.get('crop', '')), data)
+    return JsonResponse(advice, status=404 if "error" in advice else 200)
+
+
+MAX_ADVICE_PROFILES = 100000
+
+
+@csrf_exempt
+def bulk_personalized_advice(request):
+    """Advice for every member of a cooperative in one pass.
+
+    Body: {"profiles": [{"id", "crop", "farmer_type", "ph", "rainfall", "irrigation"}, ...]}.
+    Each distinct piece of advice is returned once under ``advice``;
+    profiles refer to it by ``advice_id``.  A profile without an ``id``
+    is identified by its position in the list.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    profiles = data.get('profiles') if isinstance(data, dict) else data
+    if not isinstance(profiles, list) or not profiles or not all(isinstance(p, dict) for p in profiles):
+        return JsonResponse({"error": "Send a non-empty list of profiles."}, status=400)
+    if len(profiles) > MAX_ADVICE_PROFILES:
+        return JsonResponse({"error": f"At most {MAX_ADVICE_PROFILES} profiles per request."}, status=400)
+
+    frame = pd.DataFrame.from_records(profiles)
+    ids = advice_engine.evaluate(frame)
+    # From the profiles, not the frame: a column with gaps would turn them into NaN (and ints into floats)
+    row_ids = [profile.get('id', i) for i, profile in enumerate(profiles)]
+    return JsonResponse({
+        "advice": {str(i): advice_engine.payload(i) for i in np.unique(ids[ids >= 0]).tolist()},
+        "profiles": [{"id": row_id, "advice_id": int(i)} for row_id, i in zip(row_ids, ids) if i >= 0],
+        "errors": [{"id": row_id, "error": "Crop not found in knowledge base."}
+                   for row_id, i in zip(row_ids, ids) if i < 0],
+    })
+
+
+def pest_crops(request):
+    """Crops at risk from pests and diseases: ?q=aphids,fall armyworm[&match=any|all].
+
+    Without ``q``, lists every pest and disease in the knowledge base.
+    ``match=all`` keeps only crops affected by every named pest.
+    """
+    if request.method != 'GET':
+        return JsonResponse({"error": "Only GET requests allowed."}, status=405)
+    names = [n.strip() for n in request.GET.get('q', '').split(',') if n.strip()]
+    if not names:
+        built = pest_index.built
+        return JsonResponse({"pests": [
+            {"pest": built["pests"][k]["name"], "kind": built["pests"][k]["kind"],
+             "crops": sorted(built["pests"][k]["crops"])}
+            for k in built["keys"]
+        ]})
+    match = request.GET.get('match', 'any')
+    if match not in ('any', 'all'):
+        return JsonResponse({"error": "match must be 'any' or 'all'."}, status=400)
+    crops, unknown = pest_index.crops_at_risk(names, match=match)
+    matched = sorted({k for name in names for k in pest_index.resolve(name)})
+    return JsonResponse({
+        "match": match,
+        "crops": crops,
+        "pests": [pest_index.describe(k) for k in matched],
+        "unknown": unknown,
+    })
+
+
+MAX_EXPOSURE_FARMS = 100000
+
+
+@csrf_exempt
+def pest_exposure(request):
+    """Outbreak exposure across farms.
+
+    Body: {"pests": ["fall armyworm", ...], "farms": [{"id", "crop"}, ...]}.
+    Returns, per pest, how many farms grow an affected crop and their ids,
+    plus the farms exposed to any of the pests.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Only POST requests allowed."}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Body must be a JSON object."}, status=400)
+    names, farms = data.get('pests'), data.get('farms')
+    if not isinstance(names, list) or not names or not all(isinstance(n, str) for n in names):
+        return JsonResponse({"error": "Send a non-empty list of pest names."}, status=400)
+    if not isinstance(farms, list) or not farms or not all(isinstance(f, dict) for f in farms):
+        return JsonResponse({"error": "Send a non-empty list of farms."}, status=400)
+    if len(farms) > MAX_EXPOSURE_FARMS:
+        return JsonResponse({"error": f"At most {MAX_EXPOSURE_FARMS} farms per request."}, status=400)
+
+    resolved = {name: sorted(pest_index.resolve(name)) for name in names}
+    keys = sorted({k for found in resolved.values() for k in found})
+    farm_ids = np.array([f.get('id', i) for i, f in enumerate(farms)], dtype=object)
+    exposed = pest_index.exposure([str(f.get('crop', '')) for f in farms], keys)
+    counts = exposed.sum(axis=0)
+    return JsonResponse({
+        "farms": len(farms),
+        "pests": [
+            {"pest": pest_index.built["pests"][k]["name"], "exposed": int(counts[j]),
+             "farm_ids": farm_ids[exposed[:, j]].tolist()}
+            for j, k in enumerate(keys)
+        ],
+        "exposed_to_any": farm_ids[exposed.any(axis=1)].tolist(),
+        "unknown": [name for name, found in resolved.items() if not found],
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def recommendation_feedback(request):
+    """Record what a farmer planted and how the harvest went, for retrain_crop_model.
+
+    Requires a logged-in user, since feedback rows become training data.
+    Body: the seven readings (as for /api/recommend/), "planted_crop",
+    "outcome" ("good", "fair" or "poor") and optionally "recommended_crop"
+    and "model_version" (default: the serving version).
+    """
+    data = request.data
+    if not isinstance(data, dict):
+        return Response({"error": "Body must be a JSON object."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        features = _feature_matrix([data])[0]
+    except ValueError as e:
+        return Response({"error": str(e).replace("Sample 0", "Feedback")}, status=status.HTTP_400_BAD_REQUEST)
+    planted = str(data.get('planted_crop') or '').strip().lower()
+    if not planted:
+        return Response({"error": "'planted_crop' is required."}, status=status.HTTP_400_BAD_REQUEST)
+    outcome = data.get('outcome')
+    if outcome not in dict(RecommendationFeedback.OUTCOMES):
+        return Response({"error": "'outcome' must be one of good, fair or poor."}, status=status.HTTP_400_BAD_REQUEST)
+    feedback = RecommendationFeedback.objects.create(
+        user=request.user,
+        **dict(zip(FEATURES, features.tolist())),
+        recommended_crop=str(data.get('recommended_crop') or '').strip().lower()[:64],
+        planted_crop=planted[:64],
+        outcome=outcome,
+        model_version=str(data.get('model_version') or registry.current().version)[:32],
+    )
+    return Response({"id": feedback.id}, status=status.HTTP_201_CREATED)
+
+
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+
+def metrics(request):
+    """Prometheus scrape endpoint, for CROPS_METRICS_TOKEN holders or local callers only."""
+    token = getattr(settings, 'CROPS_METRICS_TOKEN', '')
+    if token:
+        sent = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ').encode('utf-8')
+        allowed = hmac.compare_digest(sent, token.encode('utf-8'))
+    else:
+        allowed = request.META.get('REMOTE_ADDR') in LOOPBACK_ADDRESSES
+    if not allowed:
+        return JsonResponse({"error": "Not allowed to read metrics."}, status=403)
+    return HttpResponse(exposition(), content_type=CONTENT_TYPE_LATEST)
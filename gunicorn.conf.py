@@ -0,0 +1,42 @@
+# gunicorn.conf.py
+import glob
+import os
+import tempfile
+
+# Load Django and all models in the master before forking, so workers share
+# the model memory copy-on-write instead of each loading their own copy.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Prometheus multiprocess mode: every worker writes its metric values to files
+# here and /api/metrics/ merges them, so a scrape covers all workers rather
+# than the one that served it. Must be set before prometheus_client is imported.
+if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='mbewuguide-prometheus-')
+
+
+def on_starting(server):
+    # Values left by a previous run would be merged into this one's
+    for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        os.remove(path)
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from mbewuguide_backend.preload import format_memory, memory_info, preload_models
+
+    server.log.info(format_memory(memory_info(), "master before model preload"))
+    preload_models()
+    server.log.info(format_memory(memory_info(), "master after model preload"))
+
+
+def post_worker_init(worker):
+    from mbewuguide_backend.preload import format_memory, memory_info
+
+    worker.log.info(format_memory(memory_info(), "worker ready"))
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,31 @@
+# mbewubot/chunks.py
+import numpy as np
+
+
+class ChunkStore:
+    """Read-only list of text chunks packed into two NumPy buffers.
+
+    A list of Python ``str`` objects has a refcount header per chunk, so
+    merely reading chunks in a forked gunicorn worker dirties the pages they
+    live on and un-shares them from the master.  Here all chunks are one
+    UTF-8 byte buffer plus an offsets array, and a chunk is decoded only
+    when it is requested.
+    """
+
+    def __init__(self, chunks):
+        encoded = [c.encode('utf-8') for c in chunks]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=self.offsets[1:])
+        self.data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
@@ -7,6 +7,7 @@ from django.views.decorators.csrf import csrf_exempt
 from sentence_transformers import SentenceTransformer
 import json
 import logging
+from .chunks import ChunkStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,7 +35,8 @@ except Exception as e:
 
 try:
     with open(chunks_path, "rb") as f:
-        chunks = pickle.load(f)
+        # Packed into NumPy buffers so forked workers share the pages
+        chunks = ChunkStore(pickle.load(f))
     logger.info(f"Text chunks loaded successfully! Number of chunks: {len(chunks)}")
 except Exception as e:
     logger.error(f"Failed to load text chunks: {e}")
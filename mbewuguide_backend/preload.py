@@ -0,0 +1,73 @@
+# mbewuguide_backend/preload.py
+"""Load every model once in the gunicorn master so forked workers share it.
+
+Used from ``gunicorn.conf.py`` when ``preload_app`` is on.  After the views
+(and with them the crop model registry, FAISS index, text chunks and
+SentenceTransformer) are imported, ``gc.freeze()`` moves every object to
+the permanent generation: the cyclic GC in the workers then never walks,
+and so never writes to, the pages inherited from the master.
+
+``python -m mbewuguide_backend.preload <master pid>`` prints the memory
+report for a running gunicorn; compare it with ``GUNICORN_PRELOAD=0``.
+"""
+import gc
+import importlib
+import os
+import sys
+
+import psutil
+
+PRELOAD_MODULES = ['crops.views', 'mbewubot.views']
+
+
+def preload_models():
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+    gc.collect()
+    gc.freeze()
+
+
+def memory_info(pid=None):
+    """RSS plus, where the platform reports them, unique (USS) and proportional (PSS) set sizes in MiB."""
+    process = psutil.Process(pid or os.getpid())
+    try:
+        info = process.memory_full_info()
+    except psutil.AccessDenied:
+        info = process.memory_info()
+    mib = 1024 * 1024
+    return {
+        "pid": process.pid,
+        "rss": info.rss / mib,
+        "uss": getattr(info, 'uss', None) and info.uss / mib,
+        "pss": getattr(info, 'pss', None) and info.pss / mib,
+    }
+
+
+def format_memory(info, label):
+    parts = [f"{label} pid={info['pid']}", f"rss={info['rss']:.1f}MiB"]
+    for key in ('uss', 'pss'):
+        if info[key] is not None:
+            parts.append(f"{key}={info[key]:.1f}MiB")
+    if info['uss'] is not None:
+        parts.append(f"shared={info['rss'] - info['uss']:.1f}MiB")
+    return "  ".join(parts)
+
+
+def memory_report(master_pid):
+    master = psutil.Process(master_pid)
+    lines = [format_memory(memory_info(master_pid), "master")]
+    workers = [memory_info(child.pid) for child in master.children()]
+    for info in workers:
+        lines.append(format_memory(info, "worker"))
+    if workers:
+        total_rss = sum(w['rss'] for w in workers)
+        lines.append(f"{len(workers)} workers: total rss={total_rss:.1f}MiB")
+        if all(w['pss'] is not None for w in workers):
+            lines.append(f"{len(workers)} workers: total pss={sum(w['pss'] for w in workers):.1f}MiB")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m mbewuguide_backend.preload <gunicorn master pid>")
+    print(memory_report(int(sys.argv[1])))
@@ -83,13 +83,49 @@ CHANNEL_LAYERS = {
 }
 
 # Database
+# SSL is required for server databases; sqlite (the local default) has no sslmode option
+_database_url = os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')
 DATABASES = {
-    'default': dj_database_url.config(
-        default='sqlite:///db.sqlite3', conn_max_age=600
-ssl_require=True
+    'default': dj_database_url.parse(
+        _database_url, conn_max_age=600,
+        ssl_require=not _database_url.startswith('sqlite')
     )
 }
 
+# Crop model registry: manifest of versioned artifacts and the active version.
+# Workers re-check it every CROPS_MODEL_CHECK_INTERVAL seconds and hot-swap.
+CROPS_MODEL_REGISTRY = BASE_DIR / 'crops' / 'model_registry.json'
+CROPS_MODEL_CHECK_INTERVAL = float(os.environ.get('CROPS_MODEL_CHECK_INTERVAL', '2'))
+
+# manage.py train_crop_model picks, among models on the F1 / latency / size
+# Pareto frontier, the fastest one within CROPS_SELECTION_F1_TOLERANCE of the
+# best macro F1 whose single-row p99 latency fits this budget.
+CROPS_LATENCY_BUDGET_MS = float(os.environ.get('CROPS_LATENCY_BUDGET_MS', '5'))
+CROPS_SELECTION_F1_TOLERANCE = float(os.environ.get('CROPS_SELECTION_F1_TOLERANCE', '0.005'))
+
+# Training CSVs are ingested once into a memory-mapped float32 cache here and
+# re-parsed only when their contents change. Empty reads the CSVs every run.
+CROPS_DATASET_CACHE_DIR = os.environ.get('CROPS_DATASET_CACHE_DIR', str(BASE_DIR / 'dataset_cache'))
+
+# Crop recommendation micro-batching: concurrent single-sample requests wait up
+# to this many milliseconds to be scored together. 0 disables it; only useful
+# with threaded (gunicorn --threads) or ASGI workers.
+CROPS_MICROBATCH_WINDOW_MS = float(os.environ.get('CROPS_MICROBATCH_WINDOW_MS', '0'))
+CROPS_MICROBATCH_MAX_SIZE = int(os.environ.get('CROPS_MICROBATCH_MAX_SIZE', '64'))
+
+# Quantized-input recommendation cache (entries per worker; 0 disables it).
+# Entries expire after the TTL and are dropped when the active model changes.
+CROPS_RECOMMENDATION_CACHE_SIZE = int(os.environ.get('CROPS_RECOMMENDATION_CACHE_SIZE', '4096'))
+CROPS_RECOMMENDATION_CACHE_TTL = int(os.environ.get('CROPS_RECOMMENDATION_CACHE_TTL', '3600'))
+
+# Cache-Control max-age for /api/guidance/ responses. 0 makes clients
+# revalidate every time, which costs a bodiless 304 while the ETag matches.
+CROPS_GUIDANCE_MAX_AGE = int(os.environ.get('CROPS_GUIDANCE_MAX_AGE', '0'))
+
+# /api/metrics/ requires "Authorization: Bearer <token>" when this is set;
+# when it is empty, only callers on the same host (127.0.0.1 / ::1) may scrape.
+CROPS_METRICS_TOKEN = os.environ.get('CROPS_METRICS_TOKEN', '')
+
 # Password validators
 AUTH_PASSWORD_VALIDATORS = [
     {
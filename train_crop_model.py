@@ -1,76 +1,13 @@
-# 📦 Import Libraries
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix, classification_report
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVC
-import joblib
-
-#  Load Dataset
-df = pd.read_csv("Crop_recommendation.csv")
-
-#  Split Features and Target
-X = df.drop("label", axis=1)
-y = df["label"]
-
-#  Split Train/Test (once, for all models)
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-#  Define Models
-models = {
-    "Decision Tree": DecisionTreeClassifier(max_depth=5, random_state=42),
-    "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
-    "KNN": KNeighborsClassifier(n_neighbors=5),
-    "SVM": SVC(probability=True),
-    "Gradient Boosting": GradientBoostingClassifier(n_estimators=100, learning_rate=0.1, random_state=42)
-}
-
-# Train, Evaluate, and Compare
-results = []
-best_model = None
-best_f1 = 0
-
-for name, model in models.items():
-    print(f"\n Training {name}")
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
-
-    acc = accuracy_score(y_test, y_pred)
-    prec = precision_score(y_test, y_pred, average='macro')
-    rec = recall_score(y_test, y_pred, average='macro')
-    f1 = f1_score(y_test, y_pred, average='macro')
-
-    results.append({
-        "Model": name,
-        "Accuracy": acc,
-        "Precision": prec,
-        "Recall": rec,
-        "F1 Score": f1
-    })
-
-    # Confusion Matrix
-    cm = confusion_matrix(y_test, y_pred)
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(cm, annot=False, cmap="YlGnBu", xticklabels=model.classes_, yticklabels=model.classes_)
-    plt.title(f"Confusion Matrix for {name}")
-    plt.xlabel("Predicted")
-    plt.ylabel("Actual")
-    plt.show()
-
-    # Save best model
-    if f1 > best_f1:
-        best_model = model
-        best_f1 = f1
-        best_model_name = name
-
-# Save the Best Model
-joblib.dump(best_model, "crop_model_v1.pkl")
-print(f"\n Best model '{best_model_name}' saved as 'crop_model_v1.pkl'")
-
-#  Results Summary
-results_df = pd.DataFrame(results)
-display(results_df.sort_values(by="F1 Score", ascending=False))
+"""Train and compare the candidate crop models, saving the best as crop_model_v1.pkl.
+
+Kept for existing workflows; this is ``python manage.py train_crop_model``
+with the old script's output file.  Confusion matrices and the leaderboard
+are written to training_report/ instead of being shown in windows.
+"""
+import os
+import sys
+
+if __name__ == '__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mbewuguide_backend.settings')
+    from django.core.management import execute_from_command_line
+    execute_from_command_line([sys.argv[0], 'train_crop_model', '--save', 'crop_model_v1.pkl', *sys.argv[1:]])